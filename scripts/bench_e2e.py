@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""End-to-end supervisor benchmark against a local Jupiter/RPC/Jito stand-in.
+
+A separate process serves the Jupiter token list, `/order` and `/execute`, the
+Solana JSON-RPC methods the bot calls, and a Jito `sendBundle` endpoint, with
+lognormal latencies (BENCH_LATENCY_MS, `route=median:p99` per route) and
+injected 5xx (BENCH_ERROR_RATE) and 429 (BENCH_429_RATE) responses. Quotes
+follow per-mint USD prices with slowly moving per-direction dislocations of
+BENCH_NOISE_BPS, so the strategies find and execute opportunities.
+
+`run_supervisor` then runs unmodified in live mode, with a throwaway keypair,
+over a watchlist built from BENCH_TOKENS tokens. After the first scan it is
+measured for BENCH_SECONDS:
+
+- scan ticks per second, per strategy and in total;
+- p50/p99 latency from the stand-in answering the `/order` behind a plan to
+  that plan's `/execute` (or bundle) arriving;
+- process CPU per tick, RSS and event-loop lag.
+
+Results are written as JSON to BENCH_OUT (default bench_e2e.json) with the git
+commit and the configuration. With BENCH_BASELINE pointing at an earlier
+result, the key numbers are compared on stderr.
+
+Settings come from the environment as usual. The stand-in URLs, live mode and
+the temporary token cache and risk ledger are filled in unless set there.
+"""
+import asyncio
+import base64
+import collections
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing as mp
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+SECONDS = float(os.getenv("BENCH_SECONDS", "20"))
+TOKENS = int(os.getenv("BENCH_TOKENS", "16"))
+BACKEND = os.getenv("BENCH_BACKEND", "ultra")  # ultra | jito
+NOISE_BPS = float(os.getenv("BENCH_NOISE_BPS", "60"))
+DISLOCATION_S = float(os.getenv("BENCH_DISLOCATION_S", "2"))
+ERROR_RATE = float(os.getenv("BENCH_ERROR_RATE", "0.01"))
+RATE_429 = float(os.getenv("BENCH_429_RATE", "0.01"))
+CONFIRM_MS = float(os.getenv("BENCH_CONFIRM_MS", "800"))
+# The bot logs to stdout, so results always go to a file.
+OUT = os.getenv("BENCH_OUT", "bench_e2e.json")
+LATENCY_MS = os.getenv(
+    "BENCH_LATENCY_MS", "order=40:150,execute=60:250,rpc=5:30,jito=10:40,tokens=20:60"
+)
+
+USER_BALANCE_LAMPORTS = 10**12
+FEE_LAMPORTS = 5000
+SYNTHETIC_SYMBOLS = ("wBTC", "ETH")
+B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+REASONS = {200: "OK", 400: "Bad Request", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+def parse_latency(spec: str) -> dict[str, tuple[float, float]]:
+    out = {}
+    for part in filter(None, spec.split(",")):
+        route, vals = part.split("=")
+        median, p99 = (float(v) / 1000 for v in vals.split(":"))
+        sigma = math.log(max(p99, median) / median) / 2.326 if median else 0.0
+        out[route.strip()] = (median, sigma)
+    return out
+
+
+def rpc_reply(req: dict[str, Any], **body: Any) -> bytes:
+    return json.dumps({"jsonrpc": "2.0", "id": req.get("id"), **body}).encode()
+
+
+def percentile(xs: list[float], q: float) -> float | None:
+    if not xs:
+        return None
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+
+# --- stand-in server (own process) --------------------------------------------
+
+
+class StandIn:
+    """Upstream state: token list, prices, orders handed out and executions received."""
+
+    def __init__(self, user: str):
+        from solders.keypair import Keypair
+
+        from solbot.mints import JITOSOL, MSOL, SOL, USDC, USDT
+
+        self.user = user
+        self.dest = Keypair().pubkey()
+        self.latency = parse_latency(LATENCY_MS)
+        rnd = random.Random(7)
+        self.tokens: dict[str, tuple[str, int, float]] = {  # address -> (symbol, decimals, usd)
+            USDC: ("USDC", 6, 1.0), USDT: ("USDT", 6, 1.0), SOL: ("SOL", 9, 150.0),
+            MSOL: ("mSOL", 9, 185.0), JITOSOL: ("JITOSOL", 9, 182.0),
+        }
+        for i in range(max(0, TOKENS - len(self.tokens))):
+            addr = "Bench" + "".join(rnd.choice(B58) for _ in range(39))
+            self.tokens[addr] = (SYNTHETIC_SYMBOLS[i % 2], rnd.choice((6, 8, 9)),
+                                 10 ** rnd.uniform(-2, 4))
+        self.token_list = json.dumps([
+            {"address": a, "symbol": s, "decimals": d} for a, (s, d, _) in self.tokens.items()
+        ]).encode()
+        self.dislocation: dict[tuple[str, str], tuple[float, float]] = {}
+        self.seq = itertools.count(1)
+        self.t0 = time.monotonic()
+        # message digest -> (sent, in mint, in, out mint, out)
+        self.orders: dict[bytes, tuple[float, str, int, str, int]] = {}
+        # signature -> (in mint, in, out mint, out, at); a tip is ("", lamports, "", 0, at)
+        self.executed: dict[str, tuple[str, int, str, int, float]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests: collections.Counter[str] = collections.Counter()
+        self.injected: collections.Counter[str] = collections.Counter()
+        self.opportunity_s: list[float] = []
+        self.executions = 0
+        self.rejected = 0  # executions of an unknown or already used order
+
+    def stats(self) -> dict[str, Any]:
+        lat = self.opportunity_s
+        ms = lambda v: None if v is None else round(v * 1000, 2)  # noqa: E731
+        return {
+            "requests": dict(self.requests),
+            "injected": dict(self.injected),
+            "executions": self.executions,
+            "rejected": self.rejected,
+            "opportunity_to_execute_ms": {
+                "n": len(lat), "p50": ms(percentile(lat, 0.5)), "p99": ms(percentile(lat, 0.99)),
+                "mean": ms(sum(lat) / len(lat)) if lat else None,
+            },
+        }
+
+    # --- fault model
+
+    async def delay(self, route: str) -> None:
+        median, sigma = self.latency.get(route, (0.0, 0.0))
+        if median:
+            await asyncio.sleep(median * math.exp(sigma * random.gauss(0.0, 1.0)))
+
+    def fault(self, route: str) -> tuple[int, bytes] | None:
+        if route == "tokens":
+            return None
+        roll = random.random()
+        if roll < RATE_429:
+            self.injected[f"{route}:429"] += 1
+            return 429, b'{"error":"Too Many Requests"}'
+        if roll < RATE_429 + ERROR_RATE:
+            self.injected[f"{route}:5xx"] += 1
+            return 500, b'{"error":"internal error"}'
+        return None
+
+    # --- Jupiter
+
+    def _rate(self, src: str, dst: str, now: float) -> float:
+        shift, at = self.dislocation.get((src, dst), (0.0, -1e9))
+        if now - at > DISLOCATION_S * random.uniform(0.5, 1.5):
+            shift = random.gauss(0.0, NOISE_BPS / 10_000)
+            self.dislocation[(src, dst)] = (shift, now)
+        return shift
+
+    def _unsigned_tx(self, lamports: int) -> tuple[str, bytes]:
+        from solders.hash import Hash
+        from solders.message import MessageV0
+        from solders.pubkey import Pubkey
+        from solders.signature import Signature
+        from solders.system_program import TransferParams, transfer
+        from solders.transaction import VersionedTransaction
+
+        payer = Pubkey.from_string(self.user)
+        ix = transfer(TransferParams(from_pubkey=payer, to_pubkey=self.dest, lamports=lamports))
+        msg = MessageV0.try_compile(payer, [ix], [], Hash.default())
+        raw = bytes(VersionedTransaction.populate(msg, [Signature.default()]))
+        return base64.b64encode(raw).decode(), hashlib.blake2b(raw[65:], digest_size=16).digest()
+
+    def order(self, req: dict[str, Any]) -> tuple[dict[str, Any], bytes, int]:
+        src, dst, amount = req["inputMint"], req["outputMint"], int(req["amount"])
+        sym_in, dec_in, usd_in = self.tokens[src]
+        _, dec_out, usd_out = self.tokens[dst]
+        now = time.monotonic()
+        notional = amount / 10**dec_in * usd_in
+        impact = notional / 1000 * 2 / 10_000  # 2 bps per $1k
+        out = int(amount / 10**dec_in * usd_in / usd_out * 10**dec_out
+                  * (1 + self._rate(src, dst, now) - impact))
+        seq = next(self.seq)
+        tx_b64, digest = self._unsigned_tx(seq)
+        return {
+            "inAmount": str(amount), "outAmount": str(out),
+            "inputMint": src, "outputMint": dst, "swapType": "aggregator",
+            "slippageBps": req.get("slippageBps", 50), "priceImpactPct": f"{impact:.6f}",
+            "routePlan": [{"swapInfo": {
+                "ammKey": "Amm" + src[:41], "label": "Bench", "inputMint": src, "outputMint": dst,
+                "inAmount": str(amount), "outAmount": str(out), "feeAmount": "0", "feeMint": src,
+            }, "percent": 100}],
+            "requestId": f"bench-{seq}", "transaction": tx_b64,
+        }, digest, out
+
+    def known(self, signed_b64: str) -> bool:
+        raw = base64.b64decode(signed_b64)
+        return hashlib.blake2b(raw[65:], digest_size=16).digest() in self.orders
+
+    def executed_tx(self, signed_b64: str) -> str | None:
+        """Record an execution; returns its signature, or None for an unknown transaction."""
+        from solders.signature import Signature
+
+        raw = base64.b64decode(signed_b64)
+        order = self.orders.pop(hashlib.blake2b(raw[65:], digest_size=16).digest(), None)
+        if order is None:
+            self.rejected += 1
+            return None
+        sent, src, amount, dst, out = order
+        now = time.monotonic()
+        sig = str(Signature.from_bytes(raw[1:65]))
+        self.executed[sig] = (src, amount, dst, out, now)
+        self.opportunity_s.append(now - sent)
+        self.executions += 1
+        return sig
+
+    def executed_tip(self, signed_b64: str) -> None:
+        from solders.signature import Signature
+        from solders.transaction import VersionedTransaction
+
+        tx = VersionedTransaction.from_bytes(base64.b64decode(signed_b64))
+        lamports = int.from_bytes(bytes(tx.message.instructions[0].data)[4:12], "little")
+        self.executed[str(Signature.from_bytes(bytes(tx.signatures[0])))] = (
+            "", lamports, "", 0, time.monotonic()
+        )
+
+    # --- Solana RPC
+
+    def height(self) -> int:
+        return 1_000_000 + int((time.monotonic() - self.t0) / 0.4)
+
+    def rpc(self, method: str, params: list[Any]) -> Any:
+        from solders.hash import Hash
+
+        h = self.height()
+        if method == "getHealth":
+            return "ok"
+        if method == "getLatestBlockhash":
+            return {"context": {"slot": h}, "value": {
+                "blockhash": str(Hash.new_unique()), "lastValidBlockHeight": h + 150,
+            }}
+        if method == "getRecentPrioritizationFees":
+            return [
+                {"slot": h - i, "prioritizationFee": random.randint(0, 50_000)} for i in range(150)
+            ]
+        if method == "getSignatureStatuses":
+            now, value = time.monotonic(), []
+            for sig in params[0]:
+                done = self.executed.get(sig)
+                if done is None or now - done[4] < CONFIRM_MS / 1000:
+                    value.append(None)
+                else:
+                    value.append({"slot": h, "confirmations": None, "err": None,
+                                  "confirmationStatus": "confirmed"})
+            return {"context": {"slot": h}, "value": value}
+        if method == "getTransaction":
+            from solbot.mints import SOL
+
+            done = self.executed.get(params[0])
+            if done is None:
+                return None
+            src, amount, dst, out, _ = done
+            lamports = USER_BALANCE_LAMPORTS - FEE_LAMPORTS
+            pre_tokens, post_tokens = [], []
+            if not src:  # tip transfer
+                lamports -= amount
+            for mint, before, after in ((src, amount, 0), (dst, 0, out)):
+                if mint == SOL:
+                    lamports += after - before
+                elif mint:
+                    for rows, n in ((pre_tokens, before), (post_tokens, after)):
+                        rows.append({"mint": mint, "owner": self.user,
+                                     "uiTokenAmount": {"amount": str(n)}})
+            meta: dict[str, Any] = {
+                "fee": FEE_LAMPORTS, "err": None,
+                "preBalances": [USER_BALANCE_LAMPORTS], "postBalances": [lamports],
+                "preTokenBalances": pre_tokens, "postTokenBalances": post_tokens,
+            }
+            message = {"accountKeys": [self.user, str(self.dest)]}
+            return {"slot": h, "transaction": {"message": message}, "meta": meta}
+        if method == "getMultipleAccounts":
+            return {"context": {"slot": h}, "value": [None] * len(params[0])}
+        raise KeyError(method)
+
+    # --- HTTP
+
+    async def respond(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        if path.endswith("/tokens"):
+            route = "tokens"
+        elif path.endswith("/order"):
+            route = "order"
+        elif path.endswith("/execute"):
+            route = "execute"
+        elif path.endswith("/bundles"):
+            route = "jito"
+        else:
+            route = "rpc"
+        self.requests[route] += 1
+        await self.delay(route)
+        fault = self.fault(route)
+        if fault is not None:
+            return fault
+        if route == "tokens":
+            return 200, self.token_list
+        req = json.loads(body) if body else {}
+        if route == "order":
+            res, digest, amount_out = self.order(req)
+            out = json.dumps(res).encode()
+            src, dst = req["inputMint"], req["outputMint"]
+            self.orders[digest] = (time.monotonic(), src, int(req["amount"]), dst, amount_out)
+            if len(self.orders) > 200_000:  # drop the oldest half
+                self.orders = dict(itertools.islice(self.orders.items(), 100_000, None))
+            return 200, out
+        if route == "execute":
+            sig = self.executed_tx(req["signedTransaction"])
+            if sig is None:
+                return 400, b'{"status":"Failed","error":"unknown requestId"}'
+            res = {"status": "Success", "signature": sig, "slot": str(self.height())}
+            return 200, json.dumps(res).encode()
+        if route == "jito":
+            # A bundle is swaps plus a tip; it executes whole or not at all.
+            *swaps, tip = req["params"][0]
+            sig = None
+            if swaps and all(self.known(tx) for tx in swaps):
+                sig = [self.executed_tx(tx) for tx in swaps][0]
+                self.executed_tip(tip)
+            else:
+                self.rejected += 1
+            if sig is None:
+                err = {"code": -32602, "message": "unknown transaction"}
+                return 200, rpc_reply(req, error=err)
+            return 200, rpc_reply(req, result=hashlib.sha256(sig.encode()).hexdigest())
+        try:
+            result = self.rpc(req["method"], req.get("params") or [])
+        except KeyError:
+            err = {"code": -32601, "message": "Method not found"}
+            return 200, rpc_reply(req, error=err)
+        return 200, rpc_reply(req, result=result)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode()
+                method, path, _ = head.split(" ", 2)
+                length = 0
+                for line in head.split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                body = await reader.readexactly(length) if length else b""
+                status, out = await self.respond(method, path.split("?")[0], body)
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(out)}\r\n\r\n".encode()
+                    + (b"" if method == "HEAD" else out)  # connection warm-up probes
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            writer.close()
+
+
+def serve(user: str, conn) -> None:
+    """Stand-in process: send the port, then answer "reset"/"stats"/"stop" over `conn`."""
+
+    async def run() -> None:
+        standin = StandIn(user)
+        srv = await asyncio.start_server(standin.handle, "127.0.0.1", 0, backlog=1024)
+        conn.send(srv.sockets[0].getsockname()[1])
+        loop = asyncio.get_running_loop()
+        while True:
+            cmd = await loop.run_in_executor(None, conn.recv)
+            if cmd == "reset":
+                standin.reset()
+                conn.send(True)
+            elif cmd == "stats":
+                conn.send(standin.stats())
+            else:
+                break
+        srv.close()
+
+    asyncio.run(run())
+
+
+# --- bot side ----------------------------------------------------------------
+
+
+def settings_overrides(base: str, tmp: str, secret: str, pubkey: str) -> dict[str, Any]:
+    overrides = {
+        "RPC_HTTPS": [f"{base}/rpc"],
+        "JUP_ORDER_BASE": f"{base}/ultra/v1",
+        "JUP_EXECUTE_BASE": f"{base}/ultra/v1",
+        "JITO_REGIONS": [f"{base}/api/v1/bundles"],
+        "TOKEN_SOURCES": [f"{base}/tokens"],
+        "TOKEN_CACHE_DIR": tmp,
+        "RISK_LEDGER_FILE": os.path.join(tmp, "risk.ledger"),
+        "EXECUTION_BACKEND": BACKEND,
+        "DRY_RUN": False,
+        "PAPER_TRADE": False,
+        "API_ENABLED": False,
+        "HTTP2": False,
+        "QUOTE_RECORD_DIR": "",
+        "AMM_POOLS_FILE": "",
+        "MIN_PROFIT_USD": 0.05,
+        "MAX_DAILY_LOSS_USD": 1e9,
+        "RATE_LIMIT_RPS": 200.0,
+        "RATE_LIMIT_BURST": 50.0,
+        "RATE_LIMIT_MAX_RPS": 400.0,
+    }
+    out = {k: v for k, v in overrides.items() if k not in os.environ}
+    out["user_keypair"], out["user_pubkey"] = secret, pubkey
+    return out
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def cpu_s() -> float:
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    return ru.ru_utime + ru.ru_stime
+
+
+async def drive(base: str, conn, secret: str, pubkey: str) -> dict[str, Any]:
+    from solbot.core import profiling
+    from solbot.core.env import Settings
+    from solbot.services.supervisor import run_supervisor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        overrides = settings_overrides(base, tmp, secret, pubkey)
+        settings = Settings(**overrides)
+        t_start = time.perf_counter()
+        sup = asyncio.create_task(run_supervisor(settings, started_at=t_start))
+        try:
+            # With SCAN_SHARDS > 1 the shards propose; the coordinator only ranks.
+            while not {"propose", "rank"} & profiling.STAGES.snapshot()["stages"].keys():
+                if sup.done():
+                    sup.result()
+                    raise RuntimeError("supervisor exited before the first scan")
+                await asyncio.sleep(0.05)
+            first_scan_s = time.perf_counter() - t_start
+
+            await asyncio.to_thread(lambda: (conn.send("reset"), conn.recv()))
+            profiling.STAGES.reset()
+            c0, t0 = cpu_s(), time.perf_counter()
+            await asyncio.sleep(SECONDS)
+            wall, cpu = time.perf_counter() - t0, cpu_s() - c0
+            stages = profiling.STAGES.snapshot()["stages"]
+            loop = profiling.MONITOR.stats() if profiling.MONITOR else {}
+            server = await asyncio.to_thread(lambda: (conn.send("stats"), conn.recv())[1])
+        finally:
+            sup.cancel()
+            await asyncio.gather(sup, return_exceptions=True)
+
+    propose = stages.get("propose", {})
+    ticks = sum(s["count"] for s in propose.values())
+    return {
+        "overrides": {k: v for k, v in overrides.items() if k not in ("user_keypair",)},
+        "first_scan_s": round(first_scan_s, 3),
+        "wall_s": round(wall, 3),
+        "ticks": ticks,
+        "ticks_per_s": round(ticks / wall, 2),
+        "ticks_per_s_by_strategy": {k: round(v["count"] / wall, 2) for k, v in propose.items()},
+        "tick_ms_by_strategy": {k: v["mean_ms"] for k, v in propose.items()},
+        "execute_ms_by_worker": {k: v["mean_ms"] for k, v in stages.get("execute", {}).items()},
+        "cpu_s": round(cpu, 3),
+        "cpu_util": round(cpu / wall, 3),
+        "cpu_ms_per_tick": round(cpu / ticks * 1000, 3) if ticks else None,
+        "rss_mb": round(rss_mb(), 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "loop_lag_ms": {k: v for k, v in loop.items() if k != "recent_slow"},
+        "standin": server,
+    }
+
+
+def git_state() -> dict[str, Any]:
+    root = os.path.join(os.path.dirname(__file__), "..")
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    cwd=root, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+KEY_METRICS = (
+    ("ticks_per_s", ("ticks_per_s",)),
+    ("cpu_ms_per_tick", ("cpu_ms_per_tick",)),
+    ("opp_to_exec_p50_ms", ("standin", "opportunity_to_execute_ms", "p50")),
+    ("opp_to_exec_p99_ms", ("standin", "opportunity_to_execute_ms", "p99")),
+    ("executions", ("standin", "executions")),
+    ("rejected", ("standin", "rejected")),
+    ("max_rss_mb", ("max_rss_mb",)),
+    ("loop_lag_p99_ms", ("loop_lag_ms", "p99_ms")),
+)
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> None:
+    def get(d: dict[str, Any], path: tuple[str, ...]) -> Any:
+        for k in path:
+            d = d.get(k) if isinstance(d, dict) else None
+        return d
+
+    print(f"{'metric':<22}{'baseline':>12}{'current':>12}{'change':>10}", file=sys.stderr)
+    for name, path in KEY_METRICS:
+        a, b = get(old["results"], path), get(new["results"], path)
+        change = f"{(b / a - 1) * 100:+.1f}%" if a and b is not None else ""
+        print(f"{name:<22}{a!s:>12}{b!s:>12}{change:>10}", file=sys.stderr)
+    print(f"baseline commit {old.get('git', {}).get('commit')}", file=sys.stderr)
+
+
+def main() -> None:
+    from solders.keypair import Keypair
+
+    kp = Keypair()
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=serve, args=(str(kp.pubkey()), child), daemon=True)
+    proc.start()
+    base = f"http://127.0.0.1:{parent.recv()}"
+    try:
+        results = asyncio.run(drive(base, parent, str(list(bytes(kp))), str(kp.pubkey())))
+    finally:
+        parent.send("stop")
+        proc.join(5)
+
+    report = {
+        "bench": "e2e",
+        "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git": git_state(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {
+            "seconds": SECONDS, "tokens": TOKENS, "backend": BACKEND, "noise_bps": NOISE_BPS,
+            "dislocation_s": DISLOCATION_S, "error_rate": ERROR_RATE, "rate_429": RATE_429,
+            "confirm_ms": CONFIRM_MS, "latency_ms": LATENCY_MS,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    with open(OUT, "w") as f:
+        f.write(text + "\n")
+    r = results
+    opp = r["standin"]["opportunity_to_execute_ms"]
+    print(f"{r['ticks_per_s']} ticks/s, {r['cpu_ms_per_tick']} ms CPU/tick, "
+          f"{r['standin']['executions']} executions ({r['standin']['rejected']} rejected), "
+          f"opportunity->execute "
+          f"p50 {opp['p50']} ms p99 {opp['p99']} ms, max RSS {r['max_rss_mb']} MB", file=sys.stderr)
+    baseline = os.getenv("BENCH_BASELINE")
+    if baseline:
+        with open(baseline) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Multi-region Jito submission against local stand-in block engines.
+
+Starts one JSON-RPC sendBundle server per simulated region (each with its
+own latency, one of them rejecting bundles), then submits BENCH_N bundles
+through JitoRegions and reports which regions won and how they rank.
+"""
+import asyncio
+import collections
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+
+from solbot.core.env import Settings
+from solbot.core.http import HttpPool
+from solbot.execution.jito import JitoRegions
+from solbot.execution.tx_builder import TxBuilder
+
+N = int(os.getenv("BENCH_N", "200"))
+# region name -> (latency seconds, accepts bundles)
+REGIONS = {"ny": (0.004, True), "ams": (0.012, True), "tokyo": (0.030, True), "bad": (0.001, False)}
+
+
+async def block_engine(latency: float, accept: bool) -> asyncio.AbstractServer:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                req = json.loads(await reader.readexactly(length))
+                await asyncio.sleep(latency)
+                if accept and req["method"] == "sendBundle" and len(req["params"][0]) == 2:
+                    body = {"jsonrpc": "2.0", "id": req["id"], "result": f"bundle-{time.time_ns()}"}
+                else:
+                    error = {"code": -32602, "message": "rejected"}
+                    body = {"jsonrpc": "2.0", "id": req["id"], "error": error}
+                out = json.dumps(body).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(out)}\r\n\r\n".encode() + out
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def main() -> None:
+    servers, urls = [], {}
+    for name, (latency, accept) in REGIONS.items():
+        srv = await block_engine(latency, accept)
+        servers.append(srv)
+        port = srv.sockets[0].getsockname()[1]
+        urls[f"http://127.0.0.1:{port}/api/v1/bundles"] = name
+
+    settings = Settings(JITO_REGIONS=list(urls), JITO_FANOUT=2, JITO_EXPLORE=0.1, HTTP2=False)
+    http = HttpPool(settings)
+    jito = JitoRegions(settings, http)
+    kp = Keypair()
+    swap_b64 = TxBuilder.tip_transaction(kp, jito.tip_account(), 1, str(Hash.default()))
+    for r in jito.regions:  # open connections outside the measured loop (the supervisor warms them)
+        await r.bundles.send_bundle([swap_b64, swap_b64], "base64")
+
+    wins: collections.Counter[str] = collections.Counter()
+    t0 = time.perf_counter()
+    for _ in range(N):
+        tip_b64 = TxBuilder.tip_transaction(kp, jito.tip_account(), 10_000, str(Hash.default()))
+        region, _ = await jito.submit([swap_b64, tip_b64])
+        wins[urls[region]] += 1
+    dt = time.perf_counter() - t0
+
+    print(f"{N} bundles in {dt:.2f}s ({dt / N * 1000:.1f} ms/bundle)")
+    for r in sorted(jito.regions, key=lambda r: r.score):
+        name = urls[r.url]
+        print(f"  {name:<6} wins={wins[name]:<5} ewma={r.latency_ms:7.1f} ms  "
+              f"accepted={r.accepted:<5} rejected={r.rejected}")
+    await jito.aclose()
+    await http.aclose()
+    for srv in servers:
+        srv.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
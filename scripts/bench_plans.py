@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Per-tick plan construction cost: dict + pydantic + full sort vs Quote + slotted Plan + heap."""
+import base64
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pydantic import BaseModel
+
+from solbot.quoter import Quote
+from solbot.strategy.models import Plan
+
+PAIRS = int(os.getenv("BENCH_PAIRS", "120"))
+TICKS = int(os.getenv("BENCH_TICKS", "200"))
+TOP_N = 8
+
+
+class DictPlan(BaseModel):
+    """The previous Plan model, kept here for comparison."""
+    input_mint: str
+    output_mint: str
+    input_amount: int
+    quote_response: dict[str, Any]
+    notional_usd: float
+    expected_pnl_usd: float
+    max_slippage_bps: int
+    notes: str | None = None
+
+
+def order_body(i: int) -> bytes:
+    amount = 50_000_000
+    out = int(amount * random.uniform(0.99, 1.01))
+    hop = {"swapInfo": {"ammKey": "A" * 44, "label": "Whirlpool", "inputMint": "I" * 44,
+                        "outputMint": "O" * 44, "inAmount": str(amount), "outAmount": str(out),
+                        "feeAmount": "1000", "feeMint": "F" * 44}, "percent": 100, "bps": 10000}
+    return json.dumps({
+        "mode": "ultra", "inputMint": "I" * 44, "outputMint": "O" * 44,
+        "inAmount": str(amount), "outAmount": str(out), "otherAmountThreshold": str(out - 10),
+        "swapMode": "ExactIn", "slippageBps": 60, "priceImpactPct": "0.0001",
+        "routePlan": [hop, hop], "feeBps": 10, "prioritizationFeeLamports": 5000,
+        "transaction": base64.b64encode(os.urandom(1100)).decode(),
+        "requestId": f"req-{i:08d}", "gasless": False, "totalTime": 120,
+    }).encode()
+
+
+def old_tick(bodies: list[bytes]) -> list[DictPlan]:
+    plans = []
+    for raw in bodies:
+        q = json.loads(raw)
+        in_amt, out_amt = int(q["inAmount"]), int(q["outAmount"])
+        plans.append(DictPlan(
+            input_mint="I" * 44, output_mint="O" * 44, input_amount=in_amt, quote_response=q,
+            notional_usd=50.0, expected_pnl_usd=(out_amt - in_amt) / 1e6, max_slippage_bps=50,
+        ))
+    plans.sort(key=lambda p: p.expected_pnl_usd, reverse=True)
+    return plans[:TOP_N]
+
+
+def new_tick(bodies: list[bytes]) -> list[Plan]:
+    plans = []
+    for raw in bodies:
+        q = Quote.from_bytes(raw)
+        plans.append(Plan(
+            input_mint="I" * 44, output_mint="O" * 44, input_amount=q.in_amount, quote_response=q,
+            notional_usd=50.0, expected_pnl_usd=(q.out_amount - q.in_amount) / 1e6,
+            max_slippage_bps=50,
+        ))
+    return heapq.nlargest(TOP_N, plans, key=lambda p: p.expected_pnl_usd)
+
+
+def bench(name: str, fn, bodies: list[bytes]) -> float:
+    fn(bodies)
+    t0 = time.perf_counter()
+    for _ in range(TICKS):
+        fn(bodies)
+    us = (time.perf_counter() - t0) / TICKS * 1e6
+    print(f"{name:<32} {us:>9.1f} us/tick  {us / PAIRS:>6.2f} us/plan")
+    return us
+
+
+def main() -> None:
+    random.seed(7)
+    bodies = [order_body(i) for i in range(PAIRS)]
+    old, new = old_tick(bodies), new_tick(bodies)
+    assert [p.expected_pnl_usd for p in old] == [p.expected_pnl_usd for p in new]
+    print(f"{PAIRS} quotes/tick, {len(bodies[0])} B per body, top {TOP_N}")
+    a = bench("json + pydantic Plan + sort", old_tick, bodies)
+    b = bench("Quote scan + slotted Plan + heap", new_tick, bodies)
+    print(f"speedup: {a / b:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
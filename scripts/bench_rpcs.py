@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 import asyncio
+import os
 import statistics
 import time
 import httpx
 
-ENDPOINTS = [
-    "https://api.mainnet-beta.solana.com",
-]
+ENDPOINTS = os.getenv("RPC_HTTPS", "https://api.mainnet-beta.solana.com").split(",")
 
 async def ping(url: str) -> float:
     t0 = time.perf_counter()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Signatures/second for the Ultra signing path: solders round trip vs in-place signing."""
+import asyncio
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+
+from solbot.execution.signer import Signer
+
+N = int(os.getenv("BENCH_N", "5000"))
+
+
+def unsigned_tx(kp: Keypair) -> str:
+    ix = transfer(TransferParams(from_pubkey=kp.pubkey(), to_pubkey=Keypair().pubkey(), lamports=1))
+    msg = MessageV0.try_compile(kp.pubkey(), [ix], [], Hash.default())
+    tx = VersionedTransaction.populate(msg, [Keypair().sign_message(b"placeholder")])
+    return base64.b64encode(bytes(tx)).decode()
+
+
+def solders_roundtrip(kp: Keypair, tx_b64: str) -> str:
+    tx = VersionedTransaction.from_bytes(base64.b64decode(tx_b64))
+    signed = VersionedTransaction(tx.message, [kp])
+    return base64.b64encode(bytes(signed)).decode()
+
+
+def report(name: str, dt: float) -> None:
+    print(f"{name:<24} {N / dt:>10.0f} sig/s  {dt / N * 1e6:>8.1f} us/sig")
+
+
+async def run_async(signer: Signer, tx_b64: str) -> float:
+    await signer.sign(tx_b64)  # spin up the pool outside the timed region
+    t0 = time.perf_counter()
+    await asyncio.gather(*[signer.sign(tx_b64) for _ in range(N)])
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    kp = Keypair()
+    tx_b64 = unsigned_tx(kp)
+    secret = str(list(bytes(kp)))
+
+    signer = Signer(secret)
+    assert signer.sign_b64(tx_b64) == solders_roundtrip(kp, tx_b64)
+
+    t0 = time.perf_counter()
+    for _ in range(N):
+        solders_roundtrip(kp, tx_b64)
+    report("solders round trip", time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(N):
+        signer.sign_b64(tx_b64)
+    report("in-place (inline)", time.perf_counter() - t0)
+
+    for mode in ("thread", "process"):
+        s = Signer(secret, mode, workers=os.cpu_count() or 1)
+        report(f"in-place ({mode})", asyncio.run(run_async(s, tx_b64)))
+        s.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
-#!/usr/bin/env python3
-from solbot.__main__ import main
+# Importing the package stays cheap: `main` (and with it the supervisor and
+# every service module) is only imported when it is actually used.
 
-if __name__ == "__main__":
-    main()
+
+def __getattr__(name: str):
+    if name == "main":
+        from solbot.__main__ import main
+
+        return main
+    raise AttributeError(f"module 'solbot' has no attribute {name!r}")
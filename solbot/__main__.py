@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
-import asyncio
-from solbot.core.env import Settings
-from solbot.core.logger import logger
-from solbot.services.supervisor import run_supervisor
+import time
+
+_T0 = time.perf_counter()
+
+import asyncio  # noqa: E402
+from solbot.core.env import Settings  # noqa: E402
+from solbot.core.logger import logger  # noqa: E402
 
 
 def main() -> None:
     settings = Settings()
     logger.info("Starting Solbot", extra={"network": settings.solana_rpc_url})
-    asyncio.run(run_supervisor(settings))
+    # Imported here so the time spent importing the services shows up in the
+    # startup breakdown (and `import solbot.__main__` stays light).
+    from solbot.services.supervisor import run_supervisor
+
+    asyncio.run(run_supervisor(settings, started_at=_T0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import itertools
+import json
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+from solbot.mints import MINTS
+
+if TYPE_CHECKING:
+    from solbot.core.env import Settings
+    from solbot.core.rpc import RpcPool
+
+AMM_UPDATES = REGISTRY.counter(
+    "solbot_amm_updates_total", "Pool vault balance updates received over the websocket"
+)
+
+# SPL token account: mint (32), owner (32), amount (u64 LE), ...
+TOKEN_AMOUNT = struct.Struct("<Q")
+TOKEN_AMOUNT_OFFSET = 64
+# getMultipleAccounts accepts at most this many keys per call.
+MAX_ACCOUNTS_BATCH = 100
+STABLE_ITERATIONS = 32
+
+
+@dataclass(frozen=True, slots=True)
+class PoolSpec:
+    """One AMM pool, described by the token vaults that hold its reserves."""
+
+    base: str
+    quote: str
+    base_vault: str
+    quote_vault: str
+    kind: str = "cp"  # "cp" (x*y=k) or "stable" (2-coin StableSwap)
+    fee_bps: float = 25.0
+    amp: float = 100.0
+    base_decimals: int | None = None  # None: taken from the token registry
+    quote_decimals: int | None = None
+
+
+def load_pools(path: str) -> list[PoolSpec]:
+    """Pool list from a JSON file: a list of PoolSpec field objects."""
+    with open(os.path.expanduser(path)) as f:
+        return [PoolSpec(**row) for row in json.load(f)]
+
+
+def cp_out(r_in: np.ndarray, r_out: np.ndarray, amount: np.ndarray, fee: np.ndarray) -> np.ndarray:
+    """Constant-product output with the fee taken on the input."""
+    x = amount * (1.0 - fee)
+    return r_out * x / (r_in + x)
+
+
+def stable_out(
+    r_in: np.ndarray, r_out: np.ndarray, amount: np.ndarray, fee: np.ndarray, amp: np.ndarray
+) -> np.ndarray:
+    """2-coin StableSwap (Curve) output, fee taken on the output.
+
+    Reserves and amount must be in the same (decimal-normalized) units. Both
+    Newton iterations run a fixed number of steps over the whole batch.
+    """
+    ann = amp * 4.0
+    s = r_in + r_out
+    d = s.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(STABLE_ITERATIONS):
+            d_p = d ** 3 / (4.0 * r_in * r_out)
+            d = (ann * s + 2.0 * d_p) * d / ((ann - 1.0) * d + 3.0 * d_p)
+        x = r_in + amount
+        c = d ** 3 / (4.0 * x * ann)
+        b = x + d / ann
+        y = d.copy()
+        for _ in range(STABLE_ITERATIONS):
+            y = (y * y + c) / (2.0 * y + b - d)
+    return np.maximum(r_out - y, 0.0) * (1.0 - fee)
+
+
+class PoolMirror:
+    """In-memory reserves of the watchlist's AMM pools, quoted locally.
+
+    Reserves are seeded with one `getMultipleAccounts` snapshot through
+    RpcPool and then kept current by `accountSubscribe` on every pool vault
+    over a single websocket (AMM_WS_URL), reconnecting and re-snapshotting
+    on failure. `quote_many` prices a whole batch of (input, output, amount)
+    requests with array math, so strategies can screen every pair locally
+    and only call `/order` for the candidates worth executing. Quotes are
+    NaN until the mirror is `ready` and for pairs without a pool.
+    """
+
+    def __init__(self, settings: Settings, rpc_pool: RpcPool, pools: list[PoolSpec]):
+        self.s = settings
+        self.rpc = rpc_pool
+        self.pools = pools
+        self.ws_url = settings.AMM_WS_URL or _ws_url(settings.RPC_HTTPS[0])
+        n = len(pools)
+        self.base_ids = np.array(
+            [MINTS.intern(p.base, p.base_decimals) for p in pools], dtype=np.int32
+        )
+        self.quote_ids = np.array(
+            [MINTS.intern(p.quote, p.quote_decimals) for p in pools], dtype=np.int32
+        )
+        self.reserves = np.zeros((n, 2))  # raw units per (pool, base/quote)
+        self.reserve_slot = np.zeros((n, 2), dtype=np.int64)
+        self.fee = np.array([p.fee_bps / 10_000 for p in pools])
+        self.amp = np.array([p.amp for p in pools])
+        self.stable = np.array([p.kind == "stable" for p in pools], dtype=bool)
+        self.updated = np.zeros(n)
+        self.slot = 0
+        self.ready = False
+        # vault address -> (pool row, 0 = base / 1 = quote)
+        self._vaults: dict[str, tuple[int, int]] = {}
+        for i, p in enumerate(pools):
+            self._vaults[p.base_vault] = (i, 0)
+            self._vaults[p.quote_vault] = (i, 1)
+        # (input id, output id) -> (pool row, input side); the first pool listed wins
+        self._routes: dict[tuple[int, int], tuple[int, int]] = {}
+        pairs = zip(self.base_ids.tolist(), self.quote_ids.tolist(), strict=True)
+        for i, (b, q) in enumerate(pairs):
+            self._routes.setdefault((b, q), (i, 0))
+            self._routes.setdefault((q, b), (i, 1))
+        self._task: asyncio.Task[None] | None = None
+        REGISTRY.gauge_fn(
+            "solbot_amm_ready", "1 while local AMM quotes are live", lambda: float(self.ready)
+        )
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def has(self, input_id: int, output_id: int) -> bool:
+        return (input_id, output_id) in self._routes
+
+    def quote_many(self, src: np.ndarray, dst: np.ndarray, amount: np.ndarray) -> np.ndarray:
+        """Raw output amounts for raw `amount`s of `src` -> `dst` (NaN if not quotable)."""
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        amount = np.asarray(amount, dtype=np.float64)
+        out = np.full(amount.shape, np.nan)
+        if not self.ready or not amount.size:
+            return out
+        hits = [self._routes.get(k) for k in zip(src.tolist(), dst.tolist(), strict=True)]
+        mask = np.array([h is not None for h in hits], dtype=bool)
+        if not mask.any():
+            return out
+        rows = np.array([h[0] for h in hits if h is not None])
+        side = np.array([h[1] for h in hits if h is not None])
+        r_in = self.reserves[rows, side]
+        r_out = self.reserves[rows, 1 - side]
+        amt, fee = amount[mask], self.fee[rows]
+        res = np.full(rows.shape, np.nan)
+        live = (r_in > 0) & (r_out > 0)
+        cp = live & ~self.stable[rows]
+        res[cp] = cp_out(r_in[cp], r_out[cp], amt[cp], fee[cp])
+        # StableSwap works in decimal-normalized units; convert in and back out.
+        dec_in, dec_out = MINTS.decimals[src[mask]], MINTS.decimals[dst[mask]]
+        st = live & self.stable[rows] & (dec_in >= 0) & (dec_out >= 0)
+        if st.any():
+            d_in, d_out = 10.0 ** dec_in[st], 10.0 ** dec_out[st]
+            res[st] = stable_out(
+                r_in[st] / d_in, r_out[st] / d_out, amt[st] / d_in, fee[st], self.amp[rows[st]]
+            ) * d_out
+        out[mask] = res
+        return out
+
+    def quote(self, input_id: int, output_id: int, amount: int) -> float:
+        out = self.quote_many(np.array([input_id]), np.array([output_id]), np.array([amount]))
+        return float(out[0])
+
+    # --- feed ---------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.ready = False
+
+    async def snapshot(self) -> None:
+        """Load every vault balance once over HTTP RPC."""
+        vaults = list(self._vaults)
+        for i in range(0, len(vaults), MAX_ACCOUNTS_BATCH):
+            batch = vaults[i : i + MAX_ACCOUNTS_BATCH]
+            res = await self.rpc.call(
+                "getMultipleAccounts", [batch, {"encoding": "base64", "commitment": "confirmed"}]
+            )
+            slot = int(res["context"]["slot"])
+            self.slot = max(self.slot, slot)
+            for vault, acct in zip(batch, res["value"], strict=True):
+                if acct:
+                    self._apply(vault, acct["data"][0], slot)
+        logger.info("amm.snapshot", extra={
+            "pools": len(self.pools), "live": int((self.reserves > 0).all(axis=1).sum()),
+            "slot": self.slot,
+        })
+
+    def _apply(self, vault: str, data_b64: str, slot: int) -> None:
+        row, side = self._vaults[vault]
+        if slot < self.reserve_slot[row, side]:
+            return  # older than what we already have (snapshot vs. buffered update)
+        raw = base64.b64decode(data_b64)
+        if len(raw) < TOKEN_AMOUNT_OFFSET + TOKEN_AMOUNT.size:
+            return
+        (amount,) = TOKEN_AMOUNT.unpack_from(raw, TOKEN_AMOUNT_OFFSET)
+        self.reserves[row, side] = amount
+        self.reserve_slot[row, side] = slot
+        self.updated[row] = time.monotonic()
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                await self._subscribe()
+                backoff = 0.5
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001
+                self.ready = False
+                logger.warning("amm.ws_failed", extra={"url": self.ws_url, "err": str(e)})
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+
+    async def _subscribe(self) -> None:
+        from websockets.asyncio.client import connect
+
+        async with connect(self.ws_url, max_size=None, ping_interval=20) as ws:
+            ids = itertools.count(1)
+            pending: dict[int, str] = {}
+            for vault in self._vaults:
+                rid = next(ids)
+                pending[rid] = vault
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0", "id": rid, "method": "accountSubscribe",
+                    "params": [vault, {"encoding": "base64", "commitment": self.s.AMM_COMMITMENT}],
+                }))
+            # Subscribed before snapshotting, so no update between the two is missed;
+            # per-vault slots keep whichever of the two is newer.
+            await self.snapshot()
+            self.ready = bool((self.reserves > 0).all(axis=1).any())
+            subs: dict[int, str] = {}
+            async for msg in ws:
+                m = json.loads(msg)
+                if "id" in m:
+                    vault = pending.pop(m["id"], None)
+                    if vault is not None and "result" in m:
+                        subs[m["result"]] = vault
+                    elif vault is not None:
+                        logger.warning("amm.subscribe_failed", extra={
+                            "vault": vault, "err": m.get("error")
+                        })
+                    continue
+                if m.get("method") != "accountNotification":
+                    continue
+                params = m["params"]
+                vault = subs.get(params["subscription"])
+                if vault is None:
+                    continue
+                result = params["result"]
+                slot = int(result["context"]["slot"])
+                self.slot = max(self.slot, slot)
+                self._apply(vault, result["value"]["data"][0], slot)
+                AMM_UPDATES.inc()
+        raise ConnectionError("websocket closed")
+
+
+def _ws_url(http_url: str) -> str:
+    if http_url.startswith("https://"):
+        return "wss://" + http_url[len("https://"):]
+    if http_url.startswith("http://"):
+        return "ws://" + http_url[len("http://"):]
+    return http_url
@@ -1,5 +1,11 @@
 from fastapi import FastAPI
+from solbot.core.env import get_settings
+from solbot.routes.debug import router as debug_router
 from solbot.routes.health import router as health_router
+from solbot.routes.metrics import router as metrics_router
 
 app = FastAPI(title="Solbot", version="0.1.0")
 app.include_router(health_router)
+app.include_router(metrics_router)
+if get_settings().API_DEBUG:
+    app.include_router(debug_router)
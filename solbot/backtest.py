@@ -0,0 +1,216 @@
+"""Replay recorded quotes through the strategies and ranking, offline.
+
+    python -m solbot.backtest quotes/quotes-*.bin.gz \
+        --set MIN_PROFIT_USD=0,0.25,0.5 --set MAX_NOTIONAL_USD=25,50 \
+        --set SLIPPAGE_BPS_PER_LEG=10,25 --workers 8
+
+Each parameter combination runs in its own worker process over the same
+records, as fast as the CPU allows (no sleeps, no network).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from solbot.core.env import Settings
+from solbot.core.logger import logger
+from solbot.discovery import DiscoveryService
+from solbot.fanout import QuoteFanout
+from solbot.mints import MINTS
+from solbot.quoter import Quote
+from solbot.recorder import Record, read_records
+from solbot.risk.daily_guard import DailyLossGuard
+from solbot.services.pipeline import PlanBook, rank_into
+from solbot.strategy.stable_delta import StableDelta
+from solbot.strategy.two_leg_spread import TwoLegSpread
+
+# A gap this long between recorded quotes means the bot was not running.
+IDLE_GAP_S = 5.0
+
+
+class ReplayQuoter:
+    """Stands in for JupiterQuoter, answering from the replayed quote stream.
+
+    `feed` makes a recorded quote current and notifies listeners, as a live
+    fetch would. Requests for an amount that was never recorded get the
+    latest quote for that direction scaled linearly (no price impact).
+    Orders are priced at the static PRIORITY_FEE_MICRO_LAMPORTS.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.cu_price = settings.PRIORITY_FEE_MICRO_LAMPORTS
+        self.listeners: list[Callable[[str, str, int, Quote], None]] = []
+        self._exact: dict[tuple[str, str, int], Quote] = {}
+        self._latest: dict[tuple[str, str], Quote] = {}
+
+    def feed(self, input_mint: str, output_mint: str, amount: int, raw: bytes) -> None:
+        quote = Quote.from_bytes(raw)
+        self._exact[(input_mint, output_mint, amount)] = quote
+        self._latest[(input_mint, output_mint)] = quote
+        for cb in self.listeners:
+            cb(input_mint, output_mint, amount, quote)
+
+    async def get_quote(self, input_mint: str, output_mint: str, amount: int) -> Quote | None:
+        quote = self._exact.get((input_mint, output_mint, amount))
+        if quote is not None:
+            return quote
+        last = self._latest.get((input_mint, output_mint))
+        if last is None or last.in_amount <= 0:
+            return None
+        return Quote.from_dict({
+            "requestId": "replay",
+            "transaction": "replay",
+            "inAmount": str(amount),
+            "outAmount": str(last.out_amount * amount // last.in_amount),
+        })
+
+    fetch_quote = get_quote
+
+    def fee(self) -> int:
+        return self.cu_price
+
+
+def _discovery(settings: Settings, records: list[Record]) -> DiscoveryService:
+    """Watchlist = every recorded pair; decimals from the on-disk token cache."""
+    discovery = DiscoveryService(settings, None)
+    registry = discovery.registry
+    registry.load()
+    pairs: dict[frozenset[str], tuple[str, str]] = {}
+    for _, src, dst, _, _ in records:
+        pairs.setdefault(frozenset((src, dst)), (src, dst))
+        for mint in (src, dst):
+            if MINTS.id(mint) is None:
+                MINTS.intern(mint, registry.decimals(mint))
+    discovery.watchlist = [{"base": b, "quote": q} for b, q in pairs.values()]
+    discovery._sync_pairs()
+    return discovery
+
+
+async def _replay(settings: Settings, records: list[Record]) -> dict[str, Any]:
+    discovery = _discovery(settings, records)
+    quoter = ReplayQuoter(settings)
+    quoter.listeners.append(discovery.observe)
+    fanout = QuoteFanout(settings, quoter)  # type: ignore[arg-type]
+    strategies = [
+        TwoLegSpread(settings, discovery, quoter, fanout),  # type: ignore[arg-type]
+        StableDelta(settings, discovery, quoter, fanout),  # type: ignore[arg-type]
+    ]
+    guard = DailyLossGuard(settings.MAX_DAILY_LOSS_USD)
+    now = records[0][0] if records else 0.0
+    book = PlanBook(settings.PLAN_BOOK_SIZE, settings.PLAN_MAX_AGE_MS / 1000, clock=lambda: now)
+    tick_s = settings.SCAN_INTERVAL_MS / 1000
+    workers = max(1, settings.EXEC_WORKERS)
+    out = {"ticks": 0, "plans": 0, "executed": 0, "pnl_usd": 0.0, "pnl_worst_usd": 0.0}
+    peak = drawdown = 0.0
+
+    async def tick() -> None:
+        nonlocal peak, drawdown
+        out["ticks"] += 1
+        for strategy in strategies:
+            plans = await strategy.propose_plans()
+            for p in plans:
+                p.created_at = now
+            out["plans"] += len(plans)
+            rank_into(book, plans, settings.MIN_PROFIT_USD)
+        for _ in range(workers):
+            plan = book.pop_nowait()
+            if plan is None or guard.exceeded():
+                break
+            book.discard(plan)
+            guard.add_pnl(plan.expected_pnl_usd)
+            out["executed"] += 1
+            out["pnl_usd"] += plan.expected_pnl_usd
+            # Worst case: every leg fills at its full slippage allowance.
+            out["pnl_worst_usd"] += (
+                plan.expected_pnl_usd - plan.notional_usd * plan.max_slippage_bps / 10_000
+            )
+        peak = max(peak, out["pnl_usd"])
+        drawdown = max(drawdown, peak - out["pnl_usd"])
+
+    next_tick = now
+    for ts, src, dst, amount, raw in records:
+        if ts - next_tick > IDLE_GAP_S:
+            next_tick = ts  # recorder was off; don't simulate the dead time
+        while ts >= next_tick:
+            now = next_tick
+            await tick()
+            next_tick += tick_s
+        quoter.feed(src, dst, amount, raw)
+    if records:
+        now = next_tick
+        await tick()
+    out["max_drawdown_usd"] = drawdown
+    out["halted"] = guard.exceeded()
+    return out
+
+
+def run_backtest(records: list[Record], overrides: dict[str, Any] | None = None) -> dict[str, Any]:
+    settings = Settings(**(overrides or {}))
+    t0 = time.perf_counter()
+    result = asyncio.run(_replay(settings, records))
+    result["seconds"] = round(time.perf_counter() - t0, 3)
+    return {"params": overrides or {}, **result}
+
+
+# Per-worker copy of the records, loaded once by the pool initializer.
+_records: list[Record] = []
+
+
+def _worker_init(paths: list[str]) -> None:
+    global _records
+    logging.getLogger("solbot").setLevel(logging.WARNING)
+    _records = list(read_records(paths))
+
+
+def _worker_run(overrides: dict[str, Any]) -> dict[str, Any]:
+    return run_backtest(_records, overrides)
+
+
+def sweep(
+    paths: Iterable[str | Path], grid: dict[str, list[str]], workers: int | None = None
+) -> list[dict[str, Any]]:
+    """Run every combination in `grid` (setting name -> values) across a process pool."""
+    names = list(grid)
+    combos = [dict(zip(names, values, strict=True)) for values in itertools.product(*grid.values())]
+    files = sorted(str(p) for p in paths)
+    with ProcessPoolExecutor(
+        workers or os.cpu_count(), initializer=_worker_init, initargs=(files,)
+    ) as pool:
+        return list(pool.map(_worker_run, combos))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    ap.add_argument("logs", nargs="+", help="recorder files (quotes-*.bin.gz)")
+    ap.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                    help="setting to sweep, e.g. MIN_PROFIT_USD=0,0.5")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    grid = {}
+    for spec in args.set:
+        name, values = spec.split("=", 1)
+        grid[name.strip()] = values.split(",")
+    t0 = time.perf_counter()
+    results = sweep(args.logs, grid, args.workers)
+    results.sort(key=lambda r: r["pnl_usd"], reverse=True)
+    for r in results:
+        params = " ".join(f"{k}={v}" for k, v in r["params"].items()) or "(defaults)"
+        print(f"{params:<60} pnl={r['pnl_usd']:>10.4f} worst={r['pnl_worst_usd']:>10.4f} "
+              f"dd={r['max_drawdown_usd']:>8.4f} exec={r['executed']:<6} plans={r['plans']:<7} "
+              f"ticks={r['ticks']:<7} {r['seconds']}s")
+    logger.info("backtest.done", extra={
+        "runs": len(results), "seconds": round(time.perf_counter() - t0, 2)
+    })
+
+
+if __name__ == "__main__":
+    main()
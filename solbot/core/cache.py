@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class SingleFlightCache(Generic[V]):
+    """Age-bounded LRU cache with single-flight coalescing of concurrent misses.
+
+    Concurrent callers asking for the same key share one fetch task; the task
+    is shielded so a caller being cancelled (e.g. a scan deadline) does not
+    abort the fetch for the others. Failed fetches and `None` results are
+    never stored.
+    """
+
+    def __init__(self, max_age_s: float, max_size: int = 512):
+        self.max_age_s = max_age_s
+        self.max_size = max_size
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task[V]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def peek(self, key: Hashable) -> V | None:
+        """Return a fresh cached value without fetching or touching counters."""
+        entry = self._data.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.max_age_s:
+            return None
+        return entry[1]
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[V]]) -> V:
+        entry = self._data.get(key)
+        if entry is not None:
+            if time.monotonic() - entry[0] <= self.max_age_s:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._data[key]
+            self.evictions += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._settle(key, t))
+        return await asyncio.shield(task)
+
+    def _settle(self, key: Hashable, task: asyncio.Task[V]) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        if value is None or self.max_age_s <= 0:
+            return
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value (e.g. a single-use order once it has been executed)."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
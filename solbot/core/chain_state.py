@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+
+from solbot.core.env import Settings
+from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+from solbot.core.rpc import RpcPool
+
+# A blockhash stays valid for 150 blocks (~60s); stop handing it out well before.
+BLOCKHASH_VALID_BLOCKS = 150
+BLOCKHASH_MAX_AGE_S = 45.0
+FEE_PERCENTILES_SHOWN = (25, 50, 75, 90, 99)
+
+
+class ChainState:
+    """Latest blockhash and priority-fee levels, prefetched through RpcPool.
+
+    Two background loops poll `getLatestBlockhash` (BLOCKHASH_POLL_MS) and
+    `getRecentPrioritizationFees` (FEE_POLL_MS). Fee samples are kept per slot
+    over the last FEE_WINDOW_SLOTS slots and every integer percentile is
+    precomputed after each poll, so `fee(pct)` and `blockhash()` are plain
+    attribute reads on the execution path.
+    """
+
+    def __init__(self, settings: Settings, rpc_pool: RpcPool):
+        self.s = settings
+        self.rpc = rpc_pool
+        self._blockhash: str | None = None
+        self.last_valid_block_height = 0
+        self.blockhash_at = 0.0
+        self._fees_by_slot: dict[int, int] = {}
+        self._percentiles: np.ndarray | None = None  # index p -> fee at percentile p
+        self._tasks: list[asyncio.Task[None]] = []
+        # Called as cb(fee) when the PRIORITY_FEE_PERCENTILE fee changes.
+        self.listeners: list[Callable[[int], None]] = []
+        REGISTRY.gauge_fn(
+            "solbot_priority_fee_micro_lamports", "Recent prioritization fee by percentile",
+            lambda: [({"percentile": p}, self.fee(p)) for p in FEE_PERCENTILES_SHOWN],
+        )
+        REGISTRY.gauge_fn(
+            "solbot_blockhash_age_seconds", "Age of the prefetched blockhash",
+            lambda: time.monotonic() - self.blockhash_at if self.blockhash_at else -1.0,
+        )
+
+    def blockhash(self) -> str | None:
+        """Latest blockhash, or None if none is fresh enough to sign with."""
+        if time.monotonic() - self.blockhash_at > BLOCKHASH_MAX_AGE_S:
+            return None
+        return self._blockhash
+
+    def block_height(self) -> int:
+        """Block height as of the last blockhash poll (0 before the first one)."""
+        if not self.last_valid_block_height:
+            return 0
+        return self.last_valid_block_height - BLOCKHASH_VALID_BLOCKS
+
+    def fee(self, percentile: float | None = None) -> int:
+        """Compute-unit price (micro-lamports) at `percentile` of recent slots.
+
+        Defaults to PRIORITY_FEE_PERCENTILE; falls back to the static
+        PRIORITY_FEE_MICRO_LAMPORTS until the first poll lands. Capped at
+        PRIORITY_FEE_MAX_MICRO_LAMPORTS.
+        """
+        table = self._percentiles
+        if table is None:
+            return self.s.PRIORITY_FEE_MICRO_LAMPORTS
+        p = self.s.PRIORITY_FEE_PERCENTILE if percentile is None else percentile
+        fee = int(table[min(100, max(0, int(round(p))))])
+        return min(fee, self.s.PRIORITY_FEE_MAX_MICRO_LAMPORTS)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._loop(self.refresh_blockhash, self.s.BLOCKHASH_POLL_MS)),
+            asyncio.create_task(self._loop(self.refresh_fees, self.s.FEE_POLL_MS)),
+        ]
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, fn: Callable[[], Awaitable[None]], interval_ms: int) -> None:
+        while True:
+            try:
+                await fn()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("chain.poll_failed", extra={"poll": fn.__name__, "err": str(e)})
+            await asyncio.sleep(interval_ms / 1000)
+
+    async def refresh_blockhash(self) -> None:
+        res = await self.rpc.call("getLatestBlockhash", [{"commitment": "confirmed"}])
+        value = res["value"]
+        self._blockhash = value["blockhash"]
+        self.last_valid_block_height = int(value["lastValidBlockHeight"])
+        self.blockhash_at = time.monotonic()
+
+    async def refresh_fees(self) -> None:
+        res = await self.rpc.call("getRecentPrioritizationFees", [[]])
+        if not res:
+            return
+        for row in res:
+            self._fees_by_slot[int(row["slot"])] = int(row["prioritizationFee"])
+        newest = max(self._fees_by_slot)
+        window = self.s.FEE_WINDOW_SLOTS
+        self._fees_by_slot = {
+            slot: fee for slot, fee in self._fees_by_slot.items() if slot > newest - window
+        }
+        fees = np.fromiter(self._fees_by_slot.values(), dtype=np.float64)
+        before = self.fee()
+        self._percentiles = np.percentile(fees, np.arange(101))
+        logger.debug("chain.fees", extra={
+            "slots": fees.size, "p50": self.fee(50), "p90": self.fee(90)
+        })
+        fee = self.fee()
+        if fee != before:
+            for cb in self.listeners:
+                cb(fee)
@@ -18,13 +18,83 @@ class Settings(BaseModel):
 
     # Pools & scanning
     RPC_HTTPS: List[str] = os.getenv("RPC_HTTPS", "").split(",") if os.getenv("RPC_HTTPS") else ["https://api.mainnet-beta.solana.com"]
+    RPC_PROBE_INTERVAL_MS: int = int(os.getenv("RPC_PROBE_INTERVAL_MS", "2000"))
+    RPC_EWMA_ALPHA: float = float(os.getenv("RPC_EWMA_ALPHA", "0.2"))
+    RPC_HEDGE_K: int = int(os.getenv("RPC_HEDGE_K", "2"))
     SCAN_INTERVAL_MS: int = int(os.getenv("SCAN_INTERVAL_MS", "200"))
+    SCAN_MIN_GAP_MS: int = int(os.getenv("SCAN_MIN_GAP_MS", "20"))
     PAUSE_AFTER_FAILS: int = int(os.getenv("PAUSE_AFTER_FAILS", "5"))
+    # >1: scan in this many worker processes; this process ranks and executes
+    SCAN_SHARDS: int = int(os.getenv("SCAN_SHARDS", "1"))
+
+    # Client-side rate limiting per (host, API key); adapts to 429s (AIMD)
+    RATE_LIMIT_RPS: float = float(os.getenv("RATE_LIMIT_RPS", "10"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "5"))
+    RATE_LIMIT_MIN_RPS: float = float(os.getenv("RATE_LIMIT_MIN_RPS", "1"))
+    RATE_LIMIT_MAX_RPS: float = float(os.getenv("RATE_LIMIT_MAX_RPS", "50"))
+    RATE_LIMIT_INCREASE: float = float(os.getenv("RATE_LIMIT_INCREASE", "0.1"))
+    RATE_LIMIT_RESERVE: float = float(os.getenv("RATE_LIMIT_RESERVE", "1"))
+
+    # Quote cache
+    QUOTE_CACHE_MAX_AGE_MS: int = int(os.getenv("QUOTE_CACHE_MAX_AGE_MS", "150"))
+    QUOTE_CACHE_SIZE: int = int(os.getenv("QUOTE_CACHE_SIZE", "512"))
+
+    # Quote fan-out
+    QUOTE_CONCURRENCY: int = int(os.getenv("QUOTE_CONCURRENCY", "16"))
+    QUOTE_DEADLINE_MS: int = int(os.getenv("QUOTE_DEADLINE_MS", "150"))
+    QUOTE_HEDGE_AFTER_MS: int = int(os.getenv("QUOTE_HEDGE_AFTER_MS", "0"))
+
+    # Quote recording (for solbot.backtest); empty dir disables it
+    QUOTE_RECORD_DIR: str = os.getenv("QUOTE_RECORD_DIR", "")
+    QUOTE_RECORD_FLUSH_MS: int = int(os.getenv("QUOTE_RECORD_FLUSH_MS", "1000"))
+
+    # Local AMM quotes from pool vaults (solbot/amm.py); empty pools file disables it
+    AMM_POOLS_FILE: str = os.getenv("AMM_POOLS_FILE", "")
+    AMM_WS_URL: str = os.getenv("AMM_WS_URL", "")  # default: first RPC_HTTPS as ws(s)://
+    AMM_COMMITMENT: str = os.getenv("AMM_COMMITMENT", "processed")
+
+    # Pipeline (scan -> rank -> execute)
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+    PLAN_BOOK_SIZE: int = int(os.getenv("PLAN_BOOK_SIZE", "64"))
+    PLAN_MAX_AGE_MS: int = int(os.getenv("PLAN_MAX_AGE_MS", "500"))
+    EXEC_WORKERS: int = int(os.getenv("EXEC_WORKERS", "1"))
+
+    # Multi-hop cycle search
+    CYCLE_MAX_HOPS: int = int(os.getenv("CYCLE_MAX_HOPS", "4"))
+    CYCLE_EDGE_MAX_AGE_MS: int = int(os.getenv("CYCLE_EDGE_MAX_AGE_MS", "2000"))
+    CYCLE_REQUOTE_BUDGET: int = int(os.getenv("CYCLE_REQUOTE_BUDGET", "24"))
+    CYCLE_MAX_PLANS: int = int(os.getenv("CYCLE_MAX_PLANS", "4"))
+
+    # Trade sizing: geometric ladder of quote sizes -> fitted price-impact curve
+    SIZE_LADDER_STEPS: int = int(os.getenv("SIZE_LADDER_STEPS", "5"))
+    SIZE_MIN_USD: float = float(os.getenv("SIZE_MIN_USD", "5"))
+    SIZE_CURVE_MAX_AGE_MS: int = int(os.getenv("SIZE_CURVE_MAX_AGE_MS", "10000"))
+    SIZE_CURVE_DRIFT_BPS: float = float(os.getenv("SIZE_CURVE_DRIFT_BPS", "5"))
+
+    # Stable/LST depeg scanner
+    STABLE_REQUOTE_MS: int = int(os.getenv("STABLE_REQUOTE_MS", "1000"))
+    STABLE_PEG_ALPHA: float = float(os.getenv("STABLE_PEG_ALPHA", "0.01"))
+
+    # Token registry (on-disk Jupiter token list)
+    TOKEN_CACHE_DIR: str = os.getenv("TOKEN_CACHE_DIR", "~/.cache/solbot")
+    TOKEN_REFRESH_S: int = int(os.getenv("TOKEN_REFRESH_S", "3600"))
+    # Comma-separated token list URLs, tried in order
+    TOKEN_SOURCES: list[str] = os.getenv(
+        "TOKEN_SOURCES", "https://cache.jup.ag/tokens,https://token.jup.ag/strict"
+    ).split(",")
 
     # Risk & profit
     MIN_PROFIT_USD: float = float(os.getenv("MIN_PROFIT_USD", "0.50"))
     MAX_NOTIONAL_USD: float = float(os.getenv("MAX_NOTIONAL_USD", "50"))
     MAX_DAILY_LOSS_USD: float = float(os.getenv("MAX_DAILY_LOSS_USD", "25"))
+    # Shared, persistent loss window (solbot/risk/ledger.py); empty = in-process DailyLossGuard
+    RISK_LEDGER_FILE: str = os.getenv("RISK_LEDGER_FILE", "")
+    RISK_WINDOW_S: float = float(os.getenv("RISK_WINDOW_S", "86400"))
+    RISK_BUCKET_S: float = float(os.getenv("RISK_BUCKET_S", "300"))
+    RISK_LEDGER_ROWS: int = int(os.getenv("RISK_LEDGER_ROWS", "16"))
+    RISK_LEDGER_MINTS: int = int(os.getenv("RISK_LEDGER_MINTS", "256"))
+    # Cap on submitted-but-unresolved notional per output mint, all processes; 0 = none
+    MAX_MINT_EXPOSURE_USD: float = float(os.getenv("MAX_MINT_EXPOSURE_USD", "0"))
 
     # Slippage
     SLIPPAGE_BPS_PER_LEG: int = int(os.getenv("SLIPPAGE_BPS_PER_LEG", "25"))
@@ -33,6 +103,44 @@ class Settings(BaseModel):
     # Compute budget / Priority fees
     TARGET_CU: int = int(os.getenv("TARGET_CU", "1200000"))
     PRIORITY_FEE_MICRO_LAMPORTS: int = int(os.getenv("PRIORITY_FEE_MICRO_LAMPORTS", "1500"))
+    PRIORITY_FEE_PERCENTILE: float = float(os.getenv("PRIORITY_FEE_PERCENTILE", "75"))
+    PRIORITY_FEE_MAX_MICRO_LAMPORTS: int = int(
+        os.getenv("PRIORITY_FEE_MAX_MICRO_LAMPORTS", "200000")
+    )
+    FEE_POLL_MS: int = int(os.getenv("FEE_POLL_MS", "2000"))
+    FEE_WINDOW_SLOTS: int = int(os.getenv("FEE_WINDOW_SLOTS", "150"))
+    BLOCKHASH_POLL_MS: int = int(os.getenv("BLOCKHASH_POLL_MS", "1000"))
+
+    # Confirmation tracking
+    CONFIRM_POLL_MS: int = int(os.getenv("CONFIRM_POLL_MS", "400"))
+    CONFIRM_TIMEOUT_S: float = float(os.getenv("CONFIRM_TIMEOUT_S", "90"))
+
+    # HTTP transport (shared connection pool)
+    HTTP2: bool = os.getenv("HTTP2", "true").lower() == "true"
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "32"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "16"))
+    HTTP_KEEPALIVE_EXPIRY_S: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_S", "60"))
+    HTTP_CONNECT_TIMEOUT_S: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_S", "3"))
+    HTTP_WARM_CONNECTIONS: int = int(os.getenv("HTTP_WARM_CONNECTIONS", "2"))
+
+    # Signing
+    SIGNER_MODE: str = os.getenv("SIGNER_MODE", "inline")  # inline | thread | process
+    SIGNER_WORKERS: int = int(os.getenv("SIGNER_WORKERS", "1"))
+
+    # HTTP API (healthz, metrics) served alongside the supervisor
+    API_ENABLED: bool = os.getenv("API_ENABLED", "true").lower() == "true"
+    API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT: int = int(os.getenv("API_PORT", "8080"))
+    # /debug/profile and /debug/stages; off by default, and each call must carry
+    # API_DEBUG_TOKEN as a bearer token (no token set = every call refused)
+    API_DEBUG: bool = os.getenv("API_DEBUG", "false").lower() == "true"
+    API_DEBUG_TOKEN: str = os.getenv("API_DEBUG_TOKEN", "")
+
+    # Event-loop monitoring
+    LOOP_LAG_INTERVAL_MS: float = float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))
+    # Callbacks holding the loop at least this long are logged; 0 (default) disables
+    # the timing, which wraps every loop callback
+    LOOP_SLOW_CALLBACK_MS: float = float(os.getenv("LOOP_SLOW_CALLBACK_MS", "0"))
 
     # Modes
     DRY_RUN: bool = os.getenv("DRY_RUN", "true").lower() == "true"
@@ -41,6 +149,18 @@ class Settings(BaseModel):
     # Jito
     JITO_BLOCK_ENGINE_URL: str | None = os.getenv("JITO_BLOCK_ENGINE_URL")
     JITO_AUTH: str | None = os.getenv("JITO_AUTH")
+    # Comma-separated sendBundle URLs; defaults to JITO_BLOCK_ENGINE_URL, else all public regions
+    JITO_REGIONS: list[str] = [
+        u
+        for u in os.getenv("JITO_REGIONS", os.getenv("JITO_BLOCK_ENGINE_URL") or "").split(",")
+        if u
+    ]
+    JITO_FANOUT: int = int(os.getenv("JITO_FANOUT", "3"))
+    JITO_EXPLORE: float = float(os.getenv("JITO_EXPLORE", "0.1"))
+    JITO_TIMEOUT_MS: int = int(os.getenv("JITO_TIMEOUT_MS", "1500"))
+    JITO_TIP_LAMPORTS: int = int(os.getenv("JITO_TIP_LAMPORTS", "10000"))
+    # ultra: Jupiter /execute lands the swap; jito: we bundle it with a tip ourselves
+    EXECUTION_BACKEND: str = os.getenv("EXECUTION_BACKEND", "ultra")
 
 @lru_cache(maxsize=1)
 def get_settings() -> "Settings":
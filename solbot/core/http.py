@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+import httpx
+
+from solbot.core.env import Settings, get_settings
+from solbot.core.logger import logger
+from solbot.core.ratelimit import RateLimiter
+
+
+def origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class HttpPool:
+    """Long-lived httpx clients, one per upstream origin (scheme://host:port).
+
+    Every component shares the same pool so quotes, executes, RPC and bundle
+    submits reuse warm keep-alive / HTTP/2 connections instead of paying a
+    TCP+TLS handshake per call. Per-request timeouts are passed by callers.
+    """
+
+    def __init__(self, settings: Settings | None = None):
+        self.settings = settings or get_settings()
+        self._limits = httpx.Limits(
+            max_connections=self.settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=self.settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=self.settings.HTTP_KEEPALIVE_EXPIRY_S,
+        )
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._limiters: dict[tuple[str, str], RateLimiter] = {}
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        key = origin(url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.settings.HTTP2,
+                limits=self._limits,
+                timeout=httpx.Timeout(10.0, connect=self.settings.HTTP_CONNECT_TIMEOUT_S),
+            )
+            self._clients[key] = client
+        return client
+
+    def limiter(self, url: str, api_key: str = "") -> RateLimiter:
+        """Shared client-side rate limiter for one (origin, API key)."""
+        key = (origin(url), api_key)
+        lim = self._limiters.get(key)
+        if lim is None:
+            s = self.settings
+            name = key[0] + (f" key=...{api_key[-4:]}" if api_key else "")
+            lim = RateLimiter(
+                name, s.RATE_LIMIT_RPS, s.RATE_LIMIT_BURST, s.RATE_LIMIT_MIN_RPS,
+                s.RATE_LIMIT_MAX_RPS, s.RATE_LIMIT_INCREASE, s.RATE_LIMIT_RESERVE,
+            )
+            self._limiters[key] = lim
+        return lim
+
+    def limiter_stats(self) -> dict[str, dict[str, float]]:
+        return {lim.name: lim.stats() for lim in self._limiters.values()}
+
+    async def warm(self, urls: Iterable[str]) -> None:
+        """Pre-open connections to each distinct origin; failures are only logged."""
+        origins = list(dict.fromkeys(origin(u) for u in urls if u))
+        n = max(1, self.settings.HTTP_WARM_CONNECTIONS)
+
+        async def _one(o: str) -> None:
+            client = self.client(o)
+            # With HTTP/2 these share one multiplexed connection; with HTTP/1.1
+            # they open up to `n` keep-alive sockets.
+            await asyncio.gather(
+                *[client.head(o, timeout=self.settings.HTTP_CONNECT_TIMEOUT_S) for _ in range(n)]
+            )
+
+        results = await asyncio.gather(*[_one(o) for o in origins], return_exceptions=True)
+        failed = [o for o, r in zip(origins, results, strict=True) if isinstance(r, Exception)]
+        logger.info("http.warm", extra={"origins": len(origins), "failed": failed})
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*[c.aclose() for c in clients], return_exceptions=True)
+        logger.info("http.closed", extra={"clients": len(clients)})
@@ -1,14 +1,157 @@
-from rich.console import Console
-from rich.logging import RichHandler
+from __future__ import annotations
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
 
-console = Console()
+try:
+    import orjson
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="%H:%M:%S",
-    handlers=[RichHandler(console=console)]
-)
+    def _dumps(obj: dict) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
 
-logger = logging.getLogger("solbot")
+    def _dumps(obj: dict) -> str:
+        return json.dumps(obj, default=str, separators=(",", ":"))
+
+# Attributes every LogRecord has; anything else came from `extra=`.
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line: ts, level, event, plus `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "event": record.getMessage(),
+        }
+        for k, v in record.__dict__.items():
+            if k not in _RESERVED:
+                out[k] = v
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return _dumps(out)
+
+
+class ExtrasFormatter(logging.Formatter):
+    """Rich-mode lines: the event followed by its `extra` fields as key=value."""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        msg = super().formatMessage(record)
+        extras = " ".join(f"{k}={v}" for k, v in record.__dict__.items() if k not in _RESERVED)
+        return f"{msg} {extras}" if extras else msg
+
+
+class Lazy:
+    """An `extra` value computed only if the record is formatted (not filtered or sampled out)."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+    __repr__ = __str__
+
+
+def _parse_map(spec: str) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for item in spec.split(","):
+        if "=" in item:
+            k, v = item.split("=", 1)
+            out[k.strip()] = float(v)
+    return out
+
+
+class SamplingFilter(logging.Filter):
+    """Per-event sampling and rate limiting keyed on the log message.
+
+    LOG_SAMPLE="ultra.order=0.05" keeps ~5% of those records;
+    LOG_RATE_LIMIT="ultra.order=5" caps them at 5 per second. The next record
+    that passes carries a `suppressed` count. Warnings and above always pass.
+    """
+
+    def __init__(self, sample: dict[str, float], rate: dict[str, float]):
+        super().__init__()
+        self.sample = sample
+        self.rate = rate
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        event = record.msg if isinstance(record.msg, str) else str(record.msg)
+        p = self.sample.get(event)
+        if p is not None and random.random() >= p:
+            return self._drop(event)
+        limit = self.rate.get(event)
+        if limit is not None:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(event, (limit, now))
+            tokens = min(limit, tokens + (now - last) * limit)
+            if tokens < 1.0:
+                self._buckets[event] = (tokens, now)
+                return self._drop(event)
+            self._buckets[event] = (tokens - 1.0, now)
+        n = self._suppressed.pop(event, 0)
+        if n:
+            record.suppressed = n
+        return True
+
+    def _drop(self, event: str) -> bool:
+        self._suppressed[event] = self._suppressed.get(event, 0) + 1
+        return False
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    # The stock QueueHandler formats the message on the calling thread; defer
+    # all formatting to the background listener instead.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _configure() -> logging.Logger:
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+    fmt = os.getenv("LOG_FORMAT", "rich").lower()
+
+    if fmt == "json":
+        sink = logging.StreamHandler(sys.stdout)
+        sink.setFormatter(JsonFormatter())
+        q: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(q, sink, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        handler: logging.Handler = _EnqueueHandler(q)
+        logging.basicConfig(level=level, handlers=[handler])
+    else:
+        from rich.console import Console
+        from rich.logging import RichHandler
+
+        handler = RichHandler(console=Console())
+        handler.setFormatter(ExtrasFormatter("%(message)s", datefmt="%H:%M:%S"))
+        logging.basicConfig(level=level, handlers=[handler])
+
+    # httpx logs every request at INFO; far too chatty for the scan loop.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    log = logging.getLogger("solbot")
+    sample = _parse_map(os.getenv("LOG_SAMPLE", ""))
+    rate = _parse_map(os.getenv("LOG_RATE_LIMIT", ""))
+    if sample or rate:
+        log.addFilter(SamplingFilter(sample, rate))
+    return log
+
+
+logger = _configure()
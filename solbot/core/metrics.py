@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import Generic, TypeVar
+
+# Latency buckets in seconds, tuned for sub-second upstream calls.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+def _fmt_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+_Child = TypeVar("_Child", bound="_CounterChild | _GaugeChild | _HistogramChild")
+
+
+class Metric(Generic[_Child]):
+    """A named metric family. Children are created once per label tuple, so an
+    observation on the hot path is a dict lookup plus a couple of adds."""
+
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labels)
+        self.buckets = buckets
+        self._children: dict[tuple[str, ...], _Child] = {}
+        self._default: _Child | None = None if self.labelnames else self._child(())
+
+    def _new_child(self) -> _Child:
+        raise NotImplementedError
+
+    def _child(self, key: tuple[str, ...]) -> _Child:
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def labels(self, *values: str) -> _Child:
+        return self._child(tuple(str(v) for v in values))
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in list(self._children.items()):
+            if isinstance(child, _HistogramChild):
+                acc = 0
+                for le, n in zip(child.buckets, child.counts[:-1], strict=True):
+                    acc += n
+                    lbl = _fmt_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{lbl} {acc}")
+                lbl = _fmt_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{lbl} {child.count}")
+                lbl = _fmt_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{lbl} {child.sum}")
+                lines.append(f"{self.name}_count{lbl} {child.count}")
+            else:
+                lines.append(f"{self.name}{_fmt_labels(self.labelnames, key)} {child.value}")
+        return lines
+
+
+class Counter(Metric[_CounterChild]):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)  # type: ignore[union-attr]
+
+
+class Gauge(Metric[_GaugeChild]):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)  # type: ignore[union-attr]
+
+
+class Histogram(Metric[_HistogramChild]):
+    kind = "histogram"
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)  # type: ignore[union-attr]
+
+
+_M = TypeVar("_M", bound=Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._callbacks: dict[str, tuple[str, Callable[[], Iterable[tuple[dict, float]]]]] = {}
+
+    def _add(self, metric: _M) -> _M:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing  # type: ignore[return-value]
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, doc: str, labels: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, doc, labels))
+
+    def gauge(self, name: str, doc: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, doc, labels))
+
+    def histogram(self, name: str, doc: str, labels: Iterable[str] = (),
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, doc, labels, buckets))
+
+    def gauge_fn(
+        self, name: str, doc: str, fn: Callable[[], Iterable[tuple[dict, float]] | float]
+    ) -> None:
+        """Gauge computed at scrape time. `fn` returns a number or (labels, value) pairs."""
+        def samples() -> Iterable[tuple[dict, float]]:
+            v = fn()
+            return [({}, float(v))] if isinstance(v, (int, float)) else v
+
+        self._callbacks[name] = (doc, samples)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for name, (doc, samples) in list(self._callbacks.items()):
+            lines += [f"# HELP {name} {doc}", f"# TYPE {name} gauge"]
+            for labels, value in samples():
+                names, values = tuple(labels), tuple(str(v) for v in labels.values())
+                lines.append(f"{name}{_fmt_labels(names, values)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
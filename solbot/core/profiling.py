@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+
+LOOP_LAG = REGISTRY.histogram(
+    "solbot_loop_lag_seconds", "Event loop scheduling delay of the lag sampler",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+SLOW_CALLBACKS = REGISTRY.counter(
+    "solbot_loop_slow_callbacks_total", "Event loop callbacks that ran past LOOP_SLOW_CALLBACK_MS"
+)
+
+_handle_run = asyncio.events.Handle._run
+
+
+def _describe(handle: asyncio.Handle) -> str:
+    """Task name and coroutine position for task steps, else the callback repr."""
+    cb = getattr(handle, "_callback", None)
+    task = getattr(cb, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        frame = getattr(coro, "cr_frame", None)
+        where = ""
+        if frame is not None:
+            where = f" at {os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+        return f"{task.get_name()} {getattr(coro, '__qualname__', coro)}{where}"
+    return repr(cb)[:200]
+
+
+class LoopMonitor:
+    """Continuous event-loop health: scheduling lag and slow callbacks.
+
+    A sampler task sleeps LOOP_LAG_INTERVAL_MS at a time and records how late
+    it wakes up; that delay is what every other coroutine is waiting on too.
+    With LOOP_SLOW_CALLBACK_MS > 0 (opt-in), every loop callback is timed (two clock
+    reads per callback, no asyncio debug mode needed) and one that holds the
+    loop longer is counted and logged with the task and line it yielded at,
+    at most once per callback site every 10 s.
+    """
+
+    def __init__(self, interval_ms: float, slow_ms: float, window: int = 600):
+        self.interval = interval_ms / 1000
+        self.slow = slow_ms / 1000
+        self.lags: collections.deque[float] = collections.deque(maxlen=window)
+        self.max_lag = 0.0
+        self.slow_count = 0
+        self.slowest: collections.deque[dict[str, Any]] = collections.deque(maxlen=20)
+        self.thread_id: int | None = None
+        self._logged: dict[str, float] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self.thread_id = threading.get_ident()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sample())
+        if self.slow > 0:
+            self._install()
+
+    async def stop(self) -> None:
+        asyncio.events.Handle._run = _handle_run  # type: ignore[method-assign]
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _install(self) -> None:
+        monitor, clock = self, time.perf_counter
+
+        def _run(handle: asyncio.Handle) -> None:
+            t0 = clock()
+            _handle_run(handle)
+            dt = clock() - t0
+            if dt >= monitor.slow:
+                monitor._flag(handle, dt)
+
+        asyncio.events.Handle._run = _run  # type: ignore[method-assign]
+
+    def _flag(self, handle: asyncio.Handle, dt: float) -> None:
+        where = _describe(handle)
+        self.slow_count += 1
+        SLOW_CALLBACKS.inc()
+        self.slowest.append({"callback": where, "ms": round(dt * 1000, 1), "at": time.time()})
+        now = time.monotonic()
+        if now - self._logged.get(where, -1e9) >= 10.0:
+            self._logged[where] = now
+            logger.warning(
+                "loop.slow_callback", extra={"callback": where, "ms": round(dt * 1000, 1)}
+            )
+
+    async def _sample(self) -> None:
+        clock = time.perf_counter
+        while True:
+            t0 = clock()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, clock() - t0 - self.interval)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+
+    def summary(self) -> dict[str, float]:
+        """Lag percentiles (ms) over the recent window; compact for the tick log."""
+        if not self.lags:
+            return {}
+        xs = sorted(self.lags)
+        pick = lambda q: round(xs[min(len(xs) - 1, int(q * len(xs)))] * 1000, 2)  # noqa: E731
+        return {"p50_ms": pick(0.5), "p99_ms": pick(0.99), "max_ms": round(xs[-1] * 1000, 2)}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.summary(),
+            "max_ms_since_start": round(self.max_lag * 1000, 2),
+            "slow_callbacks": self.slow_count,
+            "recent_slow": list(self.slowest),
+        }
+
+
+class StageTimes:
+    """Wall time per (stage, coroutine) for the pipeline's propose/rank/execute/sleep."""
+
+    def __init__(self) -> None:
+        # (stage, name) -> [count, total_s, max_s]
+        self._acc: dict[tuple[str, str], list[float]] = {}
+        self.since = time.time()
+
+    def record(self, stage: str, name: str, seconds: float) -> None:
+        acc = self._acc.get((stage, name))
+        if acc is None:
+            self._acc[(stage, name)] = [1, seconds, seconds]
+            return
+        acc[0] += 1
+        acc[1] += seconds
+        if seconds > acc[2]:
+            acc[2] = seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = max(time.time() - self.since, 1e-9)
+        out: dict[str, dict[str, Any]] = {}
+        for (stage, name), (n, total, worst) in sorted(self._acc.items()):
+            out.setdefault(stage, {})[name] = {
+                "count": int(n),
+                "total_s": round(total, 3),
+                "mean_ms": round(total / n * 1000, 3),
+                "max_ms": round(worst * 1000, 3),
+                "share": round(total / elapsed, 4),
+            }
+        return {"since": self.since, "elapsed_s": round(elapsed, 3), "stages": out}
+
+    def reset(self) -> None:
+        self._acc.clear()
+        self.since = time.time()
+
+
+STAGES = StageTimes()
+MONITOR: LoopMonitor | None = None  # set by the supervisor while it runs
+
+_profile_lock = threading.Lock()
+
+
+def sample_stacks(
+    thread_id: int, seconds: float, interval_s: float = 0.005
+) -> tuple[collections.Counter[str], int]:
+    """Sample one thread's Python stack for `seconds`; returns (folded stacks, samples).
+
+    Runs in its own thread. Keys are root-first `func (file:line)` frames
+    joined with ';', the format flamegraph tools read.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise RuntimeError("a profile is already running")
+    try:
+        counts: collections.Counter[str] = collections.Counter()
+        samples = 0
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                where = f"{os.path.basename(code.co_filename)}:{frame.f_lineno}"
+                stack.append(f"{code.co_name} ({where})")
+                frame = frame.f_back
+            if stack:
+                counts[";".join(reversed(stack))] += 1
+                samples += 1
+            time.sleep(interval_s)
+        return counts, samples
+    finally:
+        _profile_lock.release()
+
+
+def top_functions(
+    counts: collections.Counter[str], samples: int, limit: int = 30
+) -> list[dict[str, Any]]:
+    """Self and cumulative sample shares per frame, highest self time first."""
+    own: collections.Counter[str] = collections.Counter()
+    cum: collections.Counter[str] = collections.Counter()
+    for stack, n in counts.items():
+        frames = stack.split(";")
+        own[frames[-1]] += n
+        for f in set(frames):
+            cum[f] += n
+    total = max(samples, 1)
+    return [
+        {"frame": f, "self": round(n / total, 4), "cumulative": round(cum[f] / total, 4)}
+        for f, n in own.most_common(limit)
+    ]
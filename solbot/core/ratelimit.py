@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+
+from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+
+# Priority lanes, highest first.
+LANE_EXECUTE = 0
+LANE_QUOTE = 1
+LANE_DISCOVERY = 2
+LANES = ("execute", "quote", "discovery")
+
+RATE_WAIT = REGISTRY.histogram(
+    "solbot_ratelimit_wait_seconds", "Time spent waiting for a rate-limit token", ["lane"]
+)
+RATE_THROTTLED = REGISTRY.counter(
+    "solbot_ratelimit_throttled_total", "429 responses seen by the client-side limiter", ["key"]
+)
+
+
+class RateLimiter:
+    """Token bucket with strict priority lanes and AIMD rate adaptation.
+
+    `acquire(lane)` takes one token; waiters are served execute → quote →
+    discovery, and lower lanes leave `reserve` tokens in the bucket so an
+    execution never queues behind a quote burst. `observe(status, headers)`
+    adapts the rate: +`increase` req/s per success, halved on 429, and a
+    Retry-After or exhausted x-ratelimit-remaining pauses the bucket.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        reserve: float = 1.0,
+    ):
+        if burst < 1.0 + reserve:
+            # Quotes wait for 1 + reserve tokens, which a smaller bucket never holds.
+            raise ValueError(
+                f"rate limiter {name}: burst {burst} is below 1 + reserve ({1.0 + reserve})"
+            )
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.reserve = reserve
+        self.tokens = self.burst
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: tuple[deque[asyncio.Future[None]], ...] = tuple(deque() for _ in LANES)
+        self._timer: asyncio.TimerHandle | None = None
+        self.throttled = 0
+
+    def _refill(self, now: float) -> None:
+        if now < self._paused_until:
+            self._last = now
+            return
+        start = max(self._last, self._paused_until)
+        self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+        self._last = now
+
+    def _floor(self, lane: int) -> float:
+        return 1.0 if lane == LANE_EXECUTE else 1.0 + self.reserve
+
+    def _queued_ahead(self, lane: int) -> bool:
+        return any(self._waiters[i] for i in range(lane + 1))
+
+    async def acquire(self, lane: int = LANE_QUOTE) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        if not self._queued_ahead(lane) and self.tokens >= self._floor(lane):
+            self.tokens -= 1.0
+            return
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(fut)
+        self._schedule()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.tokens += 1.0  # granted just as we were cancelled; give it back
+                self._schedule()
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters[lane].remove(fut)
+            raise
+        RATE_WAIT.labels(LANES[lane]).observe(time.monotonic() - now)
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            return
+        if not any(self._waiters):
+            return
+        now = time.monotonic()
+        lane = next(i for i, q in enumerate(self._waiters) if q)
+        need = self._floor(lane) - self.tokens
+        delay = max(0.0, self._paused_until - now) + max(0.0, need / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
+
+    def _drain(self) -> None:
+        self._timer = None
+        self._refill(time.monotonic())
+        for lane, queue in enumerate(self._waiters):
+            while queue and self.tokens >= self._floor(lane):
+                fut = queue.popleft()
+                if fut.done():
+                    continue
+                self.tokens -= 1.0
+                fut.set_result(None)
+            if queue:
+                break  # strict priority: lower lanes wait for this one
+        self._schedule()
+
+    def observe(self, status: int, headers: Mapping[str, str] | None = None) -> None:
+        """Feed back one response from the limited upstream."""
+        now = time.monotonic()
+        headers = headers or {}
+        if status == 429:
+            self.throttled += 1
+            RATE_THROTTLED.labels(self.name).inc()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            pause = _retry_after(headers.get("retry-after"))
+            if pause:
+                self._paused_until = max(self._paused_until, now + pause)
+            logger.warning("ratelimit.throttled", extra={
+                "key": self.name, "rate": round(self.rate, 2), "pause_s": pause
+            })
+        elif status < 400:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is not None:
+            try:
+                left = float(remaining)
+            except ValueError:
+                left = None
+            if left is not None:
+                self.tokens = min(self.tokens, left)
+                reset = _retry_after(headers.get("x-ratelimit-reset"))
+                if left <= 0 and reset:
+                    self._paused_until = max(self._paused_until, now + reset)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "rate": round(self.rate, 2),
+            "tokens": round(self.tokens, 2),
+            "waiting": sum(len(q) for q in self._waiters),
+            "throttled": self.throttled,
+        }
+
+
+def _retry_after(value: str | None) -> float:
+    """Seconds from a Retry-After style header (delta seconds, epoch or HTTP date)."""
+    if not value:
+        return 0.0
+    try:
+        secs = float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    # Some APIs send the reset as an epoch timestamp rather than a delta.
+    return max(0.0, secs - time.time()) if secs > 1e9 else secs
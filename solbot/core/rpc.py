@@ -1,46 +1,167 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 import asyncio
-import random
+import itertools
 import time
-from typing import Iterable
+from typing import Any
 import httpx
+from solbot.core.http import HttpPool
 from solbot.core.logger import logger
 from solbot.core.env import Settings
+from solbot.core.metrics import REGISTRY
+
+RPC_LATENCY = REGISTRY.histogram(
+    "solbot_rpc_latency_seconds", "JSON-RPC round trip by endpoint", ["endpoint"]
+)
+
+
+class RpcError(Exception):
+    """Raised when no endpoint returned a usable JSON-RPC result."""
+
 
 @dataclass
 class Endpoint:
     url: str
-    latency_ms: float = 9999.0
+    latency_ms: float = 9999.0  # EWMA of observed round trips
     healthy: bool = True
+    p99_ms: float = 9999.0
+    error_rate: float = 0.0  # EWMA of failures (0..1)
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=128))
+
+    def observe(self, ms: float, ok: bool, alpha: float) -> None:
+        RPC_LATENCY.labels(self.url).observe(ms / 1000)
+        self.samples.append(ms)
+        if self.latency_ms >= 9999.0:
+            self.latency_ms = ms
+        else:
+            self.latency_ms += alpha * (ms - self.latency_ms)
+        self.error_rate += alpha * ((0.0 if ok else 1.0) - self.error_rate)
+
+    @property
+    def score(self) -> float:
+        # Lower is better: typical latency plus a share of the tail, inflated by failures.
+        return (self.latency_ms + 0.25 * self.p99_ms) * (1.0 + 10.0 * self.error_rate)
+
 
 class RpcPool:
-    def __init__(self, settings: Settings):
+    """Latency-ranked RPC endpoints, probed in the background.
+
+    Callers never probe inline: `best()`/`ranked()` read the current order and
+    `call()` hedges one JSON-RPC request across the top RPC_HEDGE_K endpoints,
+    returning the first good result and cancelling the rest.
+    """
+
+    def __init__(self, settings: Settings, http: HttpPool | None = None):
+        self.settings = settings
         self._eps = [Endpoint(u) for u in settings.RPC_HTTPS]
-        self._lock = asyncio.Lock()
+        self.http = http or HttpPool(settings)
+        self._alpha = settings.RPC_EWMA_ALPHA
+        self._ids = itertools.count(1)
+        self._task: asyncio.Task[None] | None = None
+        REGISTRY.gauge_fn("solbot_rpc_ewma_ms", "EWMA latency per RPC endpoint", lambda: [
+            ({"endpoint": e.url}, e.latency_ms) for e in self._eps
+        ])
+        REGISTRY.gauge_fn("solbot_rpc_error_rate", "EWMA error rate per RPC endpoint", lambda: [
+            ({"endpoint": e.url}, e.error_rate) for e in self._eps
+        ])
+
+    @property
+    def endpoints(self) -> list[Endpoint]:
+        return list(self._eps)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._probe_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _probe_loop(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("rpc probe failed", extra={"err": str(e)})
+            await asyncio.sleep(self.settings.RPC_PROBE_INTERVAL_MS / 1000)
 
     async def probe(self) -> None:
-        async with httpx.AsyncClient(timeout=2) as client:
-            tasks = []
-            for ep in self._eps:
-                tasks.append(self._probe_one(client, ep))
-            await asyncio.gather(*tasks, return_exceptions=True)
-        self._eps.sort(key=lambda e: (not e.healthy, e.latency_ms))
-        logger.info("rpc probe", extra={"ordered": [e.url for e in self._eps]})
+        tasks = []
+        for ep in self._eps:
+            tasks.append(self._probe_one(self.http.client(ep.url), ep))
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._rerank()
+        logger.debug("rpc probe", extra={"ordered": [e.url for e in self._eps]})
 
     async def _probe_one(self, client: httpx.AsyncClient, ep: Endpoint) -> None:
         t0 = time.perf_counter()
         try:
-            r = await client.post(ep.url, json={"jsonrpc":"2.0","id":1,"method":"getHealth"})
+            r = await client.post(
+                ep.url, json={"jsonrpc":"2.0","id":1,"method":"getHealth"}, timeout=2
+            )
             ep.healthy = r.status_code == 200 and (r.json().get("result") in ("ok", None))
         except Exception:  # noqa: BLE001
             ep.healthy = False
-        ep.latency_ms = (time.perf_counter() - t0) * 1000
+        ep.observe((time.perf_counter() - t0) * 1000, ep.healthy, self._alpha)
 
-    async def best(self) -> str:
-        if random.random() < 0.1:
-            await self.probe()
+    def _rerank(self) -> None:
         for ep in self._eps:
-            if ep.healthy:
-                return ep.url
-        return self._eps[0].url
+            if ep.samples:
+                ordered = sorted(ep.samples)
+                ep.p99_ms = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        self._eps.sort(key=lambda e: (not e.healthy, e.score))
+
+    def ranked(self, k: int | None = None) -> list[str]:
+        healthy = [ep.url for ep in self._eps if ep.healthy] or [self._eps[0].url]
+        return healthy if k is None else healthy[:k]
+
+    async def best(self) -> str:
+        return self.ranked(1)[0]
+
+    async def call(
+        self,
+        method: str,
+        params: list[Any] | None = None,
+        hedge: int | None = None,
+        timeout: float = 2.0,
+    ) -> Any:
+        """Send one JSON-RPC call to the top-K endpoints; first good result wins."""
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            payload["params"] = params
+        urls = self.ranked(hedge or self.settings.RPC_HEDGE_K)
+        tasks = {asyncio.ensure_future(self._post(u, payload, timeout)): u for u in urls}
+        pending = set(tasks)
+        errors: list[str] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    exc = t.exception()
+                    if exc is None:
+                        return t.result()
+                    errors.append(f"{tasks[t]}: {exc}")
+        finally:
+            for t in pending:
+                t.cancel()
+        raise RpcError(f"{method} failed on all endpoints: {errors}")
+
+    async def _post(self, url: str, payload: dict[str, Any], timeout: float) -> Any:
+        ep = next(e for e in self._eps if e.url == url)
+        t0 = time.perf_counter()
+        try:
+            r = await self.http.client(url).post(url, json=payload, timeout=timeout)
+            r.raise_for_status()
+            body = r.json()
+            if body.get("error"):
+                raise RpcError(str(body["error"]))
+        except asyncio.CancelledError:
+            raise  # lost a hedge race; not a failure
+        except Exception:
+            ep.observe((time.perf_counter() - t0) * 1000, False, self._alpha)
+            raise
+        ep.observe((time.perf_counter() - t0) * 1000, True, self._alpha)
+        return body.get("result")
@@ -1,24 +1,30 @@
 from __future__ import annotations
 import os
-import httpx
+from collections.abc import Callable
+from solbot.core.http import HttpPool
 from solbot.core.logger import logger
+from solbot.mints import MINTS, PairIndex
+from solbot.token_registry import TokenRegistry
 
 OFFLINE_PAIRS = [
     {"base": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", "quote": "So11111111111111111111111111111111111111112"}, # USDC/SOL
     {"base": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB", "quote": "So11111111111111111111111111111111111111112"}, # USDT/SOL
 ]
 
-# Modern token list endpoints (Jupiter ecosystem tokens)
-TOKEN_SOURCES = [
-    "https://cache.jup.ag/tokens",  # Jupiter's token cache (primary)
-    "https://token.jup.ag/strict", # Strict list (backup)
-]
+MAJORS = {"USDC", "USDT", "SOL", "mSOL", "JITOSOL", "wBTC", "ETH"}
 
 class DiscoveryService:
-    def __init__(self, settings, rpc_pool):
+    def __init__(self, settings, rpc_pool, http: HttpPool | None = None):
         self.settings = settings
         self.rpc_pool = rpc_pool
+        self.http = http or HttpPool(settings)
+        self.registry = TokenRegistry(settings, settings.TOKEN_SOURCES, self.http)
+        self.registry.listeners.append(self._rebuild)
         self.watchlist: list[dict] = []
+        # Watchlist pairs as interned mint IDs, with last rate per direction.
+        self.pairs = PairIndex()
+        # Called after the watchlist changes (e.g. to trigger an early scan).
+        self.listeners: list[Callable[[], None]] = []
 
     @property
     def watch_count(self) -> int:
@@ -26,31 +32,62 @@ class DiscoveryService:
 
     async def refresh(self) -> None:
         if os.getenv("OFFLINE_DISCOVERY", "false").lower() == "true":
-            self.watchlist = OFFLINE_PAIRS
+            self.set_watchlist(OFFLINE_PAIRS)
             logger.info("discovery.offline", extra={"pairs": len(self.watchlist)})
             return
-        
-        tokens = []
-        for url in TOKEN_SOURCES:
-            try:
-                async with httpx.AsyncClient(timeout=10) as client:
-                    r = await client.get(url)
-                    r.raise_for_status()
-                    tokens = r.json()
-                    logger.info("discovery.online", extra={"source": url, "tokens": len(tokens)})
-                    break
-            except Exception as e:
-                logger.warning("token source failed", extra={"url": url, "err": str(e)})
-                continue
-        
-        if not tokens:
+
+        if self.registry.load():
+            # Warm start from disk; revalidate in the background.
+            self._rebuild()
+            self.registry.start()
+            return
+
+        await self.registry.refresh()
+        self.registry.start()
+        if not len(self.registry):
             logger.warning("all token sources failed, using offline pairs")
-            self.watchlist = OFFLINE_PAIRS
+            self.set_watchlist(OFFLINE_PAIRS)
             return
-            
-        majors = {"USDC", "USDT", "SOL", "mSOL", "JITOSOL", "wBTC", "ETH"}
-        by_symbol = [t for t in tokens if t.get("symbol") in majors]
-        mints = [t["address"] for t in by_symbol]
-        self.watchlist = [
+        self._rebuild()
+
+    async def stop(self) -> None:
+        await self.registry.stop()
+
+    def _rebuild(self) -> None:
+        by_symbol = self.registry.by_symbols(MAJORS)
+        mints = [addr for addr, _, _ in by_symbol]
+        for addr, sym, dec in by_symbol:
+            MINTS.intern(addr, dec, sym)
+        watchlist = [
             {"base": b, "quote": q} for i, b in enumerate(mints) for q in mints[i+1:]
         ][:120]
+        if watchlist == self.watchlist:
+            return
+        logger.info("discovery.online", extra={
+            "source": self.registry.meta.get("source"), "pairs": len(watchlist)
+        })
+        self.set_watchlist(watchlist)
+
+    def set_watchlist(self, watchlist: list[dict]) -> None:
+        """Replace the watchlist and notify listeners if it changed.
+
+        Scan shards call this with the coordinator's watchlist instead of
+        running their own token registry.
+        """
+        if watchlist == self.watchlist:
+            return
+        self.watchlist = watchlist
+        self._sync_pairs()
+        for cb in self.listeners:
+            cb()
+
+    def _sync_pairs(self) -> None:
+        self.pairs.sync([
+            (MINTS.intern(p["base"]), MINTS.intern(p["quote"])) for p in self.watchlist
+        ])
+
+    def observe(self, input_mint: str, output_mint: str, amount: int, quote) -> None:
+        """Quoter listener: keep the pair index's last rate and quote time current."""
+        i, j = MINTS.id(input_mint), MINTS.id(output_mint)
+        if i is not None and j is not None:
+            self.pairs.observe(i, j, quote.in_amount, quote.out_amount)
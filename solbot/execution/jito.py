@@ -1,24 +1,190 @@
 from __future__ import annotations
-import base64
-import httpx
+import asyncio
+import itertools
+import random
+import time
+from dataclasses import dataclass
 from typing import Any
+from solbot.core.http import HttpPool
+from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+
+JITO_ACCEPT_LATENCY = REGISTRY.histogram(
+    "solbot_jito_accept_latency_seconds", "sendBundle round trip by region", ["region"]
+)
+JITO_OUTCOME = REGISTRY.counter(
+    "solbot_jito_submit_total", "Bundle submissions by region and outcome", ["region", "outcome"]
+)
+
+DEFAULT_REGIONS = [
+    "https://mainnet.block-engine.jito.wtf/api/v1/bundles",
+    "https://amsterdam.mainnet.block-engine.jito.wtf/api/v1/bundles",
+    "https://frankfurt.mainnet.block-engine.jito.wtf/api/v1/bundles",
+    "https://ny.mainnet.block-engine.jito.wtf/api/v1/bundles",
+    "https://tokyo.mainnet.block-engine.jito.wtf/api/v1/bundles",
+    "https://slc.mainnet.block-engine.jito.wtf/api/v1/bundles",
+]
+
+# Jito tip payment accounts; tipping a random one spreads write-lock contention.
+TIP_ACCOUNTS = [
+    "96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5",
+    "HFqU5x63VTqvQss8hp11i4wVV8bD44PvwucfZ2bU7gRe",
+    "Cw8CFyM9FkoMi7K7Crf6HNQqf4uEMzpKw6QNghXLvLkY",
+    "ADaUMid9yfUytqMBgopwjb2DTLSokTSzL1zt6iGPaS49",
+    "DfXygSm4jCyNCybVYYK6DwvWqjKee8pbDmJGcLWNDXjh",
+    "ADuUkR4vqLUMWXxW9gh6D6L8pMSawimctcNZ5pGwDcEt",
+    "DttWaMuVvTiduZRnguLF7jNxTgiMBZ1hyAumKUiL2KRL",
+    "3AVi9Tg9Uo68tJfuvoKvqKNWKkC5wPdSSdeBnizKZ6jT",
+]
+
+
+# Block engines reject bundles of more transactions than this.
+MAX_BUNDLE_TXS = 5
+
+
+class BundleRejected(Exception):
+    """Raised when no region accepted the bundle."""
+
 
 class JitoBundles:
-    def __init__(self, block_engine_url: str, auth: str | None = None):
+    def __init__(
+        self, block_engine_url: str, auth: str | None = None, http: HttpPool | None = None
+    ):
         self.url = block_engine_url.rstrip("/")
         self.auth = auth
+        self.http = http or HttpPool()
 
-    async def send_bundle(self, transactions: list[str]) -> dict[str, Any]:
+    async def send_bundle(
+        self, transactions: list[str], encoding: str | None = None, timeout: float = 10
+    ) -> dict[str, Any]:
         headers = {"Content-Type": "application/json"}
         if self.auth:
             headers["Authorization"] = f"Bearer {self.auth}"
+        params: list[Any] = [transactions]
+        if encoding:
+            params.append({"encoding": encoding})
         payload = {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "sendBundle",
-            "params": [transactions],
+            "params": params,
+        }
+        r = await self.http.client(self.url).post(
+            self.url, json=payload, headers=headers, timeout=timeout
+        )
+        r.raise_for_status()
+        return r.json()
+
+
+@dataclass
+class Region:
+    bundles: JitoBundles
+    latency_ms: float = 0.0  # EWMA round trip; 0 = no sample yet
+    error_rate: float = 0.0
+    accepted: int = 0
+    rejected: int = 0
+
+    @property
+    def url(self) -> str:
+        return self.bundles.url
+
+    @property
+    def score(self) -> float:
+        # Unsampled regions rank first so every region gets measured once.
+        return self.latency_ms * (1.0 + 10.0 * self.error_rate)
+
+
+class JitoRegions:
+    """Submits each bundle to several block-engine regions in parallel.
+
+    Regions are ranked by EWMA acceptance latency (inflated by rejections);
+    each bundle goes to the JITO_FANOUT best, and with probability
+    JITO_EXPLORE one slot goes to a random other region so rankings stay
+    current. The first region to accept wins; the others are left to finish
+    in the background rather than cancelled, which would drop their pooled
+    connections and hide their real latency from the ranking.
+    """
+
+    def __init__(self, settings, http: HttpPool | None = None, alpha: float = 0.2):
+        urls = settings.JITO_REGIONS or DEFAULT_REGIONS
+        self.http = http or HttpPool(settings)
+        self.regions = [Region(JitoBundles(u, settings.JITO_AUTH, self.http)) for u in urls]
+        self.fanout = max(1, settings.JITO_FANOUT)
+        self.explore = settings.JITO_EXPLORE
+        self.timeout = settings.JITO_TIMEOUT_MS / 1000
+        self.alpha = alpha
+        self._stragglers: set[asyncio.Task[str]] = set()
+        self._tips = itertools.cycle(random.sample(TIP_ACCOUNTS, len(TIP_ACCOUNTS)))
+        REGISTRY.gauge_fn("solbot_jito_region_ewma_ms", "EWMA accept latency per region", lambda: [
+            ({"region": r.url}, r.latency_ms) for r in self.regions
+        ])
+
+    def tip_account(self) -> str:
+        return next(self._tips)
+
+    def pick(self) -> list[Region]:
+        ranked = sorted(self.regions, key=lambda r: r.score)
+        chosen = ranked[: self.fanout]
+        rest = ranked[self.fanout :]
+        if rest and random.random() < self.explore:
+            chosen[-1] = random.choice(rest)
+        return chosen
+
+    async def submit(self, transactions: list[str]) -> tuple[str, str]:
+        """Send base64 transactions as one bundle; returns (region url, bundle id)."""
+        regions = self.pick()
+        tasks = {
+            asyncio.ensure_future(self._send(r, transactions)): r for r in regions
         }
-        async with httpx.AsyncClient(timeout=10, headers=headers) as client:
-            r = await client.post(self.url, json=payload)
-            r.raise_for_status()
-            return r.json()
+        pending = set(tasks)
+        errors: list[str] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    exc = t.exception()
+                    if exc is None:
+                        return tasks[t].url, t.result()
+                    errors.append(f"{tasks[t].url}: {exc}")
+        finally:
+            for t in pending:
+                self._stragglers.add(t)
+                t.add_done_callback(self._settle)
+        raise BundleRejected(f"no region accepted the bundle: {errors}")
+
+    async def _send(self, region: Region, transactions: list[str]) -> str:
+        t0 = time.perf_counter()
+        try:
+            body = await region.bundles.send_bundle(transactions, "base64", self.timeout)
+            if body.get("error") or not body.get("result"):
+                raise BundleRejected(str(body.get("error") or "empty result"))
+        except Exception:
+            region.rejected += 1
+            region.error_rate += self.alpha * (1.0 - region.error_rate)
+            self._record_latency(region, self.timeout * 1000)  # a rejection is as bad as a timeout
+            JITO_OUTCOME.labels(region.url, "rejected").inc()
+            raise
+        ms = (time.perf_counter() - t0) * 1000
+        region.accepted += 1
+        region.error_rate -= self.alpha * region.error_rate
+        self._record_latency(region, ms)
+        JITO_ACCEPT_LATENCY.labels(region.url).observe(ms / 1000)
+        JITO_OUTCOME.labels(region.url, "accepted").inc()
+        logger.debug("jito.accepted", extra={"region": region.url, "ms": round(ms, 1)})
+        return body["result"]
+
+    def _settle(self, task: asyncio.Task[str]) -> None:
+        self._stragglers.discard(task)
+        if not task.cancelled():
+            task.exception()  # already counted in _send; mark it retrieved
+
+    async def aclose(self) -> None:
+        for t in list(self._stragglers):
+            t.cancel()
+        await asyncio.gather(*self._stragglers, return_exceptions=True)
+
+    def _record_latency(self, region: Region, ms: float) -> None:
+        if not region.latency_ms:
+            region.latency_ms = ms
+        else:
+            region.latency_ms += self.alpha * (ms - region.latency_ms)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+# solders is imported on first use: dry-run and paper-trade processes never sign.
+if TYPE_CHECKING:
+    from solders.keypair import Keypair
+
+
+def load_keypair(secret: str) -> Keypair:
+    """Parse USER_KEYPAIR as either a JSON byte array or a base58 string."""
+    if not secret:
+        raise ValueError("USER_KEYPAIR missing in env")
+    from solders.keypair import Keypair
+
+    if secret.lstrip().startswith("["):
+        return Keypair.from_bytes(bytes(json.loads(secret)))
+    return Keypair.from_base58_string(secret.strip())
+
+
+def _shortvec(buf: bytes | bytearray | memoryview, off: int) -> tuple[int, int]:
+    """Decode a Solana compact-u16 at `off`; returns (value, next offset)."""
+    value = shift = 0
+    while True:
+        b = buf[off]
+        off += 1
+        value |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return value, off
+        shift += 7
+
+
+def sign_wire(kp: Keypair, pubkey: bytes, tx_b64: str) -> str:
+    """Sign a serialized (legacy or v0) transaction in place and re-encode it.
+
+    Instead of deserializing into a VersionedTransaction and serializing it
+    again, this locates our signature slot and the message bytes directly in
+    the decoded buffer, signs the message and patches the slot.
+    """
+    raw = bytearray(base64.b64decode(tx_b64))
+    num_sigs, msg_off = _shortvec(raw, 0)
+    sigs_off = msg_off
+    msg_off += 64 * num_sigs
+
+    off = msg_off + 1 if raw[msg_off] & 0x80 else msg_off  # skip v0 version prefix
+    num_required = raw[off]
+    num_keys, off = _shortvec(raw, off + 3)
+    slot = -1
+    for i in range(min(num_required, num_keys)):
+        if raw[off + 32 * i : off + 32 * (i + 1)] == pubkey:
+            slot = i
+            break
+    if slot < 0 or slot >= num_sigs:
+        raise ValueError("keypair is not a required signer of this transaction")
+
+    sig = kp.sign_message(bytes(memoryview(raw)[msg_off:]))
+    raw[sigs_off + 64 * slot : sigs_off + 64 * (slot + 1)] = bytes(sig)
+    return base64.b64encode(raw).decode()
+
+
+def first_signature(tx_b64: str) -> str:
+    """Base58 fee-payer signature (the transaction id) of a signed wire transaction."""
+    from solders.signature import Signature
+
+    raw = base64.b64decode(tx_b64)
+    _, off = _shortvec(raw, 0)
+    return str(Signature.from_bytes(raw[off : off + 64]))
+
+
+# Per-process state for SIGNER_MODE=process workers.
+_worker_kp: Keypair | None = None
+_worker_pub = b""
+
+
+def _worker_init(secret: str) -> None:
+    global _worker_kp, _worker_pub
+    _worker_kp = load_keypair(secret)
+    _worker_pub = bytes(_worker_kp.pubkey())
+
+
+def _worker_sign(tx_b64: str) -> str:
+    assert _worker_kp is not None
+    return sign_wire(_worker_kp, _worker_pub, tx_b64)
+
+
+class Signer:
+    """Keypair loaded once; signs Ultra transactions inline, on a thread or in a process.
+
+    SIGNER_MODE=inline signs on the event loop (lowest latency for single
+    executions); `thread` and `process` move signing off the loop so bursts of
+    executions do not stall quoting.
+    """
+
+    def __init__(self, secret: str, mode: str = "inline", workers: int = 1):
+        self._secret = secret
+        self.mode = mode
+        self.workers = max(1, workers)
+        self._kp: Keypair | None = None
+        self._pub = b""
+        self._pool: Executor | None = None
+
+    @classmethod
+    def from_settings(cls, settings) -> Signer:
+        secret = settings.user_keypair or os.getenv("USER_KEYPAIR", "")
+        return cls(secret, settings.SIGNER_MODE, settings.SIGNER_WORKERS)
+
+    @property
+    def keypair(self) -> Keypair:
+        if self._kp is None:
+            self._kp = load_keypair(self._secret)
+            self._pub = bytes(self._kp.pubkey())
+        return self._kp
+
+    def sign_b64(self, tx_b64: str) -> str:
+        kp = self.keypair
+        return sign_wire(kp, self._pub, tx_b64)
+
+    async def sign(self, tx_b64: str) -> str:
+        if self.mode == "inline":
+            return self.sign_b64(tx_b64)
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            if self.mode == "process":
+                _ = self.keypair  # fail fast on a bad secret before spawning workers
+                self._pool = ProcessPoolExecutor(
+                    self.workers, initializer=_worker_init, initargs=(self._secret,)
+                )
+            else:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="signer")
+        if self.mode == "process":
+            return await loop.run_in_executor(self._pool, _worker_sign, tx_b64)
+        return await loop.run_in_executor(self._pool, self.sign_b64, tx_b64)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
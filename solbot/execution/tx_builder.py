@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional
+import base64
 from solders.message import MessageV0
 from solders.transaction import VersionedTransaction
 from solders.keypair import Keypair
@@ -7,10 +7,16 @@ from solders.signature import Signature
 from solders.hash import Hash
 from solders.instruction import Instruction
 from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.pubkey import Pubkey
+from solders.system_program import TransferParams, transfer
+from solders.transaction import Transaction
 
 class TxBuilder:
     @staticmethod
-    def with_compute_budget(msg: MessageV0, cu: int, micro_lamports: int) -> MessageV0:
+    def with_compute_budget(
+        msg: MessageV0, cu: int, micro_lamports: int, recent_blockhash: str | None = None
+    ) -> MessageV0:
+        """Prepend compute budget ixs; pass a prefetched `recent_blockhash` to refresh it."""
         i1 = set_compute_unit_limit(cu)
         i2 = set_compute_unit_price(micro_lamports)
         # Prepend compute budget instructions
@@ -18,7 +24,22 @@ class TxBuilder:
         return MessageV0(
             msg.header,
             msg.account_keys,
-            msg.recent_blockhash,
+            Hash.from_string(recent_blockhash) if recent_blockhash else msg.recent_blockhash,
             tuple(new_ix),
             msg.address_table_lookups,
         )
+
+    @staticmethod
+    def tip_transaction(
+        payer: Keypair, tip_account: str, lamports: int, recent_blockhash: str
+    ) -> str:
+        """Signed, base64 legacy transfer of `lamports` to a Jito tip account."""
+        ix = transfer(TransferParams(
+            from_pubkey=payer.pubkey(),
+            to_pubkey=Pubkey.from_string(tip_account),
+            lamports=lamports,
+        ))
+        tx = Transaction.new_signed_with_payer(
+            [ix], payer.pubkey(), [payer], Hash.from_string(recent_blockhash)
+        )
+        return base64.b64encode(bytes(tx)).decode()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from solbot.core.env import Settings
+from solbot.core.logger import logger
+from solbot.quoter import JupiterQuoter, Quote
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteRequest:
+    input_mint: str
+    output_mint: str
+    amount: int
+
+
+class QuoteFanout:
+    """Concurrent, deadline-bounded quoting shared by all strategies.
+
+    One instance is owned by the supervisor so QUOTE_CONCURRENCY caps in-flight
+    /order calls globally. `quote_many` returns whatever arrived before the
+    deadline; stragglers are cancelled. With QUOTE_HEDGE_AFTER_MS set, a
+    request still pending after that delay gets one uncached duplicate and the
+    first good answer wins.
+    """
+
+    def __init__(self, settings: Settings, quoter: JupiterQuoter):
+        self.s = settings
+        self.q = quoter
+        self._sem = asyncio.Semaphore(max(1, settings.QUOTE_CONCURRENCY))
+        self.requested = 0
+        self.late = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    async def quote_many(
+        self, requests: Iterable[QuoteRequest], deadline_ms: float | None = None
+    ) -> dict[QuoteRequest, Quote]:
+        reqs = list(dict.fromkeys(requests))
+        if not reqs:
+            return {}
+        budget = (deadline_ms if deadline_ms is not None else self.s.QUOTE_DEADLINE_MS) / 1000
+        tasks = {asyncio.ensure_future(self._one(r)): r for r in reqs}
+        self.requested += len(reqs)
+        done, pending = await asyncio.wait(tasks, timeout=budget)
+        for t in pending:
+            t.cancel()
+        if pending:
+            self.late += len(pending)
+            logger.info("fanout.deadline", extra={"late": len(pending), "total": len(reqs)})
+
+        out: dict[QuoteRequest, Quote] = {}
+        for t in done:
+            if t.cancelled() or t.exception() is not None:
+                continue
+            quote = t.result()
+            if quote:
+                out[tasks[t]] = quote
+        return out
+
+    async def quote_chains(
+        self, chains: Sequence[tuple[QuoteRequest, Sequence[str]]], deadline_ms: float | None = None
+    ) -> list[list[tuple[QuoteRequest, Quote]] | None]:
+        """Quote multi-leg routes leg by leg, each leg sized at the previous leg's output.
+
+        A chain is its first request plus the mints each later leg swaps into.
+        Legs at the same depth share one `quote_many` batch. Returns the quoted
+        legs per chain, or None where any leg went unquoted.
+        """
+        out: list[list[tuple[QuoteRequest, Quote]] | None] = [[] for _ in chains]
+        reqs = {i: first for i, (first, _) in enumerate(chains)}
+        depth = 0
+        while reqs:
+            got = await self.quote_many(reqs.values(), deadline_ms)
+            nxt: dict[int, QuoteRequest] = {}
+            for i, req in reqs.items():
+                quote, legs = got.get(req), out[i]
+                if quote is None or quote.out_amount <= 0 or legs is None:
+                    out[i] = None
+                    continue
+                legs.append((req, quote))
+                rest = chains[i][1]
+                if depth < len(rest):
+                    nxt[i] = QuoteRequest(req.output_mint, rest[depth], quote.out_amount)
+            reqs, depth = nxt, depth + 1
+        return out
+
+    async def _one(self, req: QuoteRequest) -> Quote | None:
+        async with self._sem:
+            primary = asyncio.ensure_future(
+                self.q.get_quote(req.input_mint, req.output_mint, req.amount)
+            )
+            hedge_after = self.s.QUOTE_HEDGE_AFTER_MS / 1000
+            if hedge_after <= 0:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done or self._sem.locked():
+                # Finished in time, or no spare capacity to hedge with.
+                return await primary
+            return await self._hedge(req, primary)
+
+    async def _hedge(
+        self, req: QuoteRequest, primary: asyncio.Future[Quote | None]
+    ) -> Quote | None:
+        async with self._sem:
+            self.hedged += 1
+            backup = asyncio.ensure_future(
+                self.q.fetch_quote(req.input_mint, req.output_mint, req.amount)
+            )
+            pending = {primary, backup}
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for t in done:
+                        if not t.cancelled() and t.exception() is None and t.result():
+                            if t is backup:
+                                self.hedge_wins += 1
+                            return t.result()
+                return None
+            finally:
+                for t in pending:
+                    t.cancel()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requested": self.requested,
+            "late": self.late,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+USDT = "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
+SOL = "So11111111111111111111111111111111111111112"
+MSOL = "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So"
+JITOSOL = "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn"
+
+FWD, REV = 0, 1
+
+
+class MintRegistry:
+    """Interns base58 mint addresses to small dense integer IDs.
+
+    IDs index straight into the `decimals` array (and any per-mint array a
+    strategy keeps), so hot paths deal in ints instead of 44-char strings.
+    Decimals are -1 until known.
+
+    IDs stop at the strategy boundary: Plans, the quote cache key and risk
+    bookkeeping keep base58 addresses. IDs are assigned in first-seen order
+    per process, so an ID from a scan shard names a different mint in the
+    coordinator, and everything past a strategy (quote requests, the Ultra
+    API, logs) needs the address anyway; those paths run once per plan or
+    request, not per pair.
+    """
+
+    def __init__(self) -> None:
+        self.addresses: list[str] = []
+        self.symbols: list[str] = []
+        self.decimals = np.zeros(0, dtype=np.int16)
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def intern(self, address: str, decimals: int | None = None, symbol: str | None = None) -> int:
+        mid = self._ids.get(address)
+        if mid is None:
+            mid = len(self.addresses)
+            self._ids[address] = mid
+            self.addresses.append(address)
+            self.symbols.append(symbol or address[:4])
+            if mid >= len(self.decimals):
+                grown = np.full(max(16, 2 * len(self.decimals)), -1, dtype=np.int16)
+                grown[: len(self.decimals)] = self.decimals
+                self.decimals = grown
+        if decimals is not None:
+            self.decimals[mid] = decimals
+        if symbol:
+            self.symbols[mid] = symbol
+        return mid
+
+    def id(self, address: str) -> int | None:
+        return self._ids.get(address)
+
+    def address(self, mid: int) -> str:
+        return self.addresses[mid]
+
+    def scale(self, mid: int) -> float:
+        """10**decimals for mint `mid`; raises if its decimals are unknown."""
+        d = int(self.decimals[mid])
+        if d < 0:
+            raise KeyError(f"decimals unknown for mint {self.addresses[mid]}")
+        return float(10 ** d)
+
+    def to_raw(self, mid: int, ui_amount: float) -> int:
+        return int(ui_amount * self.scale(mid))
+
+    def to_ui(self, mid: int, raw_amount: int | float) -> float:
+        return raw_amount / self.scale(mid)
+
+
+MINTS = MintRegistry()
+USDC_ID = MINTS.intern(USDC, 6, "USDC")
+USDT_ID = MINTS.intern(USDT, 6, "USDT")
+SOL_ID = MINTS.intern(SOL, 9, "SOL")
+MSOL_ID = MINTS.intern(MSOL, 9, "mSOL")
+JITOSOL_ID = MINTS.intern(JITOSOL, 9, "JITOSOL")
+USD_IDS = (USDC_ID, USDT_ID)
+
+
+class PairIndex:
+    """Array-backed pair table keyed by (base_id, quote_id).
+
+    Row i holds base[i], quote[i], their decimals, and per direction
+    (FWD = base->quote, REV = quote->base) the last decimal-adjusted rate and
+    the monotonic time it was quoted. `sync` keeps rates of pairs that survive
+    a watchlist change.
+    """
+
+    def __init__(self, mints: MintRegistry = MINTS):
+        self.mints = mints
+        self.base = np.zeros(0, dtype=np.int32)
+        self.quote = np.zeros(0, dtype=np.int32)
+        self.decimals = np.zeros((0, 2), dtype=np.int16)
+        self.rate = np.zeros((0, 2))
+        self.updated = np.zeros((0, 2))
+        self._slots: dict[tuple[int, int], tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def pairs(self) -> list[tuple[int, int]]:
+        return list(zip(self.base.tolist(), self.quote.tolist(), strict=True))
+
+    def sync(self, pairs: list[tuple[int, int]]) -> bool:
+        """Replace the pair set; returns False when it is unchanged."""
+        if pairs == self.pairs():
+            return False
+        n = len(pairs)
+        base = np.array([b for b, _ in pairs], dtype=np.int32)
+        quote = np.array([q for _, q in pairs], dtype=np.int32)
+        rate, updated = np.zeros((n, 2)), np.zeros((n, 2))
+        for i, key in enumerate(pairs):
+            old = self._slots.get(key)
+            if old is not None:
+                rate[i], updated[i] = self.rate[old[0]], self.updated[old[0]]
+        self.base, self.quote, self.rate, self.updated = base, quote, rate, updated
+        self.decimals = np.stack([self.mints.decimals[base], self.mints.decimals[quote]], axis=1)
+        self._slots = {}
+        for i, (b, q) in enumerate(pairs):
+            self._slots[(b, q)] = (i, FWD)
+            self._slots[(q, b)] = (i, REV)
+        return True
+
+    def slot(self, input_id: int, output_id: int) -> tuple[int, int] | None:
+        return self._slots.get((input_id, output_id))
+
+    def observe(
+        self, input_id: int, output_id: int, in_raw: float, out_raw: float
+    ) -> tuple[int, int, bool] | None:
+        """Record a quote; returns (row, side, rate_moved) or None if the pair is unknown."""
+        slot = self._slots.get((input_id, output_id))
+        if slot is None or in_raw <= 0 or out_raw <= 0:
+            return None
+        i, side = slot
+        d_in, d_out = self.decimals[i] if side == FWD else self.decimals[i][::-1]
+        if d_in < 0 or d_out < 0:
+            return None
+        r = (out_raw / 10.0 ** d_out) / (in_raw / 10.0 ** d_in)
+        moved = r != self.rate[i, side]
+        self.rate[i, side] = r
+        self.updated[i, side] = time.monotonic()
+        return i, side, moved
+
+    def observe_many(
+        self, rows: np.ndarray, sides: np.ndarray, in_raw: np.ndarray, out_raw: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized `observe` for known (row, side) slots; returns the rate_moved mask."""
+        d_in = self.decimals[rows, sides].astype(np.float64)
+        d_out = self.decimals[rows, 1 - sides].astype(np.float64)
+        ok = (d_in >= 0) & (d_out >= 0) & (in_raw > 0) & (out_raw > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = (out_raw / 10.0 ** d_out) / (in_raw / 10.0 ** d_in)
+        moved = ok & (r != self.rate[rows, sides])
+        self.rate[rows[ok], sides[ok]] = r[ok]
+        self.updated[rows[ok], sides[ok]] = time.monotonic()
+        return moved
+
+    def price(self, base_id: int, quote_id: int) -> float:
+        """Mid price of one `base_id` in `quote_id` units; 0.0 if not quoted both ways."""
+        slot = self._slots.get((base_id, quote_id))
+        if slot is None:
+            return 0.0
+        i, side = slot
+        fwd, rev = self.rate[i]
+        if fwd <= 0 or rev <= 0:
+            return 0.0
+        mid = float(np.sqrt(fwd / rev))
+        return mid if side == FWD else 1.0 / mid
+
+    def mid(self) -> np.ndarray:
+        """Geometric mid price (quote per base) per row; 0 where a side is missing."""
+        fwd, rev = self.rate[:, FWD], self.rate[:, REV]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where((fwd > 0) & (rev > 0), np.sqrt(fwd / rev), 0.0)
@@ -1,21 +1,176 @@
 from __future__ import annotations
 import os
-import httpx
-from solbot.core.logger import logger
+import re
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+from solbot.core.cache import SingleFlightCache
+from solbot.core.http import HttpPool
+from solbot.core.logger import Lazy, logger
+from solbot.core.metrics import REGISTRY
+from solbot.core.ratelimit import LANE_QUOTE
+
+if TYPE_CHECKING:
+    from solbot.core.chain_state import ChainState
+
+try:
+    import orjson
+
+    _loads, _dumps = orjson.loads, orjson.dumps
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    _loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _dumps = _json_dumps
 
 TAKER_FEE_BPS = 30
 
+_IN_AMOUNT = re.compile(rb'"inAmount"\s*:\s*"(\d+)"')
+_OUT_AMOUNT = re.compile(rb'"outAmount"\s*:\s*"(\d+)"')
+_REQUEST_ID = re.compile(rb'"requestId"\s*:\s*"([^"]+)"')
+_TRANSACTION = re.compile(rb'"transaction"\s*:\s*"[^"]')
+
+
+class Quote:
+    """Jupiter order response kept as raw bytes with the hot fields pulled out.
+
+    `from_bytes` scans the body for inAmount/outAmount/requestId without
+    building a dict; the full response is parsed lazily via `data` (only the
+    executor needs it). Mapping-style `get`/`[]`/`in` go through `data`.
+    """
+
+    __slots__ = ("raw", "in_amount", "out_amount", "request_id", "has_transaction", "_data")
+
+    def __init__(
+        self,
+        raw: bytes,
+        in_amount: int,
+        out_amount: int,
+        request_id: str | None,
+        has_transaction: bool,
+        data: dict[str, Any] | None = None,
+    ):
+        self.raw = raw
+        self.in_amount = in_amount
+        self.out_amount = out_amount
+        self.request_id = request_id
+        self.has_transaction = has_transaction
+        self._data = data
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> Quote:
+        m_in, m_out = _IN_AMOUNT.search(raw), _OUT_AMOUNT.search(raw)
+        # Only trust the scan if both amounts sit at the top level, i.e. before
+        # any nested object or array (routePlan carries its own in/outAmount).
+        if m_in is None or m_out is None:
+            return cls.from_dict(_loads(raw), raw)
+        end = max(m_in.end(), m_out.end())
+        if raw.count(b"{", 0, end) != 1 or raw.count(b"[", 0, end):
+            return cls.from_dict(_loads(raw), raw)
+        m_id = _REQUEST_ID.search(raw)
+        return cls(
+            raw,
+            int(m_in.group(1)),
+            int(m_out.group(1)),
+            m_id.group(1).decode() if m_id else None,
+            _TRANSACTION.search(raw) is not None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Any, raw: bytes | None = None) -> Quote:
+        if not isinstance(data, dict):
+            data = {}
+        return cls(
+            raw if raw is not None else _dumps(data),
+            int(data.get("inAmount") or 0),
+            int(data.get("outAmount") or 0),
+            data.get("requestId"),
+            bool(data.get("transaction")),
+            data,
+        )
+
+    def __reduce__(self):
+        # Ship only the raw body and hot fields across processes, not the parsed dict.
+        return (Quote, (self.raw, self.in_amount, self.out_amount, self.request_id,
+                        self.has_transaction))
+
+    @property
+    def executable(self) -> bool:
+        return self.has_transaction and bool(self.request_id)
+
+    @property
+    def data(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = _loads(self.raw)
+        return self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def keys(self):
+        return self.data.keys()
+
+QUOTE_LATENCY = REGISTRY.histogram(
+    "solbot_quote_latency_seconds", "Quote request round trip by upstream host", ["upstream"]
+)
+
 class JupiterQuoter:
-    def __init__(self, settings):
+    def __init__(self, settings, http: HttpPool | None = None, chain: ChainState | None = None):
         self.settings = settings
+        # The order's transaction is built with this compute-unit price, so the
+        # fee level is fixed at quote time: ChainState's percentile when there
+        # is one, else `cu_price` (the static setting, or what a shard was sent).
+        self.chain = chain
+        self.cu_price = settings.PRIORITY_FEE_MICRO_LAMPORTS
         self.base = settings.JUP_ORDER_BASE
+        self.http = http or HttpPool(settings)
+        self._latency = QUOTE_LATENCY.labels(urlsplit(self.base).netloc)
+        self.limiter = self.http.limiter(self.base, settings.JUP_API_KEY)
+        self.cache: SingleFlightCache[Quote | None] = SingleFlightCache(
+            settings.QUOTE_CACHE_MAX_AGE_MS / 1000, settings.QUOTE_CACHE_SIZE
+        )
+        # Called as cb(input_mint, output_mint, amount, quote) for every fresh quote.
+        self.listeners: list[Callable[[str, str, int, Quote], None]] = []
+
+    def fee(self) -> int:
+        """Compute-unit price (micro-lamports) the next order is built with."""
+        return self.chain.fee() if self.chain is not None else self.cu_price
 
-    async def get_quote(self, input_mint: str, output_mint: str, amount: int) -> dict | None:
+    async def get_quote(self, input_mint: str, output_mint: str, amount: int) -> Quote | None:
+        """Cached, coalesced `fetch_quote`: identical requests within
+        QUOTE_CACHE_MAX_AGE_MS share one /order call."""
+        return await self.cache.get(
+            (input_mint, output_mint, amount),
+            lambda: self.fetch_quote(input_mint, output_mint, amount),
+        )
+
+    async def fetch_quote(self, input_mint: str, output_mint: str, amount: int) -> Quote | None:
         """Get Jupiter Ultra order response with pre-built transaction (POST /order)"""
+        quote = await self._order(input_mint, output_mint, amount)
+        if quote is not None:
+            for cb in self.listeners:
+                try:
+                    cb(input_mint, output_mint, amount, quote)
+                except Exception as e:  # noqa: BLE001
+                    logger.warning("quote.listener_failed", extra={"err": str(e)})
+        return quote
+
+    async def _order(self, input_mint: str, output_mint: str, amount: int) -> Quote | None:
         if os.getenv("OFFLINE_QUOTES", "false").lower() == "true":
             in_amt = amount / 1_000_000
             out_amt = in_amt * 0.995
-            return {
+            return Quote.from_dict({
                 "requestId": "mock-request-id",
                 "status": "success",
                 "transaction": "mock-transaction-b64",
@@ -24,7 +179,7 @@ class JupiterQuoter:
                 "inAmount": str(amount),
                 "outAmount": str(int(out_amt * 1_000_000)),
                 "slippageBps": self.settings.MAX_ROUTE_SLIPPAGE_BPS
-            }
+            })
 
         body = {
             "inputMint": input_mint,
@@ -38,30 +193,34 @@ class JupiterQuoter:
             "useSharedAccounts": True,
             "wrapAndUnwrapSol": True,
         }
-        if self.settings.PRIORITY_FEE_MICRO_LAMPORTS:
-            body["computeUnitPriceMicroLamports"] = self.settings.PRIORITY_FEE_MICRO_LAMPORTS
+        cu_price = self.fee()
+        if cu_price:
+            body["computeUnitPriceMicroLamports"] = cu_price
 
         headers = {"Content-Type": "application/json"}
         if self.settings.JUP_API_KEY:
             headers["X-API-Key"] = self.settings.JUP_API_KEY
 
         try:
-            async with httpx.AsyncClient(timeout=12) as client:
-                r = await client.post(f"{self.base}/order", json=body, headers=headers)
-                body_txt = None
-                try:
-                    body_txt = r.text[:800]
-                except Exception:
-                    pass
-                logger.info("ultra.order", extra={"status": r.status_code, "body": body_txt})
-                r.raise_for_status()
-                data = r.json()
-
-            if not (isinstance(data, dict) and data.get("transaction") and data.get("requestId")):
-                logger.warning("order.invalid_or_quote_only", extra={"keys": list(data.keys()) if isinstance(data, dict) else type(data).__name__})
+            client = self.http.client(self.base)
+            await self.limiter.acquire(LANE_QUOTE)
+            t0 = time.perf_counter()
+            r = await client.post(f"{self.base}/order", json=body, headers=headers, timeout=12)
+            self._latency.observe(time.perf_counter() - t0)
+            self.limiter.observe(r.status_code, r.headers)
+            raw = r.content
+            logger.info("ultra.order", extra={
+                "status": r.status_code,
+                "body": Lazy(lambda: raw[:800].decode(errors="replace")),
+            })
+            r.raise_for_status()
+            quote = Quote.from_bytes(raw)
+
+            if not quote.executable:
+                logger.warning("order.invalid_or_quote_only", extra={"keys": list(quote.keys())})
                 return None
 
-            return data
+            return quote
 
         except Exception as e:
             logger.error("order.failed", extra={"error": str(e)})
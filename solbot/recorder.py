@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import struct
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from solbot.core.logger import logger
+from solbot.quoter import Quote
+
+# Record: wall ts, amount, body length, input mint, output mint, then the raw body.
+RECORD = struct.Struct("<dQI44s44s")
+
+Record = tuple[float, str, str, int, bytes]  # (ts, input_mint, output_mint, amount, raw)
+
+
+class QuoteRecorder:
+    """Appends every quote the quoter sees to gzip'd, hourly-rotated logs.
+
+    Registered as a quoter listener; `observe` only appends to an in-memory
+    batch. A background task hands each batch to a worker thread every
+    QUOTE_RECORD_FLUSH_MS, which writes it as one gzip member, so files stay
+    append-only and readable even after a crash mid-flush.
+    """
+
+    def __init__(self, directory: str, flush_ms: int = 1000, suffix: str = ""):
+        self.dir = Path(os.path.expanduser(directory))
+        self.suffix = suffix  # keeps concurrent writers (scan shards) in separate files
+        self.flush_s = flush_ms / 1000
+        self._batch: list[bytes] = []
+        self._task: asyncio.Task[None] | None = None
+        self.recorded = 0
+
+    def observe(self, input_mint: str, output_mint: str, amount: int, quote: Quote) -> None:
+        raw = quote.raw
+        self._batch.append(
+            RECORD.pack(time.time(), amount, len(raw), input_mint.encode(), output_mint.encode())
+            + raw
+        )
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_s)
+            try:
+                await self.flush()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("recorder.flush_failed", extra={"err": str(e)})
+
+    async def flush(self) -> None:
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        await asyncio.to_thread(self._write, batch)
+        self.recorded += len(batch)
+
+    def _write(self, batch: list[bytes]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.dir / time.strftime(f"quotes-%Y%m%d%H{self.suffix}.bin.gz", time.gmtime())
+        with gzip.open(path, "ab", compresslevel=5) as f:
+            f.write(b"".join(batch))
+
+
+def read_records(paths: Iterable[str | Path]) -> Iterator[Record]:
+    """Yield records from recorder logs in file order (pass paths sorted by name)."""
+    for path in paths:
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+        off, end = 0, len(data)
+        while off + RECORD.size <= end:
+            ts, amount, n, in_mint, out_mint = RECORD.unpack_from(data, off)
+            off += RECORD.size
+            if off + n > end:
+                break  # truncated tail of an interrupted flush
+            src, dst = in_mint.rstrip(b"\0").decode(), out_mint.rstrip(b"\0").decode()
+            yield ts, src, dst, amount, data[off : off + n]
+            off += n
@@ -16,3 +16,10 @@ class DailyLossGuard:
 
     def exceeded(self) -> bool:
         return self.accum < -abs(self.limit)
+
+    # In-process only: no per-mint exposure tracking (see RiskLedger).
+    def add_exposure(self, mint: str, notional_usd: float) -> None:
+        pass
+
+    def allows(self, mint: str, notional_usd: float) -> bool:
+        return True
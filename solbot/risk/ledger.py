@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+
+from solbot.core.logger import logger
+
+MAGIC = b"SOLRISK1"
+# magic, rows, buckets, mint slots, bucket seconds
+HEADER = struct.Struct("<8sIIId")
+HEADER_SIZE = 64
+MINT_FIELD = 48  # base58 addresses are at most 44 bytes; NUL-padded
+
+# Rows of this process, per ledger file. POSIX record locks never conflict
+# within one process, so a second ledger on the same file must skip them here.
+_claimed: dict[str, set[int]] = {}
+
+
+def _row_dtype(buckets: int, mints: int) -> np.dtype:
+    return np.dtype([
+        ("pid", "<i8"),
+        ("epoch", "<i8", (buckets,)),  # bucket number held in each ring slot, -1 = none
+        ("pnl", "<f8", (buckets,)),
+        ("exposure", "<f8", (mints,)),
+    ])
+
+
+class RiskLedger:
+    """Rolling-window PnL and per-mint exposure in a memory-mapped file.
+
+    Drop-in for DailyLossGuard that several bot processes can share and that
+    survives restarts. The file holds a mint table and a fixed number of
+    rows; each process claims one row (a `lockf` record lock held for its
+    lifetime, released by the kernel when it dies) and is the only writer
+    of that row, so updates are plain stores with no lock on the hot path.
+    A row left by a dead process is reused with its PnL kept and its
+    in-flight exposure cleared.
+
+    PnL goes into a ring of `window_s / bucket_s` time buckets per row.
+    `exceeded()` sums the window across all rows: completed buckets only
+    change on rollover, so their total is cached and the per-call work is
+    the current and previous bucket of each row, on preallocated buffers.
+    Exposure is the notional of submitted, unresolved plans per output mint.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        limit_usd: float,
+        window_s: float = 86_400,
+        bucket_s: float = 300,
+        rows: int = 16,
+        mints: int = 256,
+        max_mint_exposure_usd: float = 0.0,
+    ):
+        self.limit = limit_usd
+        self.max_exposure = max_mint_exposure_usd
+        self.path = str(Path(os.path.expanduser(path)).resolve())
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._open(max(1, round(window_s / bucket_s)), bucket_s, rows, mints)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _open(self, buckets: int, bucket_s: float, rows: int, mints: int) -> None:
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)  # header lock: layout and mint table
+        try:
+            head = os.pread(self._fd, HEADER.size, 0)
+            if len(head) == HEADER.size and head[:8] == MAGIC:
+                want = (rows, buckets, mints, bucket_s)
+                _, rows, buckets, mints, bucket_s = HEADER.unpack(head)
+                self._check_layout(want, (rows, buckets, mints, bucket_s))
+            else:
+                self._init_file(buckets, bucket_s, rows, mints)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+        self.buckets, self.bucket_s, self.mint_slots = buckets, bucket_s, mints
+        dtype = _row_dtype(buckets, mints)
+        self._rows_offset = HEADER_SIZE + mints * MINT_FIELD
+        self._row_size = dtype.itemsize
+        size = self._rows_offset + rows * dtype.itemsize
+        self._mm = mmap.mmap(self._fd, size)
+        self._names = np.ndarray((mints, MINT_FIELD), np.uint8, self._mm, HEADER_SIZE)
+        self.rows = np.ndarray((rows,), dtype, self._mm, self._rows_offset)
+        self.row = self._claim_row()
+        mine = self.rows[self.row]
+        self._epoch, self._pnl, self._exposure = mine["epoch"], mine["pnl"], mine["exposure"]
+        self._all_epoch, self._all_pnl = self.rows["epoch"], self.rows["pnl"]
+        self._all_exposure = self.rows["exposure"]
+        self._mask = np.empty(self._all_epoch.shape, dtype=bool)
+        self._row_mask = np.empty(rows, dtype=bool)
+        self._mint_slot: dict[str, int] = {}
+        self._closed_until = -1  # current bucket number the cached total was computed for
+        self._closed_pnl = 0.0
+        logger.info("risk.ledger_open", extra={
+            "path": self.path, "row": self.row, "rows": rows, "buckets": buckets,
+            "window_pnl": round(self.accum, 6),
+        })
+
+    def _check_layout(
+        self, want: tuple[int, int, int, float], have: tuple[int, int, int, float]
+    ) -> None:
+        """An existing file keeps its layout; refuse a different window, warn on capacity."""
+        (w_rows, w_buckets, w_mints, w_bucket_s), (rows, buckets, mints, bucket_s) = want, have
+        if (w_buckets, w_bucket_s) != (buckets, bucket_s):
+            raise RuntimeError(
+                f"risk ledger {self.path} holds a {buckets} x {bucket_s:g}s window but "
+                f"{w_buckets} x {w_bucket_s:g}s is configured; delete the file (with every "
+                "process stopped) or set RISK_WINDOW_S/RISK_BUCKET_S to match"
+            )
+        if (w_rows, w_mints) != (rows, mints):
+            logger.warning("risk.ledger_layout_mismatch", extra={
+                "path": self.path, "rows": rows, "mints": mints,
+                "configured_rows": w_rows, "configured_mints": w_mints,
+            })
+
+    def _init_file(self, buckets: int, bucket_s: float, rows: int, mints: int) -> None:
+        size = HEADER_SIZE + mints * MINT_FIELD + rows * _row_dtype(buckets, mints).itemsize
+        os.ftruncate(self._fd, size)
+        rows_offset = HEADER_SIZE + mints * MINT_FIELD
+        with mmap.mmap(self._fd, size) as mm:
+            table = np.ndarray((rows,), _row_dtype(buckets, mints), mm, rows_offset)
+            table["epoch"] = -1
+            del table
+            mm[:HEADER.size] = HEADER.pack(MAGIC, rows, buckets, mints, bucket_s)
+            mm.flush()
+
+    def _claim_row(self) -> int:
+        """Take the first row no live process holds; clear dead rows' exposure on the way."""
+        taken = _claimed.setdefault(self.path, set())
+        claimed = -1
+        for i in range(len(self.rows)):
+            if i in taken:
+                continue
+            start = self._rows_offset + i * self._row_size
+            try:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, self._row_size, start)
+            except OSError:
+                continue  # held by a live process
+            if self.rows["pid"][i]:
+                # Left by a dead process: its in-flight plans are gone, its PnL stays.
+                self.rows["exposure"][i] = 0.0
+                self.rows["pid"][i] = 0
+            if claimed < 0:
+                claimed = i
+            else:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self._row_size, start)
+        if claimed < 0:
+            raise RuntimeError(f"risk ledger {self.path} has no free row ({len(self.rows)} in use)")
+        taken.add(claimed)
+        self.rows["pid"][claimed] = os.getpid()
+        return claimed
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        self._exposure[:] = 0.0
+        self.rows["pid"][self.row] = 0
+        _claimed.get(self.path, set()).discard(self.row)
+        del self._epoch, self._pnl, self._exposure, self._all_epoch, self._all_pnl
+        del self._all_exposure, self.rows, self._names
+        self._mm.flush()
+        self._mm.close()
+        os.close(self._fd)  # drops the row lock
+
+    # --- PnL ------------------------------------------------------------------
+
+    def add_pnl(self, pnl_usd: float) -> None:
+        e = int(time.time() // self.bucket_s)
+        b = e % self.buckets
+        if self._epoch[b] != e:
+            # Recycle the slot: invalidate first so readers never pair the new
+            # bucket number with the previous bucket's PnL.
+            self._epoch[b] = -1
+            self._pnl[b] = pnl_usd
+            self._epoch[b] = e
+        else:
+            self._pnl[b] += pnl_usd
+
+    @property
+    def accum(self) -> float:
+        """PnL over the rolling window, all processes."""
+        e = int(time.time() // self.bucket_s)
+        if e != self._closed_until:
+            # Buckets older than the previous one no longer take writes.
+            np.greater(self._all_epoch, e - self.buckets, out=self._mask)
+            np.logical_and(self._mask, self._all_epoch < e - 1, out=self._mask)
+            self._closed_pnl = float(self._all_pnl.sum(where=self._mask))
+            self._closed_until = e
+        total = self._closed_pnl
+        for k in (e - 1, e):
+            b = k % self.buckets
+            np.equal(self._all_epoch[:, b], k, out=self._row_mask)
+            total += float(self._all_pnl[:, b].sum(where=self._row_mask))
+        return total
+
+    def exceeded(self) -> bool:
+        return self.accum < -abs(self.limit)
+
+    # --- exposure -------------------------------------------------------------
+
+    def _slot(self, mint: str) -> int:
+        slot = self._mint_slot.get(mint)
+        if slot is not None:
+            return slot
+        key = mint.encode()[:MINT_FIELD]
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+        try:
+            for i in range(self.mint_slots):
+                name = bytes(self._names[i]).rstrip(b"\0")
+                if name == key:
+                    break
+                if not name:
+                    self._names[i, : len(key)] = np.frombuffer(key, np.uint8)
+                    break
+            else:
+                logger.warning("risk.mint_table_full", extra={"mint": mint})
+                i = -1
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+        self._mint_slot[mint] = i
+        return i
+
+    def exposure(self, mint: str) -> float:
+        slot = self._slot(mint)
+        return float(self._all_exposure[:, slot].sum()) if slot >= 0 else 0.0
+
+    def add_exposure(self, mint: str, notional_usd: float) -> None:
+        slot = self._slot(mint)
+        if slot >= 0:
+            self._exposure[slot] = max(0.0, self._exposure[slot] + notional_usd)
+
+    def allows(self, mint: str, notional_usd: float) -> bool:
+        """False if `notional_usd` more of `mint` in flight would pass the per-mint cap."""
+        if self.max_exposure <= 0:
+            return True
+        return self.exposure(mint) + notional_usd <= self.max_exposure
+
+    def exposures(self) -> dict[str, float]:
+        totals = self._all_exposure.sum(axis=0)
+        return {m: float(totals[s]) for m, s in self._mint_slot.items() if s >= 0 and totals[s]}
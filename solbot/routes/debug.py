@@ -0,0 +1,54 @@
+import asyncio
+import hmac
+import threading
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from solbot.core import profiling
+from solbot.core.env import get_settings
+
+
+def require_token(authorization: str = Header("")) -> None:
+    """Refuse unless the request carries `Authorization: Bearer <API_DEBUG_TOKEN>`."""
+    expected = get_settings().API_DEBUG_TOKEN
+    scheme, _, given = authorization.partition(" ")
+    if not expected or scheme.lower() != "bearer" or not hmac.compare_digest(
+        given.strip().encode(), expected.encode()
+    ):
+        raise HTTPException(status_code=403, detail="debug token required")
+
+
+router = APIRouter(prefix="/debug", dependencies=[Depends(require_token)])
+
+@router.get("/profile")
+async def profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=100),
+    format: str = Query("top", pattern="^(top|folded)$"),
+):
+    """Sample the event loop thread's stacks for `seconds` while it keeps running."""
+    loop_thread = threading.get_ident()
+    try:
+        counts, samples = await asyncio.to_thread(
+            profiling.sample_stacks, loop_thread, seconds, interval_ms / 1000
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    if format == "folded":
+        body = "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
+        return PlainTextResponse(body)
+    return {"seconds": seconds, "samples": samples, "top": profiling.top_functions(counts, samples)}
+
+@router.get("/stages")
+async def stages(reset: bool = False):
+    """Per-coroutine time in each pipeline stage, plus event-loop lag.
+
+    Async so it reads the live stage and monitor state on the loop thread.
+    """
+    out = profiling.STAGES.snapshot()
+    if profiling.MONITOR is not None:
+        out["loop"] = profiling.MONITOR.stats()
+    if reset:
+        profiling.STAGES.reset()
+    return out
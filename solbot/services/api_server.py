@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+from solbot.core.env import Settings
+from solbot.core.logger import logger
+
+
+async def serve_api(settings: Settings) -> None:
+    """Serve the FastAPI app (healthz, metrics) on the supervisor's event loop."""
+    import uvicorn
+
+    from solbot.api import app
+
+    config = uvicorn.Config(
+        app, host=settings.API_HOST, port=settings.API_PORT, log_level="warning", lifespan="off"
+    )
+    server = uvicorn.Server(config)
+    # The supervisor owns process signals; uvicorn must not replace them.
+    server.capture_signals = contextlib.nullcontext  # type: ignore[method-assign]
+    logger.info("api.start", extra={"host": settings.API_HOST, "port": settings.API_PORT})
+    try:
+        await server.serve()
+    except asyncio.CancelledError:
+        server.should_exit = True
+        raise
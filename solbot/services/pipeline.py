@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any
+
+from solbot.core.env import Settings
+from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+from solbot.core.profiling import STAGES
+from solbot.risk.daily_guard import DailyLossGuard
+from solbot.risk.ledger import RiskLedger
+from solbot.strategy.models import Plan
+from solbot.trade.executor import Executor
+
+SCAN_TICK = REGISTRY.histogram(
+    "solbot_scan_tick_seconds", "Duration of one strategy scan", ["strategy"]
+)
+PLANS_PRODUCED = REGISTRY.counter(
+    "solbot_plans_produced_total", "Plans proposed by strategies", ["strategy"]
+)
+PLANS_LAST_TICK = REGISTRY.gauge(
+    "solbot_plans_last_tick", "Plans proposed in the most recent scan", ["strategy"]
+)
+PLANS_EXECUTED = REGISTRY.counter("solbot_plans_executed_total", "Plans executed successfully")
+
+
+def plan_key(plan: Plan) -> Hashable:
+    return (plan.input_mint, plan.output_mint, plan.input_amount)
+
+
+def _pnl(plan: Plan) -> float:
+    return plan.expected_pnl_usd
+
+
+class PlanBook:
+    """Bounded best-first book of executable plans.
+
+    A newer plan for the same (input, output, amount) supersedes the older one,
+    plans older than `max_age_s` are dropped on pop, and when full the
+    lowest-PnL entries are evicted.
+    """
+
+    def __init__(
+        self, maxsize: int, max_age_s: float, clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.max_age_s = max_age_s
+        self.clock = clock
+        self._heap: list[tuple[float, int, Plan]] = []
+        self._latest: dict[Hashable, int] = {}
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+        self.dropped_stale = 0
+        self.dropped_full = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def offer(self, plan: Plan) -> None:
+        seq = next(self._seq)
+        self._latest[plan_key(plan)] = seq
+        heapq.heappush(self._heap, (-plan.expected_pnl_usd, seq, plan))
+        if len(self._heap) > self.maxsize:
+            live = [e for e in self._heap if self._latest.get(plan_key(e[2])) == e[1]]
+            self.dropped_full += max(0, len(live) - self.maxsize)
+            self._heap = heapq.nsmallest(self.maxsize, live)
+        self._ready.set()
+
+    def discard(self, plan: Plan) -> None:
+        """Invalidate every queued plan for the same key (e.g. after executing it)."""
+        self._latest.pop(plan_key(plan), None)
+
+    def pop_nowait(self) -> Plan | None:
+        now = self.clock()
+        while self._heap:
+            _, seq, plan = heapq.heappop(self._heap)
+            key = plan_key(plan)
+            if self._latest.get(key) != seq:
+                continue  # superseded or discarded
+            del self._latest[key]
+            if now - plan.created_at > self.max_age_s:
+                self.dropped_stale += 1
+                continue
+            return plan
+        self._ready.clear()
+        return None
+
+    async def pop(self) -> Plan:
+        while True:
+            plan = self.pop_nowait()
+            if plan is not None:
+                return plan
+            await self._ready.wait()
+
+
+def rank_into(book: PlanBook, plans: list[Plan], min_profit_usd: float) -> None:
+    # Heap selection: only the best PLAN_BOOK_SIZE of a batch can matter.
+    viable = (p for p in plans if p.expected_pnl_usd >= min_profit_usd)
+    for plan in heapq.nlargest(book.maxsize, viable, key=_pnl):
+        book.offer(plan)
+
+
+class Pipeline:
+    """Staged scan → rank → execute loop.
+
+    Each strategy runs as its own producer on the SCAN_INTERVAL_MS timer (or
+    earlier when `request_scan()` is called) and pushes plan batches into a
+    bounded queue. A ranker filters batches into the PlanBook, and
+    EXEC_WORKERS workers execute the best fresh plan while scanning continues.
+
+    With a `sink`, the pipeline only scans and hands each batch to the sink
+    (a scan shard); a coordinator pipeline with no strategies receives those
+    batches through `submit()` and forwards scan requests to `scan_hooks`.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        strategies: Sequence[Any],
+        executor: Executor | None,
+        guard: DailyLossGuard | RiskLedger,
+        stats: dict[str, Any] | None = None,
+        sink: Callable[[list[Plan]], None] | None = None,
+    ):
+        self.s = settings
+        self.strategies = list(strategies)
+        self.executor = executor
+        self.guard = guard
+        self.stats = stats or {}
+        self.sink = sink
+        self.scan_hooks: list[Callable[[], None]] = []
+        self.batches: asyncio.Queue[list[Plan]] = asyncio.Queue(
+            maxsize=settings.PIPELINE_QUEUE_SIZE
+        )
+        self.book = PlanBook(settings.PLAN_BOOK_SIZE, settings.PLAN_MAX_AGE_MS / 1000)
+        self._wake = [asyncio.Event() for _ in self.strategies]
+        self.dropped_batches = 0
+        self.executed = 0
+
+    def request_scan(self) -> None:
+        """Start the next scan of every strategy now instead of on the timer."""
+        for ev in self._wake:
+            ev.set()
+        for hook in self.scan_hooks:
+            hook()
+
+    def submit(self, plans: list[Plan]) -> None:
+        """Queue a batch produced elsewhere (e.g. by a scan shard) for ranking."""
+        self._put_batch(plans)
+
+    async def run(self) -> None:
+        tasks = [
+            asyncio.create_task(self._produce(i, s)) for i, s in enumerate(self.strategies)
+        ]
+        if self.sink is None:
+            tasks.append(asyncio.create_task(self._rank()))
+            tasks.extend(
+                asyncio.create_task(self._execute(i)) for i in range(max(1, self.s.EXEC_WORKERS))
+            )
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _produce(self, idx: int, strategy: Any) -> None:
+        name = type(strategy).__name__
+        wake = self._wake[idx]
+        tick_hist = SCAN_TICK.labels(name)
+        produced, last_tick = PLANS_PRODUCED.labels(name), PLANS_LAST_TICK.labels(name)
+        failures = 0
+        while True:
+            try:
+                if self.guard.exceeded():
+                    logger.error("Daily loss limit exceeded — pausing execution")
+                    await asyncio.sleep(60)
+                    continue
+
+                t0 = time.perf_counter()
+                wake.clear()
+                plans = await strategy.propose_plans()
+                best = max((p.expected_pnl_usd for p in plans), default=0.0)
+                logger.info("Result here:", extra={
+                    "strategy": name, "plans": len(plans), "best_exp_pnl": round(best, 6),
+                    **{k: v() for k, v in self.stats.items()},
+                })
+                if plans:
+                    (self.sink or self._put_batch)(plans)
+
+                dt = (time.perf_counter() - t0) * 1000
+                tick_hist.observe(dt / 1000)
+                STAGES.record("propose", name, dt / 1000)
+                produced.inc(len(plans))
+                last_tick.set(len(plans))
+                delay = max(self.s.SCAN_MIN_GAP_MS, self.s.SCAN_INTERVAL_MS - dt) / 1000
+                t0 = time.perf_counter()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(wake.wait(), timeout=delay)
+                STAGES.record("sleep", name, time.perf_counter() - t0)
+                failures = 0
+            except Exception as e:  # noqa: BLE001
+                failures += 1
+                logger.exception("Result here:", extra={
+                    "strategy": name, "failures": failures, "err": str(e)
+                })
+                if failures >= self.s.PAUSE_AFTER_FAILS:
+                    logger.error("pausing after repeated failures", extra={"strategy": name})
+                    await asyncio.sleep(5)
+                    failures = 0
+
+    def _put_batch(self, plans: list[Plan]) -> None:
+        if self.batches.full():
+            # Ranking is behind: the oldest batch is the least useful one.
+            self.batches.get_nowait()
+            self.dropped_batches += 1
+        self.batches.put_nowait(plans)
+
+    async def _rank(self) -> None:
+        while True:
+            plans = await self.batches.get()
+            t0 = time.perf_counter()
+            rank_into(self.book, plans, self.s.MIN_PROFIT_USD)
+            STAGES.record("rank", "ranker", time.perf_counter() - t0)
+
+    async def _execute(self, worker: int) -> None:
+        name = f"worker-{worker}"
+        executor = self.executor
+        assert executor is not None  # only scan shards run without one, and they don't execute
+        while True:
+            plan = await self.book.pop()
+            try:
+                guard = self.guard
+                if guard.exceeded() or not guard.allows(plan.output_mint, plan.notional_usd):
+                    continue
+                # In dry mode, this will not send; report profit
+                logger.info("Made profit:", extra={
+                    "profit_amount": round(plan.expected_pnl_usd, 6), "worker": worker
+                })
+                t0 = time.perf_counter()
+                ok = await executor.try_execute(plan)
+                STAGES.record("execute", name, time.perf_counter() - t0)
+                if ok:
+                    self.executed += 1
+                    PLANS_EXECUTED.inc()
+                    self.book.discard(plan)
+                    if executor.tracker is None:
+                        # No confirmation tracking: book the expected PnL.
+                        self.guard.add_pnl(plan.expected_pnl_usd)
+                    self.request_scan()
+            except Exception as e:  # noqa: BLE001
+                logger.exception("execution worker error", extra={"worker": worker, "err": str(e)})
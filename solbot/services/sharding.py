@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing as mp
+import signal
+import zlib
+from functools import partial
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING, Any
+
+from solbot.core.env import Settings
+from solbot.core.http import HttpPool
+from solbot.core.logger import logger
+from solbot.discovery import DiscoveryService
+from solbot.fanout import QuoteFanout
+from solbot.mints import MINTS, PairIndex
+from solbot.quoter import JupiterQuoter
+from solbot.recorder import QuoteRecorder
+from solbot.risk.daily_guard import DailyLossGuard
+from solbot.services.pipeline import Pipeline
+from solbot.strategy.cycle_search import CycleSearch
+from solbot.strategy.models import Plan
+from solbot.strategy.stable_delta import StableDelta
+from solbot.strategy.two_leg_spread import TwoLegSpread
+
+if TYPE_CHECKING:
+    from solbot.core.chain_state import ChainState
+
+# Strategies that need the whole watchlist (fixed pairs or the full graph) run
+# unsharded, one per shard round-robin; StableDelta runs on every shard over
+# that shard's slice of pairs. Beyond len(WHOLE_GRAPH) + 1 shards, extra
+# shards only thin out StableDelta's slices.
+WHOLE_GRAPH = (TwoLegSpread, CycleSearch)
+
+
+def shard_of(pair: dict, count: int) -> int:
+    """Stable shard for a watchlist pair (same answer in every process)."""
+    return zlib.crc32(f'{pair["base"]}:{pair["quote"]}'.encode()) % count
+
+
+class ShardView:
+    """One shard's slice of the discovery watchlist, re-sliced on every change."""
+
+    def __init__(self, discovery: DiscoveryService, index: int, count: int):
+        self.d = discovery
+        self.index = index
+        self.count = count
+        self.watchlist: list[dict] = []
+        self.pairs = PairIndex()
+        discovery.listeners.append(self._sync)
+        self._sync()
+
+    @property
+    def watch_count(self) -> int:
+        return len(self.watchlist)
+
+    def _sync(self) -> None:
+        self.watchlist = [p for p in self.d.watchlist if shard_of(p, self.count) == self.index]
+        self.pairs.sync([
+            (MINTS.intern(p["base"]), MINTS.intern(p["quote"])) for p in self.watchlist
+        ])
+
+
+RATE_BUDGETS = ("RATE_LIMIT_RPS", "RATE_LIMIT_BURST", "RATE_LIMIT_MIN_RPS", "RATE_LIMIT_MAX_RPS")
+
+
+def budget_share(settings: Settings) -> float:
+    """Fraction of the RATE_LIMIT_* budgets each process gets: the coordinator
+    and every shard take an equal part, so together they stay within the
+    configured rates (and AIMD floor and ceiling)."""
+    return 1.0 / (settings.SCAN_SHARDS + 1)
+
+
+def coordinator_settings(settings: Settings) -> Settings:
+    """The coordinator's settings: its share of the rate-limit budgets.
+
+    Its bucket still holds 1 + RATE_LIMIT_RESERVE tokens, so an execution
+    never waits behind the few quotes the coordinator itself sends.
+    """
+    share = budget_share(settings)
+    values = settings.model_dump()
+    for name in RATE_BUDGETS:
+        values[name] = values[name] * share
+    values["RATE_LIMIT_BURST"] = max(1.0 + settings.RATE_LIMIT_RESERVE, values["RATE_LIMIT_BURST"])
+    return Settings(**values)
+
+
+def shard_settings(settings: Settings) -> dict[str, Any]:
+    """Settings for each shard process: its share of the rate-limit budgets.
+
+    Each shard adapts to 429s on its own share. Shards never execute, so
+    they keep no execution reserve; a shard's burst is still at least one
+    token, or quoting could never start.
+    """
+    share = budget_share(settings)
+    values = settings.model_dump()
+    for name in RATE_BUDGETS:
+        values[name] = values[name] * share
+    values["RATE_LIMIT_RESERVE"] = 0.0
+    values["RATE_LIMIT_BURST"] = max(1.0, values["RATE_LIMIT_BURST"])
+    values["API_ENABLED"] = False
+    return values
+
+
+def _shard_main(index: int, count: int, conn: Connection, values: dict[str, Any]) -> None:
+    # Ctrl-C reaches the whole process group; let the coordinator shut shards down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_run_shard(Settings(**values), index, count, conn))
+
+
+async def _run_shard(settings: Settings, index: int, count: int, conn: Connection) -> None:
+    http = HttpPool(settings)
+    discovery = DiscoveryService(settings, None, http)
+    quoter = JupiterQuoter(settings, http)
+    fanout = QuoteFanout(settings, quoter)
+    quoter.listeners.append(discovery.observe)
+    recorder = None
+    if settings.QUOTE_RECORD_DIR:
+        recorder = QuoteRecorder(
+            settings.QUOTE_RECORD_DIR, settings.QUOTE_RECORD_FLUSH_MS, suffix=f"-s{index}"
+        )
+        quoter.listeners.append(recorder.observe)
+        recorder.start()
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    ready = asyncio.Event()  # set by the first watchlist (or a stop)
+    pipeline: Pipeline | None = None
+
+    def on_message() -> None:
+        try:
+            msg: tuple[Any, ...] = conn.recv()
+        except (EOFError, OSError):
+            msg = ("stop",)  # coordinator went away
+        if msg[0] == "scan" and pipeline is not None:
+            pipeline.request_scan()
+        elif msg[0] == "fee":
+            quoter.cu_price = msg[1]  # the coordinator's current fee level
+        elif msg[0] == "watchlist":
+            for address, decimals, symbol in msg[1]:
+                MINTS.intern(address, decimals, symbol)
+            discovery.set_watchlist(msg[2])
+            ready.set()
+        elif msg[0] == "stop":
+            stop.set()
+            ready.set()
+
+    loop.add_reader(conn.fileno(), on_message)
+    run_task = None
+    try:
+        # Only the coordinator runs the token registry (and rewrites its cache);
+        # shards take the watchlist it sends.
+        await http.warm([settings.JUP_ORDER_BASE])
+        await ready.wait()
+        if stop.is_set():
+            return
+        view = ShardView(discovery, index, count)
+        strategies: list[Any] = [StableDelta(settings, view, quoter, fanout)]  # type: ignore[arg-type]
+        strategies += [
+            cls(settings, discovery, quoter, fanout)
+            for k, cls in enumerate(WHOLE_GRAPH) if k % count == index
+        ]
+        pipeline = Pipeline(
+            settings, strategies, None, DailyLossGuard(settings.MAX_DAILY_LOSS_USD),
+            stats={"shard": lambda: index, "fanout": fanout.stats,
+                   "ratelimit": http.limiter_stats},
+            sink=conn.send,
+        )
+        discovery.listeners.append(pipeline.request_scan)
+        logger.info("shard.started", extra={
+            "shard": index, "pairs": view.watch_count,
+            "strategies": [type(s).__name__ for s in strategies],
+        })
+        run_task = asyncio.create_task(pipeline.run())
+        await stop.wait()
+    finally:
+        loop.remove_reader(conn.fileno())
+        if run_task is not None:
+            run_task.cancel()
+            await asyncio.gather(run_task, return_exceptions=True)
+        if recorder is not None:
+            await recorder.stop()
+        await discovery.stop()
+        await http.aclose()
+
+
+class ScanShards:
+    """Runs scanning in SCAN_SHARDS worker processes feeding one coordinator.
+
+    Each shard is a spawned process with its own event loop, connection pool,
+    quoter and strategies, scanning its slice of the watchlist. Plan batches
+    come back pickled over a pipe (Quotes travel as raw bytes) and go into the
+    coordinator pipeline, which ranks them globally, applies DailyLossGuard
+    and executes. Scan requests from the coordinator are broadcast to shards.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        pipeline: Pipeline,
+        discovery: DiscoveryService,
+        chain: ChainState | None = None,
+    ):
+        self.s = settings
+        self.pipeline = pipeline
+        self.discovery = discovery
+        self.chain = chain
+        self.count = settings.SCAN_SHARDS
+        self._procs: list[BaseProcess] = []
+        self._conns: list[Connection] = []
+        self.received = [0] * self.count
+
+    def start(self) -> None:
+        ctx = mp.get_context("spawn")
+        values = shard_settings(self.s)
+        loop = asyncio.get_running_loop()
+        for i in range(self.count):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_shard_main, args=(i, self.count, child, values),
+                name=f"solbot-shard-{i}", daemon=True,
+            )
+            proc.start()
+            child.close()
+            loop.add_reader(parent.fileno(), partial(self._on_batch, i))
+            self._procs.append(proc)
+            self._conns.append(parent)
+        self.pipeline.scan_hooks.append(self.request_scan)
+        self.discovery.listeners.append(self.send_watchlist)
+        if self.discovery.watchlist:
+            self.send_watchlist()
+        if self.chain is not None:
+            self.chain.listeners.append(self.send_fee)
+            self.send_fee(self.chain.fee())
+        logger.info("shards.started", extra={"shards": self.count})
+
+    def _on_batch(self, index: int) -> None:
+        conn = self._conns[index]
+        try:
+            plans: list[Plan] = conn.recv()
+        except (EOFError, OSError):
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+            logger.error("shard.exited", extra={
+                "shard": index, "exitcode": self._procs[index].exitcode
+            })
+            return
+        self.received[index] += len(plans)
+        for p in plans:
+            # Keep the coordinator's pair rates current (used to value fees).
+            self.discovery.observe(p.input_mint, p.output_mint, p.input_amount, p.quote_response)
+        self.pipeline.submit(plans)
+
+    def send_watchlist(self) -> None:
+        """Broadcast the watchlist, with each mint's decimals and symbol, to every shard."""
+        watchlist = self.discovery.watchlist
+        tokens = []
+        for address in dict.fromkeys(m for p in watchlist for m in (p["base"], p["quote"])):
+            mid = MINTS.intern(address)
+            decimals = int(MINTS.decimals[mid])
+            tokens.append((address, decimals if decimals >= 0 else None, MINTS.symbols[mid]))
+        self._broadcast(("watchlist", tokens, watchlist))
+
+    def send_fee(self, fee: int) -> None:
+        """Shards have no RPC; their orders (and PnL) use the fee level sent here."""
+        self._broadcast(("fee", fee))
+
+    def request_scan(self) -> None:
+        self._broadcast(("scan",))
+
+    def _broadcast(self, msg: tuple) -> None:
+        for conn in self._conns:
+            with contextlib.suppress(OSError):
+                conn.send(msg)
+
+    async def stop(self) -> None:
+        loop = asyncio.get_running_loop()
+        for conn in self._conns:
+            try:
+                loop.remove_reader(conn.fileno())
+                conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        for proc in self._procs:
+            await asyncio.to_thread(proc.join, 5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._procs, self._conns = [], []
@@ -1,77 +1,173 @@
 from __future__ import annotations
 import asyncio
 import time
-from typing import Sequence
+from collections.abc import Awaitable
+from typing import Any
+from solbot.amm import PoolMirror, load_pools
+from solbot.core.chain_state import ChainState
 from solbot.core.env import Settings
+from solbot.core.http import HttpPool
 from solbot.core.logger import logger
+from solbot.core import profiling
+from solbot.core.metrics import REGISTRY
+from solbot.core.profiling import LoopMonitor
 from solbot.core.rpc import RpcPool
 from solbot.discovery import DiscoveryService
+from solbot.fanout import QuoteFanout
 from solbot.quoter import JupiterQuoter
-from solbot.strategy.models import Plan
+from solbot.recorder import QuoteRecorder
+from solbot.services.api_server import serve_api
+from solbot.services.pipeline import Pipeline
+from solbot.services.sharding import ScanShards, coordinator_settings
+from solbot.strategy.cycle_search import CycleSearch
 from solbot.strategy.two_leg_spread import TwoLegSpread
 from solbot.strategy.stable_delta import StableDelta
+from solbot.trade.confirmations import ConfirmationTracker
 from solbot.trade.executor import Executor
 from solbot.risk.daily_guard import DailyLossGuard
+from solbot.risk.ledger import RiskLedger
 
 
-async def run_supervisor(settings: Settings) -> None:
-    rpc_pool = RpcPool(settings)
-    discovery = DiscoveryService(settings, rpc_pool)
-    quoter = JupiterQuoter(settings)
-    executor = Executor(settings, rpc_pool)
-    guard = DailyLossGuard(settings.MAX_DAILY_LOSS_USD)
+async def _timed(phases: dict[str, float], name: str, aw: Awaitable[Any]) -> Any:
+    t0 = time.perf_counter()
+    try:
+        return await aw
+    finally:
+        phases[name] = time.perf_counter() - t0
 
-    strategies = [
-        TwoLegSpread(settings, discovery, quoter),
-        StableDelta(settings, discovery, quoter),
-    ]
 
-    await discovery.refresh()
-    logger.info("Attempt to find:", extra={"pairs": discovery.watch_count})
+async def run_supervisor(settings: Settings, started_at: float | None = None) -> None:
+    """Build the services, warm them up concurrently and run the pipeline.
+
+    `started_at` (a perf_counter reading taken at process start) adds the
+    import time to the startup breakdown logged as `startup.ready`.
+    """
+    sharded = settings.SCAN_SHARDS > 1
+    # With shards, this process only gets its share of the rate-limit budgets.
+    http = HttpPool(coordinator_settings(settings) if sharded else settings)
+    rpc_pool = RpcPool(settings, http)
+    discovery = DiscoveryService(settings, rpc_pool, http)
+    chain = ChainState(settings, rpc_pool)
+    quoter = JupiterQuoter(settings, http, chain)
+    fanout = QuoteFanout(settings, quoter)
+    if settings.RISK_LEDGER_FILE:
+        guard = RiskLedger(
+            settings.RISK_LEDGER_FILE, settings.MAX_DAILY_LOSS_USD,
+            window_s=settings.RISK_WINDOW_S, bucket_s=settings.RISK_BUCKET_S,
+            rows=settings.RISK_LEDGER_ROWS, mints=settings.RISK_LEDGER_MINTS,
+            max_mint_exposure_usd=settings.MAX_MINT_EXPOSURE_USD,
+        )
+        REGISTRY.gauge_fn(
+            "solbot_mint_exposure_usd", "In-flight notional per output mint, all processes",
+            lambda: [({"mint": m}, v) for m, v in guard.exposures().items()],
+        )
+    else:
+        guard = DailyLossGuard(settings.MAX_DAILY_LOSS_USD)
+    tracker = ConfirmationTracker(settings, rpc_pool, guard, chain, discovery.pairs)
+    executor = Executor(settings, rpc_pool, http, chain, tracker, quoter)
+    quoter.listeners.append(discovery.observe)
+    recorder = None
+    if settings.QUOTE_RECORD_DIR and not sharded:  # shards record their own quotes
+        recorder = QuoteRecorder(settings.QUOTE_RECORD_DIR, settings.QUOTE_RECORD_FLUSH_MS)
+        quoter.listeners.append(recorder.observe)
+
+    mirror = None
+    if settings.AMM_POOLS_FILE and not sharded:
+        mirror = PoolMirror(settings, rpc_pool, load_pools(settings.AMM_POOLS_FILE))
+
+    strategies = [] if sharded else [
+        TwoLegSpread(settings, discovery, quoter, fanout),
+        StableDelta(settings, discovery, quoter, fanout, mirror=mirror),
+        CycleSearch(settings, discovery, quoter, fanout, mirror=mirror),
+    ]
 
-    failures = 0
-    while True:
-        try:
-            if guard.exceeded():
-                logger.error("Daily loss limit exceeded — pausing execution")
-                await asyncio.sleep(60)
-                continue
+    REGISTRY.gauge_fn(
+        "solbot_daily_pnl_usd", "Loss guard PnL (RiskLedger: rolling window, all processes)",
+        lambda: guard.accum,
+    )
+    REGISTRY.gauge_fn("solbot_daily_loss_limit_usd", "DailyLossGuard limit", lambda: guard.limit)
+    REGISTRY.gauge_fn(
+        "solbot_daily_loss_exceeded", "1 while the daily loss limit is exceeded",
+        lambda: float(guard.exceeded()),
+    )
 
-            t0 = time.perf_counter()
-            plans: list[Plan] = []
-            results = await asyncio.gather(
-                *[s.propose_plans() for s in strategies], return_exceptions=True
-            )
-            for res in results:
-                if isinstance(res, Exception):
-                    logger.warning("Result here:", extra={"err": str(res)})
-                    continue
-                plans.extend(res)
+    monitor = LoopMonitor(settings.LOOP_LAG_INTERVAL_MS, settings.LOOP_SLOW_CALLBACK_MS)
+    pipeline = Pipeline(
+        settings, strategies, executor, guard,
+        stats={
+            "loop_lag": monitor.summary,
+            "quote_cache": quoter.cache.stats,
+            "fanout": fanout.stats,
+            "ratelimit": http.limiter_stats,
+        },
+    )
+    discovery.listeners.append(pipeline.request_scan)
 
-            # Summarize compactly
-            total = len(plans)
-            best = max((p.expected_pnl_usd for p in plans), default=0.0)
-            logger.info("Result here:", extra={"plans": total, "best_exp_pnl": round(best, 6)})
+    phases: dict[str, float] = {}
+    REGISTRY.gauge_fn(
+        "solbot_startup_seconds", "Time spent in each startup phase",
+        lambda: [({"phase": k}, v) for k, v in phases.items()],
+    )
+    if started_at is not None:
+        phases["imports"] = time.perf_counter() - started_at
+    t0 = time.perf_counter()
 
-            plans.sort(key=lambda p: p.expected_pnl_usd, reverse=True)
+    monitor.start()
+    profiling.MONITOR = monitor
+    api_task = asyncio.create_task(serve_api(settings)) if settings.API_ENABLED else None
+    shards = None
+    try:
+        if sharded:
+            # Spawning and importing in the shards overlaps with our own warm-up.
+            shards = ScanShards(settings, pipeline, discovery, chain)
+            shards.start()
 
-            for plan in plans:
-                if plan.expected_pnl_usd < settings.MIN_PROFIT_USD:
-                    continue
-                # In dry mode, this will not send; report profit
-                logger.info("Made profit:", extra={"profit_amount": round(plan.expected_pnl_usd, 6)})
-                ok = await executor.try_execute(plan)
-                if ok:
-                    guard.add_pnl(plan.expected_pnl_usd)
-                    break
+        async def probe_rpc() -> None:
+            await rpc_pool.probe()
+            rpc_pool.start()
+            chain.start()
+            if mirror is not None:
+                mirror.start()
 
-            dt = (time.perf_counter() - t0) * 1000
-            await asyncio.sleep(max(0.05, (settings.SCAN_INTERVAL_MS - dt) / 1000))
-            failures = 0
-        except Exception as e:  # noqa: BLE001
-            failures += 1
-            logger.exception("Result here:", extra={"failures": failures, "err": str(e)})
-            if failures >= settings.PAUSE_AFTER_FAILS:
-                logger.error("pausing after repeated failures")
-                await asyncio.sleep(5)
-                failures = 0
+        # Independent warm-up steps run concurrently; the first scan waits for all.
+        await asyncio.gather(
+            _timed(phases, "http_warm", http.warm([
+                settings.JUP_ORDER_BASE,
+                settings.JUP_EXECUTE_BASE,
+                *settings.RPC_HTTPS,
+                *([r.url for r in executor.jito.regions] if executor.jito else []),
+            ])),
+            _timed(phases, "rpc_probe", probe_rpc()),
+            _timed(phases, "discovery", discovery.refresh()),
+            _timed(phases, "signer", executor.prepare()),
+        )
+        tracker.start()
+        if recorder is not None:
+            recorder.start()
+        phases["warmup"] = time.perf_counter() - t0
+        logger.info("startup.ready", extra={
+            "total_s": round(time.perf_counter() - (started_at or t0), 3),
+            **{f"{k}_s": round(v, 3) for k, v in phases.items()},
+        })
+        logger.info("Attempt to find:", extra={"pairs": discovery.watch_count})
+        await pipeline.run()
+    finally:
+        if shards is not None:
+            await shards.stop()
+        if api_task is not None:
+            api_task.cancel()
+            await asyncio.gather(api_task, return_exceptions=True)
+        await executor.aclose()
+        if mirror is not None:
+            await mirror.stop()
+        if recorder is not None:
+            await recorder.stop()
+        await tracker.stop()
+        await chain.stop()
+        await discovery.stop()
+        await rpc_pool.stop()
+        await http.aclose()
+        profiling.MONITOR = None
+        await monitor.stop()
+        if isinstance(guard, RiskLedger):
+            guard.close()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from solbot.core.env import Settings
+from solbot.core.logger import logger
+from solbot.fanout import QuoteFanout, QuoteRequest
+from solbot.mints import MINTS
+from solbot.quoter import Quote
+
+
+@dataclass(slots=True)
+class ImpactCurve:
+    """Fitted raw out/in rate of one direction as a function of USD notional.
+
+    rate(q) = coef[0] * q + coef[1], with the slope clamped to <= 0 (a larger
+    trade never gets a better price).
+    """
+
+    coef: np.ndarray
+    sizes: np.ndarray
+    rates: np.ndarray
+    fitted_at: float
+    stale: bool = False
+
+    def rate(self, notional_usd: np.ndarray | float) -> np.ndarray:
+        return np.polyval(self.coef, notional_usd)
+
+
+class SizeLadder:
+    """Price-impact curves per direction, from a geometric ladder of quote sizes.
+
+    `refresh` quotes SIZE_LADDER_STEPS notionals between SIZE_MIN_USD and
+    MAX_NOTIONAL_USD for every direction without a usable curve, all in one
+    fan-out batch, and fits a line through the observed rates. Curves are
+    reused across ticks; `check` compares each executable quote the strategy
+    fetches at its chosen size with the curve and marks the curve for a refit
+    when they differ by more than SIZE_CURVE_DRIFT_BPS. A curve older than
+    SIZE_CURVE_MAX_AGE_MS is refit regardless.
+    """
+
+    def __init__(self, settings: Settings, fanout: QuoteFanout):
+        self.s = settings
+        self.f = fanout
+        self.curves: dict[tuple[int, int], ImpactCurve] = {}
+        self.refits = 0
+        self.drifted = 0
+
+    def sizes(self) -> np.ndarray:
+        hi = max(self.s.MAX_NOTIONAL_USD, self.s.SIZE_MIN_USD)
+        return np.geomspace(self.s.SIZE_MIN_USD, hi, max(2, self.s.SIZE_LADDER_STEPS))
+
+    def grid(self, points: int = 64) -> np.ndarray:
+        """Candidate notionals for optimizing over the fitted curves."""
+        hi = max(self.s.MAX_NOTIONAL_USD, self.s.SIZE_MIN_USD)
+        return np.geomspace(self.s.SIZE_MIN_USD, hi, points)
+
+    def curve(self, src: int, dst: int) -> ImpactCurve | None:
+        return self.curves.get((src, dst))
+
+    def _needs_fit(self, key: tuple[int, int], now: float) -> bool:
+        c = self.curves.get(key)
+        return c is None or c.stale or now - c.fitted_at > self.s.SIZE_CURVE_MAX_AGE_MS / 1000
+
+    async def refresh(self, legs: dict[tuple[int, int], float]) -> int:
+        """Re-ladder directions that need it; `legs` maps (src, dst) -> raw src per USD.
+
+        Returns the number of curves fitted.
+        """
+        now = time.monotonic()
+        todo = [key for key in legs if self._needs_fit(key, now)]
+        if not todo:
+            return 0
+        sizes = self.sizes()
+        reqs: dict[QuoteRequest, tuple[tuple[int, int], float]] = {}
+        for key in todo:
+            src, dst = key
+            for q in sizes:
+                amount = int(legs[key] * q)
+                if amount > 0:
+                    req = QuoteRequest(MINTS.address(src), MINTS.address(dst), amount)
+                    reqs[req] = (key, float(q))
+        got = await self.f.quote_many(reqs)
+
+        points: dict[tuple[int, int], list[tuple[float, float]]] = {}
+        for req, (key, q) in reqs.items():
+            quote = got.get(req)
+            if quote is not None and quote.in_amount > 0 and quote.out_amount > 0:
+                points.setdefault(key, []).append((q, quote.out_amount / quote.in_amount))
+        for key, pts in points.items():
+            if len(pts) < 2:
+                continue  # not enough rungs answered; keep the old curve
+            q, r = np.array(pts).T
+            coef = np.polyfit(q, r, 1)
+            coef[0] = min(coef[0], 0.0)
+            if coef[0] == 0.0:
+                coef[1] = r.mean()
+            self.curves[key] = ImpactCurve(coef, q, r, now)
+            self.refits += 1
+        logger.debug("sizing.refit", extra={"directions": len(todo), "fitted": len(points)})
+        return len(points)
+
+    def check(self, src: int, dst: int, notional_usd: float, quote: Quote) -> bool:
+        """Compare an executable quote with the curve; returns True if it drifted."""
+        c = self.curves.get((src, dst))
+        if c is None or quote.in_amount <= 0:
+            return False
+        predicted = float(c.rate(notional_usd))
+        actual = quote.out_amount / quote.in_amount
+        if predicted > 0 and abs(actual / predicted - 1.0) * 10_000 <= self.s.SIZE_CURVE_DRIFT_BPS:
+            return False
+        c.stale = True
+        self.drifted += 1
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return {"curves": len(self.curves), "refits": self.refits, "drifted": self.drifted}
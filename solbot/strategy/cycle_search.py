@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from solbot.core.env import Settings
+from solbot.core.logger import logger
+from solbot.discovery import DiscoveryService
+from solbot.execution.jito import MAX_BUNDLE_TXS
+from solbot.fanout import QuoteFanout, QuoteRequest
+from solbot.mints import MINTS, USD_IDS
+from solbot.quoter import TAKER_FEE_BPS, JupiterQuoter, Quote
+from solbot.strategy.models import Leg, Plan
+
+if TYPE_CHECKING:
+    from solbot.amm import PoolMirror
+
+
+class CycleSearch:
+    """Multi-hop cycle search over every mint in the discovery watchlist.
+
+    Keeps a dense matrix of raw out/in rates fed by every quote the quoter sees,
+    and each tick runs a vectorized min-plus search over -log(rate * (1 - fee))
+    for cycles of 2..CYCLE_MAX_HOPS legs. Raw-unit rates are fine here because
+    decimals cancel around a cycle. The best cycles are then quoted leg by
+    leg, each leg sized at the previous leg's output, and their PnL comes
+    from those executable orders; a plan carries every leg (`Plan.legs`),
+    so it only trades through EXECUTION_BACKEND=jito.
+
+    With a PoolMirror, edges it covers are priced locally every tick instead
+    of re-quoted; only the legs of the cycles that become plans are fetched
+    from `/order`.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        discovery: DiscoveryService,
+        quoter: JupiterQuoter,
+        fanout: QuoteFanout | None = None,
+        mirror: PoolMirror | None = None,
+    ):
+        self.s = settings
+        self.d = discovery
+        self.q = quoter
+        self.f = fanout or QuoteFanout(settings, quoter)
+        self.mirror = mirror
+        self.mints: list[int] = []  # matrix row -> mint ID
+        self._index: dict[int, int] = {}
+        self.rates = np.zeros((0, 0))
+        self.updated = np.zeros((0, 0))
+        self.last_search_us = 0.0
+        self.q.listeners.append(self.observe)
+
+    def _sync_mints(self) -> None:
+        mints = list(dict.fromkeys(m for pair in self.d.pairs.pairs() for m in pair))
+        if mints == self.mints:
+            return
+        n = len(mints)
+        rates, updated = np.zeros((n, n)), np.zeros((n, n))
+        keep = [(new, self._index[m]) for new, m in enumerate(mints) if m in self._index]
+        if keep:
+            new_ix, old_ix = map(list, zip(*keep, strict=True))
+            rates[np.ix_(new_ix, new_ix)] = self.rates[np.ix_(old_ix, old_ix)]
+            updated[np.ix_(new_ix, new_ix)] = self.updated[np.ix_(old_ix, old_ix)]
+        self.mints, self._index = mints, {m: i for i, m in enumerate(mints)}
+        self.rates, self.updated = rates, updated
+
+    def observe(self, input_mint: str, output_mint: str, amount: int, quote: Quote) -> None:
+        a, b = MINTS.id(input_mint), MINTS.id(output_mint)
+        if a is None or b is None:
+            return
+        i, j = self._index.get(a), self._index.get(b)
+        if i is None or j is None:
+            return
+        if quote.in_amount <= 0 or quote.out_amount <= 0:
+            return
+        self.rates[i, j] = quote.out_amount / quote.in_amount
+        self.updated[i, j] = time.monotonic()
+
+    def _amount_for(self, i: int, notional_usd: float) -> int | None:
+        """Raw amount of mint i worth ~notional_usd, valued through a USD mint."""
+        if self.mints[i] in USD_IDS:
+            return MINTS.to_raw(self.mints[i], notional_usd)
+        for usd in USD_IDS:
+            u = self._index.get(usd)
+            if u is not None and self.rates[u, i] > 0:
+                return int(MINTS.to_raw(usd, notional_usd) * self.rates[u, i])
+        return None
+
+    def _local(self) -> PoolMirror | None:
+        return self.mirror if self.mirror is not None and self.mirror.ready else None
+
+    def _observe_local(self, mirror: PoolMirror, notional_usd: float) -> None:
+        """Rates for every watchlist edge the pool mirror covers, in one batch."""
+        edges = [
+            (i, j) for base, quote in self.d.pairs.pairs()
+            for i, j in ((self._index[base], self._index[quote]),
+                         (self._index[quote], self._index[base]))
+        ]
+        if not edges:
+            return
+        src, dst = (np.array(e) for e in zip(*edges, strict=True))
+        mints = np.array(self.mints)
+        amounts = np.array([self._amount_for(int(i), notional_usd) or 0 for i in src], dtype=float)
+        out = mirror.quote_many(mints[src], mints[dst], amounts)
+        ok = np.isfinite(out) & (amounts > 0) & (out > 0)
+        self.rates[src[ok], dst[ok]] = out[ok] / amounts[ok]
+        self.updated[src[ok], dst[ok]] = time.monotonic()
+
+    def _stale_edges(self, notional_usd: float) -> list[QuoteRequest]:
+        max_age = self.s.CYCLE_EDGE_MAX_AGE_MS / 1000
+        now = time.monotonic()
+        mirror = self._local()
+        edges: list[tuple[float, QuoteRequest]] = []
+        for base, quote in self.d.pairs.pairs():
+            a, b = self._index[base], self._index[quote]
+            for i, j in ((a, b), (b, a)):
+                age = now - self.updated[i, j]
+                if age <= max_age:
+                    continue
+                if mirror is not None and mirror.has(self.mints[i], self.mints[j]):
+                    continue  # priced locally
+                amount = self._amount_for(i, notional_usd)
+                if amount:
+                    src, dst = MINTS.address(self.mints[i]), MINTS.address(self.mints[j])
+                    edges.append((age, QuoteRequest(src, dst, amount)))
+        edges.sort(key=lambda e: e[0], reverse=True)
+        return [r for _, r in edges[: self.s.CYCLE_REQUOTE_BUDGET]]
+
+    def find_cycles(self) -> list[tuple[float, list[int]]]:
+        """Return (log_gain, [i, j, ..., i]) for profitable simple cycles, best first."""
+        n = len(self.mints)
+        if n < 2:
+            return []
+        fee = 1.0 - TAKER_FEE_BPS / 10_000
+        with np.errstate(divide="ignore"):
+            w = -np.log(self.rates * fee)  # 0 rate -> +inf (no edge)
+        np.fill_diagonal(w, np.inf)
+
+        found: dict[tuple[int, ...], float] = {}
+        dist, preds = w, []
+        for _ in range(2, self.s.CYCLE_MAX_HOPS + 1):
+            # min-plus product: dist[i, k] = min_j dist[i, j] + w[j, k]
+            cand = dist[:, :, None] + w[None, :, :]
+            preds.append(cand.argmin(axis=1))
+            dist = cand.min(axis=1)
+            for i in np.flatnonzero(np.diagonal(dist) < 0):
+                path = [int(i)]
+                k = int(i)
+                for p in reversed(preds):
+                    k = int(p[i, k])
+                    path.append(k)
+                path.append(int(i))
+                path.reverse()
+                cycle = path[:-1]
+                if len(set(cycle)) != len(cycle):
+                    continue  # non-simple walk; its simple sub-cycle shows up at fewer hops
+                # Canonical rotation so the same cycle found from each node is kept once.
+                r = cycle.index(min(cycle))
+                key = tuple(cycle[r:] + cycle[:r])
+                found[key] = -float(dist[i, i])
+        return sorted(
+            ((gain, list(key) + [key[0]]) for key, gain in found.items()), reverse=True
+        )
+
+    async def propose_plans(self) -> list[Plan]:
+        self._sync_mints()
+        notional_usd = min(self.s.MAX_NOTIONAL_USD, 50)
+        mirror = self._local()
+        if mirror is not None:
+            self._observe_local(mirror, notional_usd)
+        stale = self._stale_edges(notional_usd)
+        if stale:
+            await self.f.quote_many(stale)  # results arrive through `observe`
+
+        t0 = time.perf_counter()
+        cycles = self.find_cycles()
+        self.last_search_us = (time.perf_counter() - t0) * 1e6
+        logger.debug("cycle.search", extra={
+            "mints": len(self.mints), "cycles": len(cycles), "us": round(self.last_search_us, 1)
+        })
+
+        # Each leg is a transaction and the bundle needs one more for the tip.
+        max_legs = MAX_BUNDLE_TXS - 1
+        cycles = [c for c in cycles if len(c[1]) - 1 <= max_legs][: self.s.CYCLE_MAX_PLANS]
+        chains, picked = [], []
+        for _, path in cycles:
+            amount = self._amount_for(path[0], notional_usd)
+            if not amount:
+                continue
+            addrs = [MINTS.address(self.mints[i]) for i in path]
+            chains.append((QuoteRequest(addrs[0], addrs[1], amount), addrs[2:]))
+            picked.append(path)
+        quoted = await self.f.quote_chains(chains) if chains else []
+
+        plans: list[Plan] = []
+        keep = 1.0 - TAKER_FEE_BPS / 10_000
+        priority = self.q.fee() / 1_000_000_000 * 25  # the fee the orders carry
+        for path, legs in zip(picked, quoted, strict=True):
+            if legs is None:
+                continue
+            (first, first_quote), (_, last_quote) = legs[0], legs[-1]
+            n = len(legs)
+            gain = last_quote.out_amount / first.amount * keep**n
+            est_pnl = notional_usd * (gain - 1) - priority * n
+            plans.append(Plan(
+                input_mint=first.input_mint,
+                output_mint=first.output_mint,
+                input_amount=first.amount,
+                quote_response=first_quote,
+                notional_usd=notional_usd,
+                expected_pnl_usd=est_pnl,
+                max_slippage_bps=self.s.SLIPPAGE_BPS_PER_LEG * n,
+                notes="cycle: " + ">".join(MINTS.symbols[self.mints[i]] for i in path),
+                legs=tuple(Leg(r.input_mint, r.output_mint, r.amount, q) for r, q in legs),
+            ))
+        return plans
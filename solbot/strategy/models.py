@@ -1,13 +1,33 @@
 from __future__ import annotations
-from pydantic import BaseModel
-from typing import Any
+import time
+from dataclasses import dataclass, field
+from solbot.quoter import Quote
 
-class Plan(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Leg:
+    input_mint: str
+    output_mint: str
+    amount: int
+    quote: Quote  # this leg's own single-use order
+
+# Mints are base58 addresses, not MINTS IDs: plans cross process pipes
+# (SCAN_SHARDS) and IDs are only meaningful in the process that interned them.
+@dataclass(slots=True)
+class Plan:
     input_mint: str
     output_mint: str
     input_amount: int
-    quote_response: dict[str, Any]  # Full Jupiter quote response with routePlan
+    quote_response: Quote  # Jupiter order response; raw bytes, parsed lazily
     notional_usd: float
     expected_pnl_usd: float
     max_slippage_bps: int
     notes: str | None = None
+    created_at: float = field(default_factory=time.monotonic)
+    # Multi-leg plans: every swap in order, the first one being the fields above.
+    # The PnL needs all of them to land, so they only execute as one Jito bundle.
+    legs: tuple[Leg, ...] = ()
+
+    def all_legs(self) -> tuple[Leg, ...]:
+        return self.legs or (
+            Leg(self.input_mint, self.output_mint, self.input_amount, self.quote_response),
+        )
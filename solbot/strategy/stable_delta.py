@@ -1,15 +1,215 @@
 from __future__ import annotations
-from typing import List
+import time
+from typing import TYPE_CHECKING, List
+import numpy as np
 from solbot.core.env import Settings
 from solbot.discovery import DiscoveryService
-from solbot.quoter import JupiterQuoter
+from solbot.fanout import QuoteFanout, QuoteRequest
+from solbot.mints import (
+    FWD, JITOSOL_ID, MINTS, MSOL_ID, REV, SOL_ID, USD_IDS, USDC_ID, USDT_ID, PairIndex,
+)
+from solbot.quoter import TAKER_FEE_BPS, JupiterQuoter, Quote
 from solbot.strategy.models import Plan
 
+if TYPE_CHECKING:
+    from solbot.amm import PoolMirror
+
+# mint ID -> peg group; pairs are only formed within a group
+STABLE_GROUPS = {
+    USDC_ID: "usd",
+    USDT_ID: "usd",
+    SOL_ID: "sol",
+    MSOL_ID: "sol",
+    JITOSOL_ID: "sol",
+}
+
+
 class StableDelta:
-    def __init__(self, settings: Settings, discovery: DiscoveryService, quoter: JupiterQuoter):
+    """Incremental depeg scanner over stablecoin and LST pairs in the watchlist.
+
+    Rates live in arrays indexed by (pair, direction). Quotes arrive through
+    the quoter listener hook and only mark a pair dirty when its rate moved;
+    each tick re-quotes directions older than STABLE_REQUOTE_MS and evaluates
+    dirty pairs only. USD stables peg at 1.0; LST/SOL pairs peg to a slow
+    EWMA of their mid rate since LSTs accrue against SOL.
+
+    With a PoolMirror, directions it covers are priced locally every tick
+    instead of re-quoted; only directions that screen as profitable get an
+    `/order` quote, and a plan is kept only if that quote still clears
+    MIN_PROFIT_USD.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        discovery: DiscoveryService,
+        quoter: JupiterQuoter,
+        fanout: QuoteFanout | None = None,
+        mirror: PoolMirror | None = None,
+    ):
         self.s = settings
         self.d = discovery
         self.q = quoter
+        self.f = fanout or QuoteFanout(settings, quoter)
+        self.mirror = mirror
+        self.index = PairIndex()
+        self.peg = np.zeros(0)
+        self.fixed_peg = np.zeros(0, dtype=bool)
+        self.dirty = np.zeros(0, dtype=bool)
+        self.quotes: list[list[Quote | None]] = []
+        self.sol_usd = 0.0
+        self.q.listeners.append(self.observe)
+
+    def _sync_pairs(self) -> None:
+        pairs = []
+        for b, q in self.d.pairs.pairs():
+            if b in STABLE_GROUPS and STABLE_GROUPS[b] == STABLE_GROUPS.get(q):
+                pairs.append((b, q))
+        if not self.index.sync(pairs):
+            return
+        n = len(pairs)
+        self.fixed_peg = np.array([STABLE_GROUPS[b] == "usd" for b, _ in pairs], dtype=bool)
+        self.peg = np.where(self.fixed_peg, 1.0, 0.0)
+        self.dirty = np.all(self.index.rate > 0, axis=1)
+        self.quotes = [[None, None] for _ in range(n)]
+
+    def observe(self, input_mint: str, output_mint: str, amount: int, quote: Quote) -> None:
+        src, dst = MINTS.id(input_mint), MINTS.id(output_mint)
+        if src is None or dst is None:
+            return
+        in_raw, out_raw = float(quote.in_amount), float(quote.out_amount)
+        if src in USD_IDS and dst == SOL_ID and in_raw > 0 and out_raw > 0:
+            self.sol_usd = MINTS.to_ui(src, in_raw) / MINTS.to_ui(dst, out_raw)
+        seen = self.index.observe(src, dst, in_raw, out_raw)
+        if seen is None:
+            return
+        i, side, moved = seen
+        if moved:
+            self.dirty[i] = True
+        self.quotes[i][side] = quote
+
+    def _amount(self, mint: int, notional_usd: float) -> int | None:
+        if STABLE_GROUPS[mint] == "usd":
+            return MINTS.to_raw(mint, notional_usd)
+        if self.sol_usd <= 0:
+            return None
+        # LSTs are within a few % of SOL; good enough for sizing a quote.
+        return MINTS.to_raw(mint, notional_usd / self.sol_usd)
+
+    def _notional(self, mint: int, raw: int) -> float:
+        """USD value of `raw` units of `mint`; the inverse of `_amount`."""
+        ui = MINTS.to_ui(mint, raw)
+        return ui if STABLE_GROUPS[mint] == "usd" else ui * self.sol_usd
+
+    def _local(self) -> PoolMirror | None:
+        return self.mirror if self.mirror is not None and self.mirror.ready else None
+
+    def _observe_local(self, mirror: PoolMirror, notional_usd: float) -> None:
+        """Price every pair in both directions from the pool mirror in one batch."""
+        ix = self.index
+        n = len(ix)
+        rows = np.tile(np.arange(n), 2)
+        sides = np.repeat(np.array([FWD, REV]), n)
+        src = np.concatenate([ix.base, ix.quote])
+        dst = np.concatenate([ix.quote, ix.base])
+        amounts = np.array([self._amount(int(m), notional_usd) or 0 for m in src], dtype=float)
+        out = mirror.quote_many(src, dst, amounts)
+        ok = np.isfinite(out)
+        moved = ix.observe_many(rows[ok], sides[ok], amounts[ok], out[ok])
+        self.dirty[rows[ok][moved]] = True
+
+    def _requote(self, notional_usd: float) -> list[QuoteRequest]:
+        ix = self.index
+        mirror = self._local()
+        stale = np.argwhere(time.monotonic() - ix.updated > self.s.STABLE_REQUOTE_MS / 1000)
+        reqs = []
+        for i, side in stale:
+            a, b = int(ix.base[i]), int(ix.quote[i])
+            src, dst = (a, b) if side == FWD else (b, a)
+            if mirror is not None and mirror.has(src, dst):
+                continue  # priced locally
+            amount = self._amount(src, notional_usd)
+            if amount:
+                reqs.append(QuoteRequest(MINTS.address(src), MINTS.address(dst), amount))
+        return reqs
 
     async def propose_plans(self) -> List[Plan]:
-        return []
+        self._sync_pairs()
+        if not len(self.index):
+            return []
+        notional_usd = min(self.s.MAX_NOTIONAL_USD, 50)
+        mirror = self._local()
+        if mirror is not None:
+            self._observe_local(mirror, notional_usd)
+        reqs = self._requote(notional_usd)
+        if reqs:
+            await self.f.quote_many(reqs)  # results arrive through `observe`
+
+        ix = self.index
+        idx = np.flatnonzero(self.dirty & (ix.rate > 0).all(axis=1))
+        if idx.size == 0:
+            return []
+        self.dirty[idx] = False
+
+        fwd, rev = ix.rate[idx, FWD], ix.rate[idx, REV]
+        mid = np.sqrt(fwd / rev)
+        floating = ~self.fixed_peg[idx]
+        peg = self.peg[idx]
+        peg = np.where(floating & (peg == 0), mid, peg)  # first observation seeds the peg
+
+        keep = 1.0 - TAKER_FEE_BPS / 10_000
+        priority = self.q.fee() / 1_000_000_000 * 25  # the fee the orders carry
+        pnl = np.stack([
+            notional_usd * (fwd * keep / peg - 1.0),
+            notional_usd * (rev * keep * peg - 1.0),
+        ], axis=1) - priority
+
+        alpha = self.s.STABLE_PEG_ALPHA
+        self.peg[idx] = np.where(floating, peg + alpha * (mid - peg), peg)
+
+        hits = np.argwhere(pnl >= self.s.MIN_PROFIT_USD)
+        if mirror is not None and hits.size:
+            # Screened on local prices: fetch executable quotes for the winners only.
+            confirm = {}
+            for k, side in hits:
+                i = int(idx[k])
+                a, b = int(ix.base[i]), int(ix.quote[i])
+                src, dst = (a, b) if side == FWD else (b, a)
+                amount = self._amount(src, notional_usd)
+                if amount and mirror.has(src, dst):
+                    self.quotes[i][side] = None
+                    req = QuoteRequest(MINTS.address(src), MINTS.address(dst), amount)
+                    confirm[req] = (i, int(side))
+            got = await self.f.quote_many(confirm)
+            for req, (i, side) in confirm.items():
+                quote = got.get(req)
+                if quote is not None:
+                    self.quotes[i][side] = quote
+
+        plans: list[Plan] = []
+        for k, side in np.argwhere(pnl >= self.s.MIN_PROFIT_USD):
+            i = int(idx[k])
+            quote = self.quotes[i][side]
+            if not quote or quote.in_amount <= 0 or quote.out_amount <= 0:
+                continue
+            a, b = int(ix.base[i]), int(ix.quote[i])
+            src, dst = (a, b) if side == FWD else (b, a)
+            # The stored quote may be any size seen on this pair (another
+            # strategy's, or the last re-quote), so size the plan by it.
+            notional = self._notional(src, quote.in_amount)
+            rate = MINTS.to_ui(dst, quote.out_amount) / MINTS.to_ui(src, quote.in_amount)
+            gain = rate * keep / peg[k] if side == FWD else rate * keep * peg[k]
+            expected = notional * (gain - 1.0) - priority
+            if not 0 < notional <= self.s.MAX_NOTIONAL_USD or expected < self.s.MIN_PROFIT_USD:
+                continue
+            plans.append(Plan(
+                input_mint=MINTS.address(src),
+                output_mint=MINTS.address(dst),
+                input_amount=quote.in_amount,
+                quote_response=quote,
+                notional_usd=notional,
+                expected_pnl_usd=float(expected),
+                max_slippage_bps=self.s.SLIPPAGE_BPS_PER_LEG,
+                notes=f"depeg: {MINTS.symbols[src]}>{MINTS.symbols[dst]}",
+            ))
+        return plans
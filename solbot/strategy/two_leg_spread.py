@@ -1,45 +1,102 @@
 from __future__ import annotations
 from typing import List
+import numpy as np
 from solbot.core.env import Settings
 from solbot.discovery import DiscoveryService
-from solbot.quoter import JupiterQuoter
-from solbot.strategy.models import Plan
+from solbot.fanout import QuoteFanout, QuoteRequest
+from solbot.mints import MINTS, SOL, SOL_ID, USD_IDS, USDC, USDT
+from solbot.quoter import TAKER_FEE_BPS, JupiterQuoter
+from solbot.sizing import SizeLadder
+from solbot.strategy.models import Leg, Plan
 
-USD_MINTS = {"USDC": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", "USDT": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"}
-SOL_MINT = "So11111111111111111111111111111111111111112"
+USD_MINTS = {"USDC": USDC, "USDT": USDT}
+SOL_MINT = SOL
 
 class TwoLegSpread:
-    def __init__(self, settings: Settings, discovery: DiscoveryService, quoter: JupiterQuoter):
+    """USD -> SOL -> other USD round trips, sized on fitted price-impact curves.
+
+    Each leg's rate-vs-notional curve comes from a SizeLadder. Every tick the
+    round-trip PnL is maximized over notionals up to MAX_NOTIONAL_USD on those
+    curves, then the first leg is quoted at the chosen size and the second at
+    the first leg's output; the plan's PnL comes from those executable quotes,
+    which also tell the ladder whether a curve has drifted and needs refitting.
+    The plan carries both legs (`Plan.legs`), so it only trades through
+    EXECUTION_BACKEND=jito.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        discovery: DiscoveryService,
+        quoter: JupiterQuoter,
+        fanout: QuoteFanout | None = None,
+    ):
         self.s = settings
         self.d = discovery
         self.q = quoter
+        self.f = fanout or QuoteFanout(settings, quoter)
+        self.ladder = SizeLadder(settings, self.f)
+        self.routes = [(a, b) for a in USD_IDS for b in USD_IDS if a != b]
+
+    def _sol_per_usd(self) -> float:
+        """Raw SOL per USD, from a fitted USD->SOL curve or else the discovery mid."""
+        for usd in USD_IDS:
+            c = self.ladder.curve(usd, SOL_ID)
+            if c is not None:
+                return float(c.rate(self.s.SIZE_MIN_USD)) * MINTS.scale(usd)
+        price = self.d.pairs.price(SOL_ID, USD_IDS[0])
+        return MINTS.scale(SOL_ID) / price if price > 0 else 0.0
 
     async def propose_plans(self) -> List[Plan]:
+        legs = {(usd, SOL_ID): float(MINTS.scale(usd)) for usd in USD_IDS}
+        sol_per_usd = self._sol_per_usd()
+        if sol_per_usd > 0:
+            legs.update({(SOL_ID, usd): sol_per_usd for usd in USD_IDS})
+        await self.ladder.refresh(legs)
+
+        keep = 1.0 - TAKER_FEE_BPS / 10_000
+        priority = self.q.fee() / 1_000_000_000 * 25  # the fee the orders carry
+        grid = self.ladder.grid()
+
+        # Best size per route on the curves, then executable quotes for both legs,
+        # the second at the first leg's quoted output.
+        chosen: dict[tuple[int, int], float] = {}
+        chains: list[tuple[QuoteRequest, list[str]]] = []
+        for usd_in, usd_out in self.routes:
+            c1, c2 = self.ladder.curve(usd_in, SOL_ID), self.ladder.curve(SOL_ID, usd_out)
+            if c1 is None or c2 is None:
+                continue
+            sol_raw = grid * MINTS.scale(usd_in) * c1.rate(grid)
+            out_usd = sol_raw * c2.rate(grid) / MINTS.scale(usd_out)
+            pnl = out_usd * keep * keep - grid - 2 * priority
+            q = float(grid[int(np.argmax(pnl))])
+            chosen[(usd_in, usd_out)] = q
+            chains.append((
+                QuoteRequest(MINTS.address(usd_in), SOL_MINT, MINTS.to_raw(usd_in, q)),
+                [MINTS.address(usd_out)],
+            ))
+        quoted = await self.f.quote_chains(chains) if chains else []
+
         plans: List[Plan] = []
-        notional_usd = min(self.s.MAX_NOTIONAL_USD, 50)
-        amount = int(notional_usd * 1_000_000)  # assume USDC 6dp
-        
-        # scan SOL<>USD pairs as a simple baseline
-        for usd_mint in USD_MINTS.values():
-            quote = await self.q.get_quote(usd_mint, SOL_MINT, amount)
-            if not quote:
+        for ((usd_in, usd_out), q), legs in zip(chosen.items(), quoted, strict=True):
+            if legs is None:
                 continue
-                
-            # Extract data from quote response
-            in_amt = float(quote.get("inAmount", 0)) / 1_000_000
-            out_amt = float(quote.get("outAmount", 0)) / 1_000_000
-            gross = out_amt - in_amt
-            fees = in_amt * (30/10_000)  # Taker fee
-            priority = self.s.PRIORITY_FEE_MICRO_LAMPORTS / 1_000_000_000 * 25
-            est_pnl = gross - fees - priority
-            
+            (r1, first), (r2, second) = legs
+            self.ladder.check(usd_in, SOL_ID, q, first)
+            self.ladder.check(SOL_ID, usd_out, q, second)
+            est_pnl = MINTS.to_ui(usd_out, second.out_amount) * keep * keep - q - 2 * priority
+
             plans.append(Plan(
-                input_mint=usd_mint,
+                input_mint=r1.input_mint,
                 output_mint=SOL_MINT,
-                input_amount=amount,
-                quote_response=quote,
-                notional_usd=notional_usd,
+                input_amount=r1.amount,
+                quote_response=first,
+                notional_usd=q,
                 expected_pnl_usd=est_pnl,
-                max_slippage_bps=self.s.SLIPPAGE_BPS_PER_LEG*2
+                max_slippage_bps=self.s.SLIPPAGE_BPS_PER_LEG*2,
+                notes=f"spread: {MINTS.symbols[usd_in]}>SOL>{MINTS.symbols[usd_out]} "
+                      f"${q:.2f}",
+                legs=(Leg(r1.input_mint, SOL_MINT, r1.amount, first),
+                      Leg(SOL_MINT, r2.output_mint, r2.amount, second)),
             ))
         return plans
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from solbot.core.env import Settings
+from solbot.core.http import HttpPool
+from solbot.core.logger import logger
+from solbot.core.ratelimit import LANE_DISCOVERY
+
+# tokens.bin: 12-byte header, then fixed-width records so a warm start reads
+# the whole table with one np.frombuffer over an mmap instead of parsing JSON.
+# The records are then unpacked into the `tokens` dict, which refreshes patch
+# in place and lookups (`by_symbols`, `decimals`) use.
+MAGIC = b"SBTK"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxI")  # magic, version, record count
+RECORD = np.dtype([("address", "S44"), ("symbol", "S16"), ("decimals", "u1")])
+
+Token = tuple[str, str, int]  # (address, symbol, decimals)
+
+
+class TokenRegistry:
+    """On-disk Jupiter token list with conditional revalidation.
+
+    `load()` maps the local cache for a millisecond warm start. `refresh()`
+    revalidates with If-None-Match / If-Modified-Since, applies the
+    added/removed/changed diff to the in-memory table and rewrites the cache.
+    `start()` repeats the refresh every TOKEN_REFRESH_S in the background;
+    parsing and disk IO run in a worker thread to keep the loop free.
+    """
+
+    def __init__(self, settings: Settings, sources: Iterable[str], http: HttpPool | None = None):
+        self.s = settings
+        self.sources = list(sources)
+        self.http = http or HttpPool(settings)
+        self.dir = Path(os.path.expanduser(settings.TOKEN_CACHE_DIR))
+        self.path = self.dir / "tokens.bin"
+        self.meta_path = self.dir / "tokens.meta.json"
+        self.meta: dict[str, Any] = {}
+        self.tokens: dict[str, tuple[str, int]] = {}
+        self.listeners: list[Callable[[], None]] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def load(self) -> bool:
+        """Load the on-disk cache; returns False when there is none."""
+        try:
+            self.meta = json.loads(self.meta_path.read_text())
+            with open(self.path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, count = HEADER.unpack_from(mm, 0)
+                if magic != MAGIC or version != VERSION:
+                    return False
+                recs = np.frombuffer(mm, dtype=RECORD, count=count, offset=HEADER.size).copy()
+        except (OSError, ValueError, struct.error):
+            return False
+        self.tokens = {
+            a.decode(): (s.decode(errors="replace"), int(d))
+            for a, s, d in zip(recs["address"], recs["symbol"], recs["decimals"], strict=True)
+        }
+        logger.info("tokens.cache_loaded", extra={"tokens": len(self.tokens)})
+        return True
+
+    def by_symbols(self, symbols: set[str]) -> list[Token]:
+        return [(a, s, d) for a, (s, d) in self.tokens.items() if s in symbols]
+
+    def decimals(self, address: str) -> int | None:
+        tok = self.tokens.get(address)
+        return tok[1] if tok else None
+
+    async def refresh(self) -> bool:
+        """Revalidate against the first reachable source; True if the table changed."""
+        for url in self.sources:
+            headers = {}
+            if self.meta.get("source") == url and self.tokens:
+                if self.meta.get("etag"):
+                    headers["If-None-Match"] = self.meta["etag"]
+                if self.meta.get("last_modified"):
+                    headers["If-Modified-Since"] = self.meta["last_modified"]
+            try:
+                limiter = self.http.limiter(url)
+                await limiter.acquire(LANE_DISCOVERY)
+                r = await self.http.client(url).get(url, headers=headers, timeout=10)
+                limiter.observe(r.status_code, r.headers)
+                if r.status_code == 304:
+                    self.meta["checked_at"] = time.time()
+                    await asyncio.to_thread(self._write_meta, dict(self.meta))
+                    logger.info("tokens.not_modified", extra={"source": url})
+                    return False
+                r.raise_for_status()
+                meta = {
+                    "source": url,
+                    "etag": r.headers.get("etag"),
+                    "last_modified": r.headers.get("last-modified"),
+                    "checked_at": time.time(),
+                }
+                fresh = await asyncio.to_thread(self._parse_and_store, r.content, meta)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("token source failed", extra={"url": url, "err": str(e)})
+                continue
+            self.meta = meta
+            changed = self._apply(fresh, url)
+            if changed:
+                for cb in self.listeners:
+                    cb()
+            return changed
+        return False
+
+    def _parse_and_store(self, body: bytes, meta: dict[str, Any]) -> dict[str, tuple[str, int]]:
+        """Worker thread: parse the list and rewrite the on-disk cache."""
+        fresh: dict[str, tuple[str, int]] = {}
+        for t in json.loads(body):
+            addr = t.get("address")
+            if addr and len(addr) <= 44:
+                fresh[addr] = (str(t.get("symbol") or "")[:16], int(t.get("decimals") or 0))
+        self._write(fresh)
+        self._write_meta(meta)
+        return fresh
+
+    def _apply(self, fresh: dict[str, tuple[str, int]], source: str) -> bool:
+        """Event loop: apply only the added/removed/updated entries."""
+        added = fresh.keys() - self.tokens.keys()
+        removed = self.tokens.keys() - fresh.keys()
+        updated = {a for a in fresh.keys() & self.tokens.keys() if fresh[a] != self.tokens[a]}
+        for a in removed:
+            del self.tokens[a]
+        for a in fresh:  # keep the source's ordering for new entries
+            if a in added or a in updated:
+                self.tokens[a] = fresh[a]
+        logger.info("tokens.diff", extra={
+            "source": source, "added": len(added), "removed": len(removed),
+            "updated": len(updated), "total": len(self.tokens),
+        })
+        return bool(added or removed or updated)
+
+    def _write(self, tokens: dict[str, tuple[str, int]]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        recs = np.empty(len(tokens), dtype=RECORD)
+        for i, (a, (s, d)) in enumerate(tokens.items()):
+            recs[i] = (a.encode(), s.encode()[:16], d)
+        self._replace(self.path, HEADER.pack(MAGIC, VERSION, len(recs)) + recs.tobytes())
+
+    def _write_meta(self, meta: dict[str, Any]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._replace(self.meta_path, json.dumps(meta).encode())
+
+    def _replace(self, path: Path, data: bytes) -> None:
+        """Atomically swap `path` for `data`; the temp name is unique, so several
+        processes sharing TOKEN_CACHE_DIR never truncate each other's file."""
+        with tempfile.NamedTemporaryFile(dir=self.dir, prefix=path.name, delete=False) as f:
+            f.write(data)
+        try:
+            os.replace(f.name, path)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        # Revalidate right away if the cache is older than one refresh period.
+        age = time.time() - float(self.meta.get("checked_at") or 0)
+        delay = max(0.0, self.s.TOKEN_REFRESH_S - age)
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("tokens.refresh_failed", extra={"err": str(e)})
+            delay = self.s.TOKEN_REFRESH_S
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+from solbot.mints import MINTS, SOL, SOL_ID, USD_IDS, USDC_ID
+
+if TYPE_CHECKING:
+    from solbot.core.chain_state import ChainState
+    from solbot.core.rpc import RpcPool
+    from solbot.mints import PairIndex
+    from solbot.risk.daily_guard import DailyLossGuard
+    from solbot.risk.ledger import RiskLedger
+    from solbot.strategy.models import Plan
+
+CONFIRM_LATENCY = REGISTRY.histogram(
+    "solbot_confirm_latency_seconds", "Submit to confirmed status for landed transactions"
+)
+CONFIRM_OUTCOME = REGISTRY.counter(
+    "solbot_confirm_total", "Tracked transactions by outcome", ["outcome"]
+)
+REALIZED_PNL = REGISTRY.counter(
+    "solbot_realized_pnl_usd_total", "Realized PnL of resolved transactions (can decrease)"
+)
+
+# getSignatureStatuses accepts at most this many signatures per call.
+MAX_STATUS_BATCH = 256
+
+
+@dataclass(slots=True)
+class Pending:
+    signature: str
+    plan: Plan
+    expires_at_height: int  # 0 = unknown, fall back to CONFIRM_TIMEOUT_S
+    bundle: tuple[str, ...] = ()  # every transaction of a Jito bundle, tip included
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class ConfirmationTracker:
+    """Confirms submitted transactions in batches and books realized PnL.
+
+    `track()` only records the signature. A background loop polls every
+    outstanding signature with one `getSignatureStatuses` call per
+    CONFIRM_POLL_MS (chunked at 256), so N pending transactions cost one
+    round trip per interval. Landed transactions are fetched once with
+    `getTransaction` and the owner's actual balance changes, fees included,
+    are the realized PnL that goes to DailyLossGuard. A transaction whose
+    blockhash validity has passed without a status is expired (no PnL).
+    """
+
+    def __init__(
+        self,
+        settings,
+        rpc_pool: RpcPool,
+        guard: DailyLossGuard | RiskLedger,
+        chain: ChainState | None = None,
+        pairs: PairIndex | None = None,
+    ):
+        self.s = settings
+        self.rpc = rpc_pool
+        self.guard = guard
+        self.chain = chain
+        self.pairs = pairs
+        self.pending: dict[str, Pending] = {}
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self.realized_usd = 0.0
+        REGISTRY.gauge_fn(
+            "solbot_confirm_pending", "Transactions awaiting confirmation",
+            lambda: len(self.pending),
+        )
+
+    def track(
+        self,
+        signature: str,
+        plan: Plan,
+        expires_at_height: int | None = None,
+        bundle: Sequence[str] = (),
+    ) -> None:
+        """Follow `signature`; for a Jito bundle, `bundle` lists all of its transactions.
+
+        Bundles land atomically, so the first transaction's status stands for all.
+        """
+        if expires_at_height is None:
+            # The swap's own blockhash is older than our latest, so this is an upper bound.
+            expires_at_height = self.chain.last_valid_block_height if self.chain else 0
+        self.pending[signature] = Pending(signature, plan, expires_at_height, tuple(bundle))
+        self.guard.add_exposure(plan.output_mint, plan.notional_usd)
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _poll_loop(self) -> None:
+        while True:
+            if not self.pending:
+                self._wake.clear()
+                await self._wake.wait()
+            await asyncio.sleep(self.s.CONFIRM_POLL_MS / 1000)
+            try:
+                await self.poll()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("confirm.poll_failed", extra={"err": str(e)})
+
+    async def poll(self) -> None:
+        sigs = list(self.pending)
+        for i in range(0, len(sigs), MAX_STATUS_BATCH):
+            batch = sigs[i : i + MAX_STATUS_BATCH]
+            res = await self.rpc.call("getSignatureStatuses", [batch])
+            for sig, status in zip(batch, res["value"], strict=False):
+                p = self.pending.get(sig)
+                if p is None:
+                    continue
+                if status is None:
+                    if self._expired(p):
+                        self._resolve(p, "expired", 0.0)
+                    continue
+                if status.get("err") is not None:
+                    fee_usd = await self._fee_usd(sig)
+                    self._resolve(p, "failed", -fee_usd)
+                elif status.get("confirmationStatus") in ("confirmed", "finalized"):
+                    CONFIRM_LATENCY.observe(time.monotonic() - p.submitted_at)
+                    self._resolve(p, "landed", await self._realized(p))
+
+    def _expired(self, p: Pending) -> bool:
+        height = self.chain.block_height() if self.chain else 0
+        if p.expires_at_height and height:
+            return height > p.expires_at_height
+        return time.monotonic() - p.submitted_at > self.s.CONFIRM_TIMEOUT_S
+
+    def _resolve(self, p: Pending, outcome: str, pnl_usd: float) -> None:
+        if self.pending.pop(p.signature, None) is not None:
+            self.guard.add_exposure(p.plan.output_mint, -p.plan.notional_usd)
+        CONFIRM_OUTCOME.labels(outcome).inc()
+        if pnl_usd:
+            self.guard.add_pnl(pnl_usd)
+            self.realized_usd += pnl_usd
+            REALIZED_PNL.inc(pnl_usd)
+        logger.info("confirm.resolved", extra={
+            "signature": p.signature[:16] + "...",
+            "outcome": outcome,
+            "expected_pnl": round(p.plan.expected_pnl_usd, 6),
+            "realized_pnl": round(pnl_usd, 6),
+        })
+
+    async def _get_transaction(self, sig: str) -> dict[str, Any] | None:
+        return await self.rpc.call("getTransaction", [
+            sig,
+            {"encoding": "json", "commitment": "confirmed", "maxSupportedTransactionVersion": 0},
+        ])
+
+    def _sol_usd(self) -> float:
+        return self.pairs.price(SOL_ID, USDC_ID) if self.pairs else 0.0
+
+    async def _fee_usd(self, sig: str) -> float:
+        try:
+            tx = await self._get_transaction(sig)
+        except Exception:  # noqa: BLE001
+            return 0.0
+        fee = (tx or {}).get("meta", {}).get("fee", 0)
+        return fee / 1e9 * self._sol_usd()
+
+    async def _realized(self, p: Pending) -> float:
+        """USD value of the owner's balance changes across the plan's transactions.
+
+        Every transaction of a bundle (tip included) is fetched, and the native
+        SOL and token deltas are summed per mint and priced with `_prices`, so
+        fills, fees, tips and account rent all count. Falls back to the
+        expected PnL when a transaction cannot be fetched.
+        """
+        plan = p.plan
+        sigs = p.bundle or (p.signature,)
+        try:
+            txs = await asyncio.gather(*(self._get_transaction(sig) for sig in sigs))
+        except Exception as e:  # noqa: BLE001
+            logger.warning("confirm.fetch_failed", extra={"signature": p.signature, "err": str(e)})
+            return plan.expected_pnl_usd
+        owner = self.s.user_pubkey
+        deltas: dict[str, int] = {}
+        for tx in txs:
+            if not tx or not tx.get("meta"):
+                return plan.expected_pnl_usd
+            meta = tx["meta"]
+            i = _account_index(tx, owner)
+            if i is not None:
+                deltas[SOL] = deltas.get(SOL, 0) + meta["postBalances"][i] - meta["preBalances"][i]
+            for mint, raw in _token_deltas(meta, owner).items():
+                deltas[mint] = deltas.get(mint, 0) + raw
+        prices = self._prices(plan)
+        total = 0.0
+        for mint, raw in deltas.items():
+            if not raw:
+                continue
+            price = prices.get(mint)
+            if price is None:
+                logger.warning("confirm.unpriced", extra={"mint": mint, "delta": raw})
+                continue
+            total += raw * price
+        return total
+
+    def _prices(self, plan: Plan) -> dict[str, float]:
+        """USD per raw unit of SOL and every mint the plan swaps through.
+
+        USD stables count at par and other mints at the discovery mid against
+        USDC. Without a mid, the input is valued at the plan's notional and
+        the other mints through the plan's own quotes.
+        """
+        prices: dict[str, float] = {}
+        legs = plan.all_legs()
+        mints = [SOL]
+        for leg in legs:
+            mints += (leg.input_mint, leg.output_mint)
+        for mint in dict.fromkeys(mints):
+            mid = MINTS.id(mint)
+            if mid is None:
+                continue
+            try:
+                unit = MINTS.to_ui(mid, 1)
+            except KeyError:
+                continue  # decimals unknown
+            usd = 1.0 if mid in USD_IDS else self.pairs.price(mid, USDC_ID) if self.pairs else 0.0
+            if usd > 0:
+                prices[mint] = usd * unit
+        if plan.input_mint not in prices and plan.input_amount > 0:
+            prices[plan.input_mint] = plan.notional_usd / plan.input_amount
+        for leg in legs:
+            src = prices.get(leg.input_mint)
+            if leg.output_mint not in prices and src is not None and leg.quote.out_amount > 0:
+                prices[leg.output_mint] = src * leg.quote.in_amount / leg.quote.out_amount
+        return prices
+
+
+def _account_index(tx: dict[str, Any], owner: str) -> int | None:
+    """Position of `owner` in the transaction's account keys (fee payer if not listed)."""
+    keys = (tx.get("transaction") or {}).get("message", {}).get("accountKeys")
+    if not keys:
+        return 0
+    keys = [k if isinstance(k, str) else k.get("pubkey") for k in keys]
+    return keys.index(owner) if owner in keys else None
+
+
+def _token_deltas(meta: dict[str, Any], owner: str) -> dict[str, int]:
+    """Raw token balance change per mint across `owner`'s token accounts."""
+    out: dict[str, int] = {}
+    for sign, key in ((-1, "preTokenBalances"), (1, "postTokenBalances")):
+        for r in meta.get(key) or []:
+            if r.get("owner") == owner:
+                mint = r["mint"]
+                out[mint] = out.get(mint, 0) + sign * int(r["uiTokenAmount"]["amount"])
+    return out
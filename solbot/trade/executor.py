@@ -1,73 +1,225 @@
 from __future__ import annotations
-import json
+import asyncio
+import time
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 from solbot.core.logger import logger
+from solbot.core.metrics import REGISTRY
+from solbot.execution.jito import MAX_BUNDLE_TXS, JitoRegions
 from solbot.execution.jupiter_swap import JupiterSwap
+from solbot.execution.signer import first_signature
 
 if TYPE_CHECKING:
+    from solbot.core.chain_state import ChainState
+    from solbot.core.http import HttpPool
     from solbot.core.rpc import RpcPool
+    from solbot.quoter import JupiterQuoter
     from solbot.strategy.models import Plan
+    from solbot.trade.confirmations import ConfirmationTracker
+
+EXECUTE_LATENCY = REGISTRY.histogram(
+    "solbot_execute_latency_seconds", "Sign + /execute round trip for live executions"
+)
+EXECUTE_OUTCOME = REGISTRY.counter(
+    "solbot_execute_total", "Execution attempts by outcome", ["outcome"]
+)
+
+# Ultra orders are single-use; remember submitted requestIds at least this long.
+USED_ORDER_TTL_S = 120.0
 
 class Executor:
-    def __init__(self, settings, rpc_pool: RpcPool) -> None:
+    def __init__(
+        self,
+        settings,
+        rpc_pool: RpcPool,
+        http: HttpPool | None = None,
+        chain: ChainState | None = None,
+        tracker: ConfirmationTracker | None = None,
+        quoter: JupiterQuoter | None = None,
+    ) -> None:
         self.settings = settings
         self.rpc_pool = rpc_pool
+        self.chain = chain
+        self.tracker = tracker
+        self.quoter = quoter
+        # requestId -> submit time, oldest first
+        self._used_orders: OrderedDict[str, float] = OrderedDict()
         self.jupiter_swap = JupiterSwap()
-        self.jupiter_swap.init_with_settings(settings)
+        self.jupiter_swap.init_with_settings(settings, http)
+        self.jito = JitoRegions(settings, http) if settings.EXECUTION_BACKEND == "jito" else None
         logger.info("Executor initialized", extra={
             "dry_run": settings.DRY_RUN,
             "paper_trade": settings.PAPER_TRADE,
+            "backend": settings.EXECUTION_BACKEND,
             "user_pubkey": getattr(settings, 'user_pubkey', 'NOT_SET')[:8] + "..." if hasattr(settings, 'user_pubkey') else "NOT_SET",
             "api_key_set": bool(getattr(settings, 'JUP_API_KEY', ''))
         })
 
+    async def prepare(self) -> None:
+        """Load the keypair (and solders) off the loop before the first live execution."""
+        if self.settings.DRY_RUN or self.settings.PAPER_TRADE:
+            return
+        try:
+            await asyncio.to_thread(self._load_signing)
+        except Exception as e:  # noqa: BLE001
+            logger.error("signer.load_failed", extra={"err": str(e)})
+
+    def _load_signing(self) -> None:
+        _ = self.jupiter_swap.signer.keypair
+        if self.jito is not None:
+            import solbot.execution.tx_builder  # noqa: F401
+
+    def close(self) -> None:
+        self.jupiter_swap.signer.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        if self.jito is not None:
+            await self.jito.aclose()
+
     async def try_execute(self, plan: Plan) -> bool:
-        logger.info("execution.start: " + json.dumps({
+        logger.info("execution.start", extra={
             "input_mint": plan.input_mint[-8:],
-            "output_mint": plan.output_mint[-8:], 
+            "output_mint": plan.output_mint[-8:],
             "input_amount": plan.input_amount,
             "expected_pnl": plan.expected_pnl_usd,
             "dry_run": self.settings.DRY_RUN,
             "paper_trade": self.settings.PAPER_TRADE
-        }))
+        })
 
         # Validate Ultra order response has required fields
-        if "transaction" not in plan.quote_response or "requestId" not in plan.quote_response:
-            logger.error("fail.inspect: " + json.dumps({
-                "reason": "Missing transaction or requestId in Ultra order response",
-                "response_keys": list(plan.quote_response.keys())
-            }))
+        legs = plan.all_legs()
+        for leg in legs:
+            if not leg.quote.executable:
+                logger.error("fail.inspect", extra={
+                    "reason": "Missing transaction or requestId in Ultra order response",
+                    "response_keys": list(leg.quote.keys())
+                })
+                EXECUTE_OUTCOME.labels("invalid").inc()
+                return False
+
+        used = [leg.quote.request_id for leg in legs if leg.quote.request_id in self._used_orders]
+        if used:
+            logger.debug("execution.duplicate", extra={"request_id": used[0]})
+            EXECUTE_OUTCOME.labels("duplicate").inc()
             return False
 
         if self.settings.DRY_RUN or self.settings.PAPER_TRADE:
-            logger.info("execution.skip: " + json.dumps({
+            logger.info("execution.skip", extra={
                 "reason": "paper/dry mode",
                 "dry_run": self.settings.DRY_RUN,
                 "paper_trade": self.settings.PAPER_TRADE
-            }))
+            })
+            EXECUTE_OUTCOME.labels("skipped").inc()
             return False
 
+        if len(legs) > 1 and (self.jito is None or len(legs) >= MAX_BUNDLE_TXS):
+            # Separate Ultra executions could land the first leg alone.
+            logger.info("execution.skip", extra={
+                "reason": "multi-leg plan needs one Jito bundle (EXECUTION_BACKEND=jito)",
+                "legs": len(legs),
+                "notes": plan.notes,
+            })
+            EXECUTE_OUTCOME.labels("not_atomic").inc()
+            return False
+
+        self._mark_used(plan)
+        t0 = time.perf_counter()
         try:
+            if self.jito is not None:
+                return await self._execute_jito(plan, t0)
+
             # Ultra API: quote_response contains pre-built transaction
             execute_result = await self.jupiter_swap.build_swap(
-                quote_response=plan.quote_response,
+                quote_response=plan.quote_response.data,
                 user_pubkey=self.settings.user_pubkey,
-                prioritization_fee_lamports=self.settings.PRIORITY_FEE_MICRO_LAMPORTS * 1000,
-                compute_unit_price_micro_lamports=self.settings.PRIORITY_FEE_MICRO_LAMPORTS,
             )
 
-            logger.info("execution.success: " + json.dumps({
-                "status": execute_result.get("status"),
+            status = execute_result.get("status")
+            if status != "Success":
+                # Ultra answers 200 with status "Failed" when the swap did not go through.
+                logger.error("fail.inspect", extra={
+                    "reason": "Ultra execute not successful",
+                    "status": status,
+                    "code": execute_result.get("code"),
+                    "error": execute_result.get("error"),
+                    "request_id": plan.quote_response.request_id,
+                })
+                EXECUTE_LATENCY.observe(time.perf_counter() - t0)
+                EXECUTE_OUTCOME.labels("failed").inc()
+                if self.tracker and execute_result.get("signature"):
+                    # A transaction that landed and failed still cost its fee.
+                    self.tracker.track(execute_result["signature"], plan)
+                return False
+
+            logger.info("execution.success", extra={
+                "status": status,
                 "signature": execute_result.get("signature", "")[:16] + "..." if execute_result.get("signature") else "none",
-                "request_id": plan.quote_response.get("requestId")
-            }))
+                "request_id": plan.quote_response.request_id
+            })
+            EXECUTE_LATENCY.observe(time.perf_counter() - t0)
+            EXECUTE_OUTCOME.labels("success").inc()
+            if self.tracker and execute_result.get("signature"):
+                self.tracker.track(execute_result["signature"], plan)
 
             return True
             
         except Exception as e:
-            logger.error("fail.inspect: " + json.dumps({
+            logger.error("fail.inspect", extra={
                 "reason": "exception during Ultra execution",
                 "error_type": type(e).__name__,
                 "error_message": str(e)
-            }))
+            })
+            EXECUTE_LATENCY.observe(time.perf_counter() - t0)
+            EXECUTE_OUTCOME.labels("error").inc()
             return False
+
+    def _mark_used(self, plan: Plan) -> None:
+        """Retire a plan's order before sending it: it must never be submitted twice.
+
+        The cached quote is dropped too, so the next scan fetches a fresh order
+        instead of proposing the same one again.
+        """
+        now = time.monotonic()
+        used = self._used_orders
+        while used and now - next(iter(used.values())) > USED_ORDER_TTL_S:
+            used.popitem(last=False)
+        for leg in plan.all_legs():
+            if leg.quote.request_id:
+                used[leg.quote.request_id] = now
+            if self.quoter is not None:
+                self.quoter.cache.invalidate((leg.input_mint, leg.output_mint, leg.amount))
+
+    async def _execute_jito(self, plan: Plan, t0: float) -> bool:
+        """Bundle the signed Ultra transactions of every leg with a tip and race it across regions.
+
+        A bundle lands all of its transactions in order or none of them, so the
+        legs of a multi-leg plan can only fill together.
+        """
+        assert self.jito is not None
+        from solbot.execution.tx_builder import TxBuilder
+
+        blockhash = self.chain.blockhash() if self.chain else None
+        if blockhash is None:
+            raise RuntimeError("no fresh blockhash for the tip transaction")
+        signer = self.jupiter_swap.signer
+        signed = await asyncio.gather(
+            *(signer.sign(leg.quote.data["transaction"]) for leg in plan.all_legs())
+        )
+        tip_b64 = TxBuilder.tip_transaction(
+            signer.keypair, self.jito.tip_account(), self.settings.JITO_TIP_LAMPORTS, blockhash
+        )
+        region, bundle_id = await self.jito.submit([*signed, tip_b64])
+        if self.tracker:
+            sigs = [first_signature(tx) for tx in (*signed, tip_b64)]
+            self.tracker.track(sigs[0], plan, bundle=sigs)
+        logger.info("execution.success", extra={
+            "backend": "jito",
+            "region": region,
+            "bundle_id": bundle_id,
+            "request_id": plan.quote_response.request_id,
+            "legs": len(signed),
+        })
+        EXECUTE_LATENCY.observe(time.perf_counter() - t0)
+        EXECUTE_OUTCOME.labels("success").inc()
+        return True
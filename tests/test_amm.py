@@ -0,0 +1,180 @@
+"""PoolMirror against stand-in RPC and websocket servers.
+
+An HTTP JSON-RPC stand-in (getHealth, getMultipleAccounts) and a websocket
+stand-in (accountSubscribe) serve synthetic pools; the mirror snapshots and
+subscribes, follows random vault balance changes, and must end with the
+stand-in's reserves and quotes that match reference AMM math.
+"""
+import asyncio
+import base64
+import itertools
+import json
+import random
+import struct
+import time
+
+import numpy as np
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+from solbot.amm import PoolMirror, PoolSpec
+from solbot.core.env import Settings
+from solbot.core.http import HttpPool
+from solbot.core.rpc import RpcPool
+from solbot.mints import MINTS, USDC, USDT
+
+N_POOLS = 60
+N_UPDATES = 500
+MAX_QUOTE_ERROR = 1e-6  # relative, vs Python-int reference math
+
+
+def token_account(amount: int) -> str:
+    return base64.b64encode(bytes(64) + struct.pack("<Q", amount) + bytes(93)).decode()
+
+
+class Chain:
+    """Vault balances plus the websocket subscribers watching them."""
+
+    def __init__(self, vaults: list[str]):
+        self.slot = 1000
+        self.balances = {v: random.randint(10**9, 10**12) for v in vaults}
+        self.subs: dict[str, list[tuple[object, int]]] = {}
+        self._sub_ids = itertools.count(1)
+
+    def account(self, vault: str) -> dict:
+        return {"data": [token_account(self.balances[vault]), "base64"], "owner": "Tokenkeg"}
+
+    async def set_balance(self, vault: str, amount: int) -> None:
+        self.slot += 1
+        self.balances[vault] = amount
+        for ws, sub in self.subs.get(vault, []):
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0", "method": "accountNotification",
+                "params": {"subscription": sub, "result": {
+                    "context": {"slot": self.slot}, "value": self.account(vault),
+                }},
+            }))
+
+    async def ws_handler(self, ws) -> None:
+        try:
+            async for msg in ws:
+                req = json.loads(msg)
+                if req["method"] == "accountSubscribe":
+                    sub = next(self._sub_ids)
+                    self.subs.setdefault(req["params"][0], []).append((ws, sub))
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": sub}))
+        except ConnectionClosed:
+            pass
+
+    async def http_handler(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                req = json.loads(await reader.readexactly(length)) if length else {}
+                if req.get("method") == "getMultipleAccounts":
+                    result = {
+                        "context": {"slot": self.slot},
+                        "value": [self.account(v) for v in req["params"][0]],
+                    }
+                else:
+                    result = "ok"
+                out = json.dumps({"jsonrpc": "2.0", "id": req.get("id"), "result": result}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(out)}\r\n\r\n".encode() + out
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            writer.close()
+
+
+def curve_dy(x: int, y: int, dx: int, amp: int, fee_bps: float) -> float:
+    """Reference 2-coin StableSwap get_dy on Python ints (Curve's integer loop)."""
+    ann, s = amp * 4, x + y
+    d = s
+    for _ in range(255):
+        d_p = d * d // (2 * x) * d // (2 * y)
+        prev = d
+        d = (ann * s + 2 * d_p) * d // ((ann - 1) * d + 3 * d_p)
+        if abs(d - prev) <= 1:
+            break
+    nx = x + dx
+    c = d * d // (2 * nx) * d // (2 * ann)
+    b = nx + d // ann
+    yy = d
+    for _ in range(255):
+        prev = yy
+        yy = (yy * yy + c) // (2 * yy + b - d)
+        if abs(yy - prev) <= 1:
+            break
+    return (y - yy) * (1 - fee_bps / 10_000)
+
+
+async def run_mirror() -> tuple[int, float]:
+    """(reserve mismatches, worst relative quote error) after a burst of updates."""
+    random.seed(7)
+    mints = [f"Mint{i:040d}" for i in range(N_POOLS // 4 + 2)]
+    for m in mints:
+        MINTS.intern(m, 6)
+    pools = [PoolSpec(USDC, USDT, "vault-stable-a", "vault-stable-b", "stable", 4, 200)]
+    pairs = list(itertools.combinations(mints, 2))
+    random.shuffle(pairs)
+    for k, (a, b) in enumerate(pairs[: N_POOLS - 1]):
+        pools.append(PoolSpec(a, b, f"vault-{k}-a", f"vault-{k}-b", "cp", 25, 0, 6, 6))
+    vaults = [v for p in pools for v in (p.base_vault, p.quote_vault)]
+    chain = Chain(vaults)
+
+    http_srv = await asyncio.start_server(chain.http_handler, "127.0.0.1", 0)
+    rpc_url = f"http://127.0.0.1:{http_srv.sockets[0].getsockname()[1]}"
+    async with serve(chain.ws_handler, "127.0.0.1", 0) as ws_srv:
+        ws_url = f"ws://127.0.0.1:{ws_srv.sockets[0].getsockname()[1]}"
+        settings = Settings(RPC_HTTPS=[rpc_url], AMM_WS_URL=ws_url, RPC_HEDGE_K=1, HTTP2=False)
+        http = HttpPool(settings)
+        rpc = RpcPool(settings, http)
+        mirror = PoolMirror(settings, rpc, pools)
+        mirror.start()
+        try:
+            deadline = time.monotonic() + 10
+            while not mirror.ready and time.monotonic() < deadline:
+                await asyncio.sleep(0.005)
+            assert mirror.ready
+            for _ in range(N_UPDATES):
+                await chain.set_balance(random.choice(vaults), random.randint(10**9, 10**12))
+            deadline = time.monotonic() + 10
+            while mirror.slot < chain.slot and time.monotonic() < deadline:
+                await asyncio.sleep(0.005)
+
+            mismatches = sum(
+                mirror.reserves[i, s] != chain.balances[v]
+                for i, p in enumerate(pools)
+                for s, v in enumerate((p.base_vault, p.quote_vault))
+            )
+            src = np.array([MINTS.id(p.base) for p in pools])
+            dst = np.array([MINTS.id(p.quote) for p in pools])
+            out = mirror.quote_many(src, dst, np.full(src.shape, 10.0**8))
+            worst = 0.0
+            for k, p in enumerate(pools):
+                x, y = chain.balances[p.base_vault], chain.balances[p.quote_vault]
+                if p.kind == "stable":
+                    ref = curve_dy(x, y, 10**8, int(p.amp), p.fee_bps)
+                else:
+                    dx = 10**8 * (1 - p.fee_bps / 10_000)
+                    ref = y * dx / (x + dx)
+                worst = max(worst, abs(out[k] - ref) / ref)
+        finally:
+            await mirror.stop()
+            await http.aclose()
+    http_srv.close()
+    return mismatches, worst
+
+
+def test_mirror_tracks_reserves_and_quotes():
+    mismatches, worst = asyncio.run(run_mirror())
+    assert mismatches == 0
+    assert worst < MAX_QUOTE_ERROR
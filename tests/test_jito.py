@@ -0,0 +1,118 @@
+"""JitoRegions against local stand-in block engines.
+
+Each stand-in is a JSON-RPC sendBundle server with its own latency that
+either accepts every bundle or rejects it with a JSON-RPC error.
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from solbot.core.env import Settings
+from solbot.core.http import HttpPool
+from solbot.execution.jito import BundleRejected, JitoRegions
+
+BUNDLE = ["dHg=", "dGlw"]
+
+
+async def block_engine(latency: float, accept: bool) -> asyncio.AbstractServer:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                req = json.loads(await reader.readexactly(length))
+                await asyncio.sleep(latency)
+                body: dict = {"jsonrpc": "2.0", "id": req["id"]}
+                if accept:
+                    body["result"] = f"bundle-{time.time_ns()}"
+                else:
+                    body["error"] = {"code": -32602, "message": "rejected"}
+                out = json.dumps(body).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(out)}\r\n\r\n".encode() + out
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def with_regions(spec: dict[str, tuple[float, bool]], fanout: int, test) -> None:
+    """Run `test(jito, urls)` against one stand-in per region; urls maps name -> url."""
+    servers, urls = [], {}
+    for name, (latency, accept) in spec.items():
+        srv = await block_engine(latency, accept)
+        servers.append(srv)
+        urls[name] = f"http://127.0.0.1:{srv.sockets[0].getsockname()[1]}/api/v1/bundles"
+    settings = Settings(
+        JITO_REGIONS=list(urls.values()), JITO_FANOUT=fanout, JITO_EXPLORE=0.0,
+        JITO_TIMEOUT_MS=2000, HTTP2=False,
+    )
+    http = HttpPool(settings)
+    jito = JitoRegions(settings, http)
+    try:
+        await test(jito, urls)
+    finally:
+        await jito.aclose()
+        await http.aclose()
+        for srv in servers:
+            srv.close()
+
+
+def test_first_accept_wins_and_stragglers_are_cancelled():
+    async def check(jito: JitoRegions, urls: dict[str, str]) -> None:
+        t0 = time.perf_counter()
+        region, bundle_id = await jito.submit(BUNDLE)
+        assert region == urls["fast"]
+        assert bundle_id.startswith("bundle-")
+        assert time.perf_counter() - t0 < 1.0  # did not wait for the slow region
+        stragglers = list(jito._stragglers)
+        assert len(stragglers) == 1 and not stragglers[0].done()
+        await jito.aclose()
+        assert stragglers[0].cancelled()
+        assert not jito._stragglers
+
+    asyncio.run(with_regions({"fast": (0.01, True), "slow": (1.5, True)}, 2, check))
+
+
+def test_falls_back_when_a_region_rejects():
+    async def check(jito: JitoRegions, urls: dict[str, str]) -> None:
+        region, _ = await jito.submit(BUNDLE)
+        assert region == urls["good"]
+        bad = next(r for r in jito.regions if r.url == urls["bad"])
+        assert bad.rejected == 1 and bad.accepted == 0
+        assert bad.error_rate > 0
+
+    asyncio.run(with_regions({"bad": (0.001, False), "good": (0.02, True)}, 2, check))
+
+
+def test_all_regions_rejecting_raises():
+    async def check(jito: JitoRegions, urls: dict[str, str]) -> None:
+        with pytest.raises(BundleRejected):
+            await jito.submit(BUNDLE)
+
+    asyncio.run(with_regions({"a": (0.001, False), "b": (0.002, False)}, 2, check))
+
+
+def test_regions_ranked_by_latency_and_rejections():
+    async def check(jito: JitoRegions, urls: dict[str, str]) -> None:
+        for _ in range(3):
+            await jito.submit(BUNDLE)
+            # let the slower regions finish so every region has a latency sample
+            await asyncio.gather(*jito._stragglers, return_exceptions=True)
+        ranked = [r.url for r in sorted(jito.regions, key=lambda r: r.score)]
+        assert ranked == [urls["ny"], urls["ams"], urls["tokyo"], urls["bad"]]
+        jito.fanout = 2
+        assert [r.url for r in jito.pick()] == [urls["ny"], urls["ams"]]
+
+    spec = {
+        "tokyo": (0.08, True), "bad": (0.001, False), "ams": (0.03, True), "ny": (0.005, True),
+    }
+    asyncio.run(with_regions(spec, 4, check))